@@ -0,0 +1,123 @@
+# Module:
+# Submodules:
+# Created:
+# Copyright (C) <date> <fullname>
+#
+# This module is part of the <project name> project and is released under
+# the MIT License: http://opensource.org/licenses/MIT
+"""Compare the memory held by a 10k object tree with and without lean mode
+
+Run with:
+
+    python benchmark/bench_memory.py
+
+Python allocations are measured with tracemalloc; the lxml tree itself is
+allocated by libxml2 and is not included.
+
+"""
+
+# ============================================================================
+# Imports
+# ============================================================================
+
+
+# Stdlib imports
+import gc
+import tracemalloc
+
+# Third-party imports
+from yarl import URL
+
+# Local imports
+from selweb.core import Browser
+from selweb.driver import BrowserDriver
+from selweb.web import CompositeWebObject, WebObject, WebPage
+
+
+# ============================================================================
+# Globals
+# ============================================================================
+
+
+NUMGROUPS = 100
+GROUPSIZE = 99
+
+
+# ============================================================================
+# Helpers
+# ============================================================================
+
+
+@BrowserDriver.register
+class Driver:
+    pass
+
+
+class BenchBrowser(Browser):
+    document = 'doc'
+    source = '<html><body>{}</body></html>'.format(''.join(
+        '<div>{}</div>'.format(''.join(f'<p>{g} {i}</p>'
+                                       for i in range(GROUPSIZE)))
+        for g in range(NUMGROUPS)
+    ))
+
+
+def mktree(lean):
+    """Return a reloaded page of NUMGROUPS * (GROUPSIZE + 1) + 1 objects"""
+    page = WebPage('page', URL('https://example.com'),
+                   BenchBrowser(Driver()), lean=lean)
+    page.reload()
+    for g in range(NUMGROUPS):
+        group = CompositeWebObject(g, f'/body/div[{g + 1}]', page)
+        group.reload()
+        page.add(group)
+        for i in range(GROUPSIZE):
+            obj = WebObject(i, f'/p[{i + 1}]', group)
+            obj.reload()
+            group.add(obj)
+            # Derived data is extracted from each object's source
+            obj.source
+    return page
+
+
+def measure(lean):
+    gc.collect()
+    tracemalloc.start()
+    page = mktree(lean)
+    held = tracemalloc.get_traced_memory()[0]
+    usage = page.memory_usage()
+
+    # Without the cyclic gc, only trees without reference cycles are freed
+    # when released
+    gc.disable()
+    try:
+        del page
+        leaked = tracemalloc.get_traced_memory()[0]
+    finally:
+        gc.enable()
+    gc.collect()
+    tracemalloc.stop()
+    return held, leaked, usage
+
+
+# ============================================================================
+# Main
+# ============================================================================
+
+
+def main():
+    for lean in [False, True]:
+        held, leaked, usage = measure(lean)
+        print(f'lean={lean!s:5} objects: {usage["objects"]} '
+              f'held: {held / 1e6:6.2f} MB '
+              f'sources: {usage["sourcebytes"] / 1e6:6.2f} MB '
+              f'left after del without gc: {leaked / 1e6:6.2f} MB')
+
+
+if __name__ == '__main__':
+    main()
+
+
+# ============================================================================
+#
+# ============================================================================
@@ -0,0 +1,156 @@
+# Module:
+# Submodules:
+# Created:
+# Copyright (C) <date> <fullname>
+#
+# This module is part of the <project name> project and is released under
+# the MIT License: http://opensource.org/licenses/MIT
+"""Compare the installed parser backends on a corpus of saved pages
+
+Run with:
+
+    python benchmark/bench_parser.py [PAGE_OR_DIR ...] [--xpath EXPR ...]
+                                     [--css SELECTOR ...]
+
+Without pages, a synthetic corpus is used. Directories are searched for
+*.html files. For every backend reports the parse time, the query time of
+each xpath (and css selector, if cssselect is installed) and the resident
+memory held by the parsed trees of the whole corpus.
+
+"""
+
+# ============================================================================
+# Imports
+# ============================================================================
+
+
+# Stdlib imports
+from argparse import ArgumentParser
+from pathlib import Path
+from timeit import repeat
+import gc
+import os
+
+# Third-party imports
+try:
+    from cssselect import HTMLTranslator
+except ImportError:
+    HTMLTranslator = None
+
+# Local imports
+from selweb.parser import available_backends, get_backend
+from selweb.util import evaluate_xpath
+
+
+# ============================================================================
+# Globals
+# ============================================================================
+
+
+REPEAT = 5
+
+DEFAULT_XPATHS = ['//a', '//div[@class="item"]/span', '/html/body//p[1]']
+
+DEFAULT_CSS = ['a', 'div.item > span']
+
+
+# ============================================================================
+# Helpers
+# ============================================================================
+
+
+def mkcorpus(numpages=20, numitems=500):
+    """Return synthetic page sources"""
+    items = ''.join(f'<div class="item"><span>{i}</span><p>text {i} '
+                    f'<a href="/{i}">link</a></p></div>'
+                    for i in range(numitems))
+    page = f'<html><head><title>t</title></head><body>{items}</body></html>'
+    return [page] * numpages
+
+
+def loadcorpus(paths):
+    """Return the sources of the given html files and directories"""
+    ret = []
+    for p in map(Path, paths):
+        files = sorted(p.rglob('*.html')) if p.is_dir() else [p]
+        ret.extend(f.read_text(encoding='utf-8', errors='replace')
+                   for f in files)
+    return ret
+
+
+def rss():
+    """Return the resident set size of this process in bytes, or None"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        return None
+
+
+def best(func):
+    return min(repeat(func, number=1, repeat=REPEAT))
+
+
+def query(trees, expr):
+    for t in trees:
+        evaluate_xpath(t, expr)
+
+
+# ============================================================================
+# Main
+# ============================================================================
+
+
+def bench(name, corpus, queries):
+    backend = get_backend(name)
+    size = sum(len(s) for s in corpus)
+
+    # Measure memory first, before freed trees can be reused by the
+    # allocator
+    gc.collect()
+    before = rss()
+    trees = [backend.parse(s) for s in corpus]
+    after = rss()
+
+    parsetime = best(lambda: [backend.parse(s) for s in corpus])
+
+    print(f'{name}: parse {parsetime * 1000:8.2f} ms '
+          f'({size / parsetime / 1e6:.1f} MB/s)')
+    if before is not None:
+        print(f'  memory held by trees: {(after - before) / 1e6:.1f} MB')
+    for label, expr in queries:
+        t = best(lambda: query(trees, expr))
+        print(f'  {label:40} {t * 1000:8.2f} ms')
+
+
+def main():
+    argp = ArgumentParser(description=__doc__.splitlines()[0])
+    argp.add_argument('pages', nargs='*', help='html files or directories')
+    argp.add_argument('--xpath', action='append', default=None)
+    argp.add_argument('--css', action='append', default=None)
+    args = argp.parse_args()
+
+    corpus = loadcorpus(args.pages) if args.pages else mkcorpus()
+    if not corpus:
+        argp.error('no html pages found')
+
+    queries = [(f'xpath {x}', x) for x in (args.xpath or DEFAULT_XPATHS)]
+    if HTMLTranslator is None:
+        print('cssselect not installed, skipping css selectors')
+    else:
+        translate = HTMLTranslator().css_to_xpath
+        queries.extend((f'css {c}', translate(c))
+                       for c in (args.css or DEFAULT_CSS))
+
+    print(f'{len(corpus)} pages, {sum(map(len, corpus)) / 1e6:.1f} MB')
+    for name in available_backends():
+        bench(name, corpus, queries)
+
+
+if __name__ == '__main__':
+    main()
+
+
+# ============================================================================
+#
+# ============================================================================
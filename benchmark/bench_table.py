@@ -0,0 +1,107 @@
+# Module:
+# Submodules:
+# Created:
+# Copyright (C) <date> <fullname>
+#
+# This module is part of the <project name> project and is released under
+# the MIT License: http://opensource.org/licenses/MIT
+"""Compare extract_table with a naive per-cell xpath extraction
+
+Run with:
+
+    python benchmark/bench_table.py
+
+"""
+
+# ============================================================================
+# Imports
+# ============================================================================
+
+
+# Stdlib imports
+from time import perf_counter
+
+# Third-party imports
+from lxml import html
+
+# Local imports
+from selweb.table import extract_table
+
+
+# ============================================================================
+# Globals
+# ============================================================================
+
+
+NUMROWS = (1000, 10000)
+NAIVE_MAXROWS = 2000
+COLUMNS = ('id', 'name', 'count', 'price', 'note')
+
+
+# ============================================================================
+# Helpers
+# ============================================================================
+
+
+def mkpage(numrows):
+    """Return a page with one table of numrows data rows"""
+    header = ''.join(f'<th>{c}</th>' for c in COLUMNS)
+    rows = ''.join(f'<tr><td>{i}</td><td>item {i}</td><td>{i % 7}</td>'
+                   f'<td>{i * 0.5}</td><td>note {i}</td></tr>'
+                   for i in range(numrows))
+    return (f'<html><body><table id="data"><tr>{header}</tr>{rows}</table>'
+            '</body></html>')
+
+
+def naive(root, numrows):
+    """One absolute xpath per cell, as with one WebObject per cell"""
+    data = {c: [] for c in COLUMNS}
+    for i in range(numrows):
+        for j, c in enumerate(COLUMNS):
+            xpath = f"/html/body/table[@id='data']/tr[{i + 2}]/td[{j + 1}]"
+            cell = root.xpath(xpath)[0]
+            data[c].append(cell.text_content().strip())
+    data['id'] = [int(v) for v in data['id']]
+    data['count'] = [int(v) for v in data['count']]
+    data['price'] = [float(v) for v in data['price']]
+    return data
+
+
+def engine(root, numrows):
+    """Single pass columnar extraction"""
+    return extract_table(root, "//table[@id='data']",
+                         types=dict(id=int, count=int, price=float))
+
+
+def timeit(func, *args):
+    start = perf_counter()
+    func(*args)
+    return perf_counter() - start
+
+
+# ============================================================================
+# Main
+# ============================================================================
+
+
+def main():
+    for numrows in NUMROWS:
+        root = html.fromstring(mkpage(numrows))
+        t_engine = timeit(engine, root, numrows)
+        line = f'{numrows:6} rows  extract_table: {t_engine * 1000:9.2f} ms'
+        if numrows <= NAIVE_MAXROWS:
+            t_naive = timeit(naive, root, numrows)
+            line += (f'  per-cell xpath: {t_naive * 1000:9.2f} ms'
+                     f'  ({t_naive / t_engine:.0f}x)')
+        else:
+            line += '  per-cell xpath: skipped (too slow)'
+        print(line)
+
+
+if __name__ == '__main__':
+    main()
+
+
+# ============================================================================
+#
+# ============================================================================
@@ -0,0 +1,96 @@
+# Module:
+# Submodules:
+# Created:
+# Copyright (C) <date> <fullname>
+#
+# This module is part of the <project name> project and is released under
+# the MIT License: http://opensource.org/licenses/MIT
+"""Compare WebObject.reload with and without the compiled xpath cache
+
+Run with:
+
+    python benchmark/bench_xpathcache.py
+
+"""
+
+# ============================================================================
+# Imports
+# ============================================================================
+
+
+# Stdlib imports
+from timeit import repeat
+
+# Third-party imports
+from lxml import html
+
+# Local imports
+from selweb.util import evaluate_xpath, xpathcache
+
+
+# ============================================================================
+# Globals
+# ============================================================================
+
+
+NUMOBJ = 500
+REPEAT = 5
+
+
+# ============================================================================
+# Helpers
+# ============================================================================
+
+
+def mkpage(numobj):
+    """Return a page source with numobj uniquely addressable elements"""
+    items = ''.join(f'<div id="item{i}" class="item"><span>{i}</span></div>'
+                    for i in range(numobj))
+    return f'<html><body><div id="res">{items}</div></body></html>'
+
+
+def mkxpaths(numobj):
+    """Return the absolute xpaths a page object tree would reload"""
+    return [f"/html/body/div[@id='res']/div[{i + 1}]/span"
+            for i in range(numobj)]
+
+
+def reload_uncached(root, xpaths):
+    for x in xpaths:
+        nodelist = root.xpath(x)
+        assert len(nodelist) == 1
+
+
+def reload_cached(root, xpaths):
+    for x in xpaths:
+        nodelist = evaluate_xpath(root, x)
+        assert len(nodelist) == 1
+
+
+# ============================================================================
+# Main
+# ============================================================================
+
+
+def main():
+    root = html.fromstring(mkpage(NUMOBJ))
+    xpaths = mkxpaths(NUMOBJ)
+    xpathcache.clear()
+
+    for name, func in [('uncached', reload_uncached),
+                       ('cached', reload_cached)]:
+        times = repeat(lambda: func(root, xpaths), number=1, repeat=REPEAT)
+        best = min(times)
+        print(f'{name:10} {NUMOBJ} objects: {best * 1000:8.2f} ms '
+              f'({best / NUMOBJ * 1e6:.1f} us/object)')
+
+    print(f'cache hits: {xpathcache.hits} misses: {xpathcache.misses}')
+
+
+if __name__ == '__main__':
+    main()
+
+
+# ============================================================================
+#
+# ============================================================================
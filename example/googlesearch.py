@@ -23,7 +23,6 @@ import re
 import sys
 
 # Third-party imports
-from lxml import html
 import pytest
 from selenium.webdriver.common.keys import Keys
 from yarl import URL
@@ -32,7 +31,8 @@ from yarl import URL
 from selenium import webdriver
 from selweb.driver import (BrowserDriver, FirefoxDriver, GenericDriver,
                            PhantomJSDriver)
-from selweb import (Browser, WebObject, CompositeWebObject, WebPage)
+from selweb import (Browser, Field, WebObject, WebObjectList,
+                    WebObjectListItem, WebPage)
 from selweb.util import xpath_clsmatch
 
 
@@ -145,19 +145,11 @@ class GoogleFrontPage(WebPage):
 
     def __init__(self, browser):
         url = URL('https://www.google.ca')
-        super().__init__('google_front', url, browser,
-                         reloadcontext=self.reload_context)
-
-    @contextmanager
-    def reload_context(self):
-        yield
-
-        # Add sub objects
-        self.add(GoogleLogo(self))
-        self.add(SearchBar(self))
+        super().__init__('google_front', url, browser)
 
-        for c in self.children():
-            c.reload()
+        # Sub objects are only created and reloaded when first accessed
+        self.register('logo', GoogleLogo)
+        self.register('searchbar', SearchBar)
 
 
 # ============================================================================
@@ -168,15 +160,17 @@ class GoogleFrontPage(WebPage):
 class SearchItemTitle(WebObject):
 
     def __init__(self, parent):
+        # Possible that a search item can contain child search items (eg top
+        # result item), we don't care about those, just the first one
         clsname = xpath_clsmatch('r')
-        xpath = f'//h3[{clsname}]'
+        xpath = f'/descendant::h3[{clsname}][1]'
         super().__init__('title', xpath, parent)
 
         self._bs = None
 
     @property
     def url(self):
-        a = html.fromstring(self.source)[0]
+        a = self.node[0]
         url = unescape(a.get('href'))
 
         # Remove the query frag
@@ -205,131 +199,30 @@ class SearchItemTitle(WebObject):
     @property
     def title(self):
         """Return title text"""
-        src = self.source
-        parser = html.document_fromstring(src)
-        return parser.text_content()
-
-    @property
-    def absxpath(self):
-        # Possible that a search item can contain child search items (eg top
-        # result item), we don't care about those, just the first one
-        xpath = self.parent.absxpath
-        xpath = ''.join([xpath, self.xpath])
-        return f"({xpath})[1]"
+        return self.node.text_content()
 
 
-class SearchItemLabel(WebObject):
-
-    def __init__(self, parent):
-        clsname = xpath_clsmatch('s')
-        xpath = f"//div[{clsname}]//cite"
-        super().__init__('label', xpath, parent)
-
-    @property
-    def label(self):
-        """Return label"""
-        src = self.source
-        parser = html.document_fromstring(src)
-        return parser.text_content().strip()
-
-    @property
-    def absxpath(self):
-        xpath = self.parent.absxpath
-        xpath = ''.join([xpath, self.xpath])
-        return f"({xpath})[1]"
-
-
-class SearchItemSummary(WebObject):
-
-    def __init__(self, parent):
-        cls_s = xpath_clsmatch('s')
-        cls_st = xpath_clsmatch('st')
-        xpath = f"//div[{cls_s}]//span[{cls_st}]"
-        super().__init__('summary', xpath, parent)
-
-    @property
-    def text(self):
-        """Return summary text"""
-        src = self.source
-        parser = html.document_fromstring(src)
-        return parser.text_content().strip()
-
-    @property
-    def absxpath(self):
-        xpath = self.parent.absxpath
-        xpath = ''.join([xpath, self.xpath])
-        return f"({xpath})[1]"
-
-
-class SearchItem(CompositeWebObject):
+class SearchItem(WebObjectListItem):
+    label = Field(f"/descendant::cite[ancestor::div[{xpath_clsmatch('s')}]]"
+                  "[1]")
+    summary = Field(f"/descendant::span[{xpath_clsmatch('st')}]"
+                    f"[ancestor::div[{xpath_clsmatch('s')}]][1]")
 
     # the name will be the index number
-    def __init__(self, parent, *, index=0):
-        if not isinstance(index, int):
-            errmsg = ('index arg expected {} object, got {} object instead'.
-                      format(int.__name__, type(index).__name__))
-            raise TypeError(errmsg)
-        elif index < 0:
-            errmsg = ('index arg expected to be >= 0, got {} instead'.
-                      format(index))
-            raise ValueError(errmsg)
-
-        label = SearchItemLabel(self)
-        cls_r = xpath_clsmatch('r')
-        xpath = f"//h3[{cls_r}]/parent::node()[.{label.xpath}]"
-        super().__init__(index, xpath, parent, reloadcontext=self.reload_context)
+    def __init__(self, parent, index):
+        super().__init__(parent, index)
+        self.register('title', SearchItemTitle)
 
-    @contextmanager
-    def reload_context(self):
-        yield
 
-        # Run after core reload is done
-        title = SearchItemTitle(self)
-        label = SearchItemLabel(self)
-        summary = SearchItemSummary(self)
-        for item in [title, label, summary]:
-            self.add(item)
-            item.reload()
-
-    @property
-    def absxpath_noindex(self):
-        """Return the non-indexed xpath"""
-        return super().absxpath
-
-    @property
-    def absxpath(self):
-        xpath = super().absxpath
-        return f"({xpath})[{self.name+1}]"
-
-
-class ResultList(CompositeWebObject):
+class ResultList(WebObjectList):
 
     def __init__(self, parent):
         xpath = "//div[@id='res']"
-        super().__init__('results', xpath, parent,
-                         reloadcontext=self.reload_context)
-
-    @contextmanager
-    def reload_context(self):
-        yield
-        # Run after core reload
-
-        # Get lxml.html parser for this object to find sub items
-        item = SearchItem(self)
-        item_xpath = ''.join([self.xpath, item.xpath])
-        src = self.source
-        parser = html.fromstring(src)
-        results = parser.xpath(item_xpath)
-
-        for i, el in enumerate(results):
-            if i > 0:
-                item = SearchItem(self, index=i)
-            self.add(item)
-            try:
-                item.reload()
-            except Exception as err:
-                print('ERROR', item.absxpath, err)
-                break
+        cls_r = xpath_clsmatch('r')
+        cls_s = xpath_clsmatch('s')
+        item_xpath = f"//h3[{cls_r}]/parent::node()[.//div[{cls_s}]//cite]"
+        super().__init__('results', xpath, parent, item_xpath,
+                         itemfactory=SearchItem)
 
 
 class GoogleResultPage(WebPage):
@@ -21,9 +21,14 @@ __version__ = '0.1.0'
 # ============================================================================
 
 
-from .core import (Browser, CompositePageObject, HTMLProperty, Page,
-                   PageObject)
-from .web import CompositeWebObject, WebObject, WebPage
+from .core import (Browser, Budget, BudgetExhausted, CompositePageObject,
+                   HTMLProperty, Page, PageObject)
+from .parser import ParserBackend, get_backend
+from .stats import WaitStats
+from .stream import StreamExtractor
+from .watch import ChangeEvent, PageWatcher
+from .web import (ChildReloadError, CompositeWebObject, Field, PageRouter,
+                  WebObject, WebObjectList, WebObjectListItem, WebPage)
 
 
 # ============================================================================
@@ -0,0 +1,185 @@
+# Module:
+# Submodules:
+# Created:
+# Copyright (C) <date> <fullname>
+#
+# This module is part of the <project name> project and is released under
+# the MIT License: http://opensource.org/licenses/MIT
+"""
+"""
+
+# ============================================================================
+# Imports
+# ============================================================================
+
+
+# Stdlib imports
+from hashlib import blake2b
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+import mmap
+import os
+
+# Third-party imports
+
+# Local imports
+from .snapshot import dumps, loads
+
+
+# ============================================================================
+# Globals
+# ============================================================================
+
+
+SUFFIX = '.snap'
+
+DEFAULT_MAXSIZE = 256 * 1024 * 1024
+
+
+# ============================================================================
+# ExtractionCache
+# ============================================================================
+
+
+class ExtractionCache:
+    """Directory of page snapshots keyed by page class, url and digest
+
+    Entries are snapshot files that are memory mapped when read. Writes go
+    to a temporary file that is atomically renamed into place, so any number
+    of processes may share the directory: readers only ever see complete
+    entries, and an entry removed by another process is simply a miss.
+
+    Entries are evicted least recently used first (by modification time,
+    which is refreshed on every hit) once the directory grows past maxsize
+    bytes. maxsize None disables eviction.
+
+    A WebPage stores itself after a reload unless some object below it
+    cannot be rebuilt: objects of classes that are not importable, with
+    reload contexts other than their own methods, attributes added by
+    subclasses other than scalars, lazy children registered with factories
+    other than importable classes, or nested pages.
+
+    """
+    __slots__ = ('_directory', '_maxsize')
+
+    def __init__(self, directory, *, maxsize=DEFAULT_MAXSIZE):
+        if maxsize is not None:
+            if not isinstance(maxsize, int):
+                errmsg = ('maxsize arg expected {} object, got {} object '
+                          'instead'.format(int.__name__,
+                                           type(maxsize).__name__))
+                raise TypeError(errmsg)
+            elif maxsize < 0:
+                errmsg = ('maxsize arg expected to be >= 0, got {} instead'.
+                          format(maxsize))
+                raise ValueError(errmsg)
+        self._directory = Path(directory)
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._maxsize = maxsize
+
+    def key(self, pagecls, url, digest):
+        """Return the key of a page class's extraction of a url's source"""
+        clsname = '{}.{}'.format(pagecls.__module__, pagecls.__qualname__)
+        h = blake2b(digest_size=20)
+        h.update(repr((clsname, str(url), digest)).encode('utf-8'))
+        return h.hexdigest()
+
+    def _path(self, key):
+        return self._directory / (key + SUFFIX)
+
+    def get(self, key):
+        """Return the snapshot stored under key or None
+
+        The snapshot reads its sources straight from the mapped file.
+
+        """
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            snap = loads(data)
+        except (OSError, ValueError):
+            # Missing (eg evicted by another process), empty or corrupt
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return snap
+
+    def put(self, key, obj):
+        """Store a snapshot of the page object tree obj under key"""
+        data = dumps(obj)
+        f = NamedTemporaryFile(dir=str(self._directory), suffix='.tmp',
+                               delete=False)
+        try:
+            with f:
+                f.write(data)
+            os.replace(f.name, str(self._path(key)))
+        except BaseException:
+            try:
+                os.remove(f.name)
+            except OSError:
+                pass
+            raise
+        self.evict()
+
+    def evict(self):
+        """Remove least recently used entries until within maxsize"""
+        maxsize = self._maxsize
+        if maxsize is None:
+            return
+        entries = []
+        total = 0
+        for e in os.scandir(str(self._directory)):
+            if not e.name.endswith(SUFFIX):
+                continue
+            try:
+                st = e.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, e.path))
+            total += st.st_size
+        entries.sort()
+        for _, size, path in entries:
+            if total <= maxsize:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
+
+    def clear(self):
+        """Remove every entry"""
+        for p in self._directory.glob('*' + SUFFIX):
+            try:
+                p.unlink()
+            except OSError:
+                pass
+
+    @property
+    def directory(self):
+        """Return the cache directory"""
+        return self._directory
+
+    @property
+    def maxsize(self):
+        """Return the maximum total size of the entries in bytes"""
+        return self._maxsize
+
+    @property
+    def size(self):
+        """Return the total size of the entries in bytes"""
+        total = 0
+        for p in self._directory.glob('*' + SUFFIX):
+            try:
+                total += p.stat().st_size
+            except OSError:
+                pass
+        return total
+
+
+# ============================================================================
+#
+# ============================================================================
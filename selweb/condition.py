@@ -0,0 +1,309 @@
+# Module:
+# Submodules:
+# Created:
+# Copyright (C) <date> <fullname>
+#
+# This module is part of the <project name> project and is released under
+# the MIT License: http://opensource.org/licenses/MIT
+"""
+"""
+
+# ============================================================================
+# Imports
+# ============================================================================
+
+
+# Stdlib imports
+from abc import ABCMeta, abstractmethod
+
+# Third-party imports
+
+# Local imports
+
+
+# ============================================================================
+# Globals
+# ============================================================================
+
+
+# Helper functions available to every compiled condition. Each takes the
+# index into the arguments array of the xpath (and other string operands) so
+# that no value ever needs to be escaped into the script.
+SCRIPT_PRELUDE = """\
+var a = arguments;
+function find(i) {
+    return document.evaluate(a[i], document, null,
+        XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+}
+function shown(e) {
+    if (e === null) { return false; }
+    var s = window.getComputedStyle(e);
+    if (s.display === 'none' || s.visibility === 'hidden') { return false; }
+    return !!(e.offsetWidth || e.offsetHeight || e.getClientRects().length);
+}
+function match(val, i, exact) {
+    if (val === null) { return false; }
+    return exact ? val === a[i] : val.indexOf(a[i]) !== -1;
+}
+function present(i) { return find(i) !== null; }
+function visible(i) { return shown(find(i)); }
+function text(i, j, exact) {
+    var e = find(i);
+    if (e === null) { return false; }
+    return match(e.innerText === undefined ? e.textContent : e.innerText,
+                 j, exact);
+}
+function attr(i, j, k, exact) {
+    var e = find(i);
+    if (e === null || !e.hasAttribute(a[j])) { return false; }
+    return k < 0 ? true : match(e.getAttribute(a[j]), k, exact);
+}
+"""
+
+# Return [exists, visible] for the element of every xpath in arguments
+VISIBILITY_SCRIPT = SCRIPT_PRELUDE + """\
+var ret = [];
+for (var i = 0; i < a.length; i++) {
+    var e = find(i);
+    ret.push([e !== null, shown(e)]);
+}
+return ret;
+"""
+
+
+# ============================================================================
+# Compiled condition
+# ============================================================================
+
+
+class CompiledCondition:
+    """Condition compiled to a single javascript predicate
+
+    Calling it with a selenium driver evaluates the whole condition in the
+    browser with one execute_script round trip.
+
+    """
+    __slots__ = ('_script', '_args')
+
+    def __init__(self, script, args):
+        self._script = script
+        self._args = tuple(args)
+
+    def __call__(self, driver):
+        return driver.execute_script(self._script, *self._args)
+
+    @property
+    def args(self):
+        """Return the arguments passed to the script"""
+        return self._args
+
+    @property
+    def script(self):
+        """Return the javascript source"""
+        return self._script
+
+
+class _Compiler:
+    """Collect script arguments, reusing the index of repeated values"""
+    __slots__ = ('args', '_index')
+
+    def __init__(self):
+        self.args = []
+        self._index = {}
+
+    def arg(self, value):
+        """Return the arguments index of value"""
+        index = self._index.get(value)
+        if index is None:
+            index = self._index[value] = len(self.args)
+            self.args.append(value)
+        return index
+
+
+# ============================================================================
+# Conditions
+# ============================================================================
+
+
+class Condition(metaclass=ABCMeta):
+    """Base class of the condition algebra
+
+    Conditions combine with & (and), | (or) and ~ (not). A condition is a
+    factory accepted by WaitFor.__call__: calling it returns its
+    CompiledCondition.
+
+    """
+    __slots__ = ('_compiled', )
+
+    def __init__(self):
+        self._compiled = None
+
+    def __and__(self, other):
+        if not isinstance(other, Condition):
+            return NotImplemented
+        return All(self, other)
+
+    def __or__(self, other):
+        if not isinstance(other, Condition):
+            return NotImplemented
+        return Any(self, other)
+
+    def __invert__(self):
+        return Not(self)
+
+    def __call__(self):
+        return self.compile()
+
+    def compile(self):
+        """Return the CompiledCondition for this condition"""
+        compiled = self._compiled
+        if compiled is None:
+            compiler = _Compiler()
+            expr = self.expression(compiler)
+            script = ''.join([SCRIPT_PRELUDE, 'return !!(', expr, ');'])
+            compiled = self._compiled = CompiledCondition(script,
+                                                          compiler.args)
+        return compiled
+
+    @abstractmethod
+    def expression(self, compiler):
+        """Return the javascript expression of this condition"""
+        raise NotImplementedError
+
+
+def _check_str(argname, val):
+    if not isinstance(val, str):
+        errmsg = ('{} arg expected {} object, got {} object instead'.
+                  format(argname, str.__name__, type(val).__name__))
+        raise TypeError(errmsg)
+
+
+class Present(Condition):
+    """Element matching xpath exists"""
+    __slots__ = ('_xpath', )
+
+    def __init__(self, xpath):
+        _check_str('xpath', xpath)
+        super().__init__()
+        self._xpath = xpath
+
+    def expression(self, compiler):
+        return 'present({})'.format(compiler.arg(self._xpath))
+
+    @property
+    def xpath(self):
+        """Return the element's xpath"""
+        return self._xpath
+
+
+class Visible(Present):
+    """Element matching xpath exists and is displayed"""
+    __slots__ = ()
+
+    def expression(self, compiler):
+        return 'visible({})'.format(compiler.arg(self._xpath))
+
+
+class Text(Present):
+    """Element matching xpath contains (or equals) text"""
+    __slots__ = ('_text', '_exact')
+
+    def __init__(self, xpath, text, *, exact=False):
+        _check_str('text', text)
+        super().__init__(xpath)
+        self._text = text
+        self._exact = exact
+
+    def expression(self, compiler):
+        return 'text({}, {}, {})'.format(compiler.arg(self._xpath),
+                                         compiler.arg(self._text),
+                                         'true' if self._exact else 'false')
+
+
+class Attribute(Present):
+    """Element matching xpath has an attribute
+
+    If value is given, the attribute's value must also contain (or equal)
+    value.
+
+    """
+    __slots__ = ('_attr', '_value', '_exact')
+
+    def __init__(self, xpath, attr, value=None, *, exact=False):
+        _check_str('attr', attr)
+        if value is not None:
+            _check_str('value', value)
+        super().__init__(xpath)
+        self._attr = attr
+        self._value = value
+        self._exact = exact
+
+    def expression(self, compiler):
+        value = self._value
+        return 'attr({}, {}, {}, {})'.format(
+            compiler.arg(self._xpath), compiler.arg(self._attr),
+            -1 if value is None else compiler.arg(value),
+            'true' if self._exact else 'false'
+        )
+
+
+class Not(Condition):
+    """Negate a condition"""
+    __slots__ = ('_cond', )
+
+    def __init__(self, cond):
+        if not isinstance(cond, Condition):
+            errmsg = ('cond arg expected {} object, got {} object instead'.
+                      format(Condition.__name__, type(cond).__name__))
+            raise TypeError(errmsg)
+        super().__init__()
+        self._cond = cond
+
+    def __invert__(self):
+        return self._cond
+
+    def expression(self, compiler):
+        return '!({})'.format(self._cond.expression(compiler))
+
+
+class All(Condition):
+    """All conditions are true"""
+    __slots__ = ('_conds', )
+    _operator = ' && '
+
+    def __init__(self, *conds):
+        if not conds:
+            raise ValueError('Expected at least one condition')
+        flat = []
+        for c in conds:
+            if not isinstance(c, Condition):
+                errmsg = ('conds arg expected {} objects, got {} object '
+                          'instead'.format(Condition.__name__,
+                                           type(c).__name__))
+                raise TypeError(errmsg)
+            if type(c) is type(self):
+                flat.extend(c._conds)
+            else:
+                flat.append(c)
+        super().__init__()
+        self._conds = tuple(flat)
+
+    def expression(self, compiler):
+        expr = [c.expression(compiler) for c in self._conds]
+        return '({})'.format(self._operator.join(expr))
+
+    @property
+    def conditions(self):
+        """Return the combined conditions"""
+        return self._conds
+
+
+class Any(All):
+    """At least one condition is true"""
+    __slots__ = ()
+    _operator = ' || '
+
+
+# ============================================================================
+#
+# ============================================================================
@@ -18,9 +18,11 @@ from abc import ABCMeta, abstractmethod
 from contextlib import contextmanager
 from enum import Enum
 from functools import partial
+from time import monotonic
 
 # Third-party imports
 from selenium.webdriver.common.action_chains import ActionChains
+from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webelement import WebElement
 from selenium.webdriver.support import expected_conditions as ec
@@ -28,7 +30,9 @@ from selenium.webdriver.support.ui import WebDriverWait
 from yarl import URL
 
 # Local imports
+from .condition import Condition
 from .driver import BrowserDriver
+from .stats import WaitStats, condition_key
 
 
 # ============================================================================
@@ -36,11 +40,80 @@ from .driver import BrowserDriver
 # ============================================================================
 
 
+# W3C default page load timeout, assumed if the driver's timeout is unknown
+PAGELOAD_TIMEOUT = 300
+
+# Stamps the current document with a random token on first run and returns
+# the token, so it identifies the document until the document is replaced
+DOCUMENT_SCRIPT = """
+if (!document.__selwebDocument) {
+    document.__selwebDocument = Date.now().toString(36) +
+        Math.random().toString(36).slice(2);
+}
+return document.__selwebDocument;
+"""
+
+
 class HTMLProperty(Enum):
     inner = 'innerHTML'
     outer = 'outerHTML'
 
 
+# ============================================================================
+# Budget
+# ============================================================================
+
+
+class BudgetExhausted(TimeoutException):
+    """Raised when an operation is attempted after its budget ran out"""
+
+
+class Budget:
+    """Deadline shared by every wait and driver command run under it"""
+    __slots__ = ('_deadline', )
+
+    def __init__(self, seconds, *, parent=None):
+        if not isinstance(seconds, (int, float)):
+            errmsg = ('seconds arg expected {} object, got {} object instead'.
+                      format('int or float', type(seconds).__name__))
+            raise TypeError(errmsg)
+        elif seconds < 0:
+            errmsg = ('seconds arg expected to be >= 0, got {} instead'.
+                      format(seconds))
+            raise ValueError(errmsg)
+        deadline = monotonic() + seconds
+        if parent is not None:
+            # A nested budget can never outlive the budget enclosing it
+            deadline = min(deadline, parent.deadline)
+        self._deadline = deadline
+
+    def timeout(self, timeout=None):
+        """Return timeout capped to the remaining time
+
+        Raises BudgetExhausted if there is no time left.
+
+        """
+        remaining = self.remaining
+        if remaining <= 0:
+            raise BudgetExhausted('Budget exhausted')
+        return remaining if timeout is None else min(timeout, remaining)
+
+    @property
+    def deadline(self):
+        """Return the deadline as a time.monotonic() value"""
+        return self._deadline
+
+    @property
+    def exhausted(self):
+        """Return True if there is no time left"""
+        return self.remaining <= 0
+
+    @property
+    def remaining(self):
+        """Return the number of seconds left before the deadline"""
+        return max(self._deadline - monotonic(), 0)
+
+
 # ============================================================================
 # Browser
 # ============================================================================
@@ -58,9 +131,26 @@ class WaitFor:
 
     def __call__(self, condition_func, *, xpath=None, timeout=1):
         funcarg = [(By.XPATH, xpath)] if xpath is not None else []
-        el = WebDriverWait(self._parent.selenium_driver, timeout).until(
-            condition_func(*funcarg)
-        )
+        stats = getattr(self._parent, 'waitstats', None)
+        if stats is not None:
+            key = condition_key(condition_func, xpath)
+            timeout = stats.timeout(key, timeout)
+        budget = getattr(self._parent, 'current_budget', None)
+        if budget is not None:
+            orig_timeout, timeout = timeout, budget.timeout(timeout)
+        start = monotonic()
+        try:
+            el = WebDriverWait(self._parent.selenium_driver, timeout).until(
+                condition_func(*funcarg)
+            )
+        except TimeoutException as err:
+            if budget is not None and timeout < orig_timeout:
+                raise BudgetExhausted('Budget exhausted') from err
+            if stats is not None:
+                stats.record_timeout(key)
+            raise
+        if stats is not None:
+            stats.record(key, monotonic() - start)
         return el
 
     def alert(self, *, timeout=1):
@@ -68,6 +158,19 @@ class WaitFor:
         condfunc = ec.alert_is_present
         return self.__call__(condfunc, timeout=timeout)
 
+    def condition(self, cond, *, timeout=1):
+        """Wait for a selweb.condition Condition to be true
+
+        The whole condition is evaluated in the browser with one script
+        call per poll.
+
+        """
+        if not isinstance(cond, Condition):
+            errmsg = ('cond arg expected {} object, got {} object instead'.
+                      format(Condition.__name__, type(cond).__name__))
+            raise TypeError(errmsg)
+        return self.__call__(cond, timeout=timeout)
+
     def element(self, xpath, *, timeout=1):
         condfunc = ec.presence_of_element_located
         return self.__call__(condfunc, xpath=xpath, timeout=timeout)
@@ -134,17 +237,26 @@ class WaitFor:
 
 
 class Browser:
-    __slots__ = ('_driver', )
+    __slots__ = ('_driver', '_budget', '_waitstats', '_pageload',
+                 '_pageload_saved')
 
     # Data descriptors
     waitfor = WaitFor()
 
-    def __init__(self, driver):
+    def __init__(self, driver, *, waitstats=None):
         if not isinstance(driver, BrowserDriver):
             msg = ('driver arg expected {} object, got {} instead'.
                    format(BrowserDriver.__name__, type(driver).__name__))
             raise TypeError(msg)
+        elif waitstats is not None and not isinstance(waitstats, WaitStats):
+            msg = ('waitstats arg expected {} object, got {} object instead'.
+                   format(WaitStats.__name__, type(waitstats).__name__))
+            raise TypeError(msg)
         self._driver = driver
+        self._budget = None
+        self._waitstats = waitstats
+        self._pageload = None
+        self._pageload_saved = None
 
     def __enter__(self):
         self._driver.__enter__()
@@ -162,10 +274,43 @@ class Browser:
 
     def allelements(self, xpath):
         """Return list of selenium elements representing xpath"""
+        self.checkbudget()
         return self.selenium_driver.find_elements_by_xpath(xpath)
 
+    @contextmanager
+    def budget(self, seconds):
+        """Run waits and driver commands under a shared deadline
+
+        Every waitfor call, go() and driver command run inside the context
+        uses at most the time remaining, and BudgetExhausted is raised once
+        no time is left. Budgets may be nested; an inner budget never
+        extends past the outer one.
+
+        The page load timeout capped by go() is restored once the outermost
+        budget exits (see pageload_timeout).
+
+        """
+        outer = self._budget
+        budget = Budget(seconds, parent=outer)
+        self._budget = budget
+        try:
+            yield budget
+        finally:
+            self._budget = outer
+            saved = self._pageload_saved
+            if outer is None and saved is not None:
+                self._pageload_saved = None
+                self.selenium_driver.set_page_load_timeout(saved)
+
+    def checkbudget(self):
+        """Raise BudgetExhausted if the current budget has no time left"""
+        budget = self._budget
+        if budget is not None and budget.exhausted:
+            raise BudgetExhausted('Budget exhausted')
+
     def element(self, xpath):
         """Return selenium element representing xpath"""
+        self.checkbudget()
         return self.selenium_driver.find_element_by_xpath(xpath)
 
     def element_html(self, el_or_xpath, htmlproperty=HTMLProperty.inner):
@@ -185,14 +330,34 @@ class Browser:
             el = self.element(el)
         return el.get_attribute(htmlproperty.value)
 
+    def execute(self, script, *args):
+        """Run javascript in the current document and return its result"""
+        self.checkbudget()
+        return self.selenium_driver.execute_script(script, *args)
+
     def go(self, url, *, timeout=1):
         """Visit a url"""
         if not isinstance(url, URL):
             msg = ('url arg expected {} object, got {} object instead'.
                    format(URL.__name__, type(url).__name__))
             raise TypeError(msg)
+        budget = self._budget
         with self.waitfor.pageload(timeout=timeout):
-            self.selenium_driver.get(str(url))
+            driver = self.selenium_driver
+            if budget is None:
+                driver.get(str(url))
+                return
+            if self._pageload_saved is None:
+                self._pageload_saved = self.pageload_timeout
+            orig_timeout = self._pageload_saved
+            timeout = budget.timeout(orig_timeout)
+            driver.set_page_load_timeout(timeout)
+            try:
+                driver.get(str(url))
+            except TimeoutException as err:
+                if timeout < orig_timeout:
+                    raise BudgetExhausted('Budget exhausted') from err
+                raise
 
     def maximize(self):
         """Maximize the browser window"""
@@ -206,6 +371,59 @@ class Browser:
         else:
             switch.frame(iframe.element)
 
+    @property
+    def current_budget(self):
+        """Return the innermost active Budget or None"""
+        return self._budget
+
+    @property
+    def pageload_timeout(self):
+        """Return the driver's page load timeout outside of budgets
+
+        This is the value last set via this property or, if never set, the
+        value reported by the driver where supported (selenium 4), else the
+        W3C default.
+
+        """
+        saved = self._pageload_saved
+        if saved is not None:
+            return saved
+        elif self._pageload is not None:
+            return self._pageload
+        timeouts = getattr(self.selenium_driver, 'timeouts', None)
+        page_load = getattr(timeouts, 'page_load', None)
+        return PAGELOAD_TIMEOUT if page_load is None else page_load
+
+    @pageload_timeout.setter
+    def pageload_timeout(self, seconds):
+        """Set the driver's page load timeout
+
+        Under a budget, the new value is applied once the outermost budget
+        exits.
+
+        """
+        if not isinstance(seconds, (int, float)):
+            errmsg = ('seconds arg expected {} object, got {} object instead'.
+                      format('int or float', type(seconds).__name__))
+            raise TypeError(errmsg)
+        self._pageload = seconds
+        if self._pageload_saved is None:
+            self.selenium_driver.set_page_load_timeout(seconds)
+        else:
+            self._pageload_saved = seconds
+
+    @property
+    def document(self):
+        """Return a token identifying the current document
+
+        The token is stamped on the document by script, so it changes
+        whenever the document that source is retrieved from is replaced,
+        whether by go(), a click or form submission, back(), refresh() or
+        switch() to another frame.
+
+        """
+        return self.execute(DOCUMENT_SCRIPT)
+
     @property
     def driver(self):
         """Return BrowserDriver object associated with this Browser"""
@@ -214,6 +432,7 @@ class Browser:
     @property
     def location(self):
         """Return browser's current url"""
+        self.checkbudget()
         return URL(self.selenium_driver.current_url)
 
     @property
@@ -224,11 +443,18 @@ class Browser:
     @property
     def title(self):
         """Page title"""
+        self.checkbudget()
         return self.selenium_driver.title
 
+    @property
+    def waitstats(self):
+        """Return the WaitStats object recording waitfor timings or None"""
+        return self._waitstats
+
     @property
     def source(self):
         """Retrieve page source"""
+        self.checkbudget()
         return self.selenium_driver.page_source
 
 
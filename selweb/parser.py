@@ -0,0 +1,130 @@
+# Module:
+# Submodules:
+# Created:
+# Copyright (C) <date> <fullname>
+#
+# This module is part of the <project name> project and is released under
+# the MIT License: http://opensource.org/licenses/MIT
+"""
+"""
+
+# ============================================================================
+# Imports
+# ============================================================================
+
+
+# Stdlib imports
+from abc import ABCMeta, abstractmethod
+
+# Third-party imports
+from lxml import html
+
+try:
+    import html5_parser
+except ImportError:  # pragma: no cover
+    html5_parser = None
+
+# Local imports
+
+
+# ============================================================================
+# ParserBackend
+# ============================================================================
+
+
+class ParserBackend(metaclass=ABCMeta):
+    """Turns a page source into a tree that WebPage can query
+
+    The tree returned by parse() must be accepted by util.evaluate_xpath,
+    ie be an lxml tree or provide its own xpath() method, and its nodes must
+    be accepted by tostring().
+
+    """
+    __slots__ = ()
+
+    # Name the backend is registered under
+    name = None
+
+    # Module required by the backend, if any
+    requires = None
+
+    @abstractmethod
+    def parse(self, source):
+        """Parse an html source string and return the root node"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def tostring(self, node):
+        """Serialize a node of a parsed tree to a str"""
+        raise NotImplementedError
+
+    @classmethod
+    def available(cls):
+        """Return True if the backend's dependency is installed"""
+        return True
+
+
+class LxmlBackend(ParserBackend):
+    """Parse with lxml's libxml2 html parser"""
+    __slots__ = ()
+    name = 'lxml'
+
+    def parse(self, source):
+        return html.fromstring(source)
+
+    def tostring(self, node):
+        return html.tostring(node).decode('utf-8')
+
+
+class Html5ParserBackend(LxmlBackend):
+    """Parse with html5-parser, a fast C implementation of the html5 spec
+
+    html5-parser builds lxml.html trees directly, so xpath evaluation and
+    serialization are shared with the lxml backend.
+
+    """
+    __slots__ = ()
+    name = 'html5-parser'
+    requires = 'html5_parser'
+
+    def __init__(self):
+        if html5_parser is None:
+            raise ImportError('html5-parser backend requires html5-parser '
+                              'to be installed')
+
+    def parse(self, source):
+        return html5_parser.parse(source, treebuilder='lxml_html')
+
+    @classmethod
+    def available(cls):
+        return html5_parser is not None
+
+
+# ============================================================================
+# Registry
+# ============================================================================
+
+
+BACKENDS = {cls.name: cls for cls in [LxmlBackend, Html5ParserBackend]}
+
+
+def available_backends():
+    """Return the names of the backends whose dependency is installed"""
+    return [name for name, cls in BACKENDS.items() if cls.available()]
+
+
+def get_backend(name):
+    """Return a new instance of the backend registered under name"""
+    cls = BACKENDS.get(name)
+    if cls is None:
+        raise ValueError('Unknown parser backend: {!r}'.format(name))
+    return cls()
+
+
+# Backend used by WebPage when none is given
+default_backend = LxmlBackend()
+
+
+# ============================================================================
+#
+# ============================================================================
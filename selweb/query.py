@@ -0,0 +1,211 @@
+# Module:
+# Submodules:
+# Created:
+# Copyright (C) <date> <fullname>
+#
+# This module is part of the <project name> project and is released under
+# the MIT License: http://opensource.org/licenses/MIT
+"""
+"""
+
+# ============================================================================
+# Imports
+# ============================================================================
+
+
+# Stdlib imports
+from collections import deque
+from fnmatch import translate
+from functools import lru_cache
+import re
+
+# Third-party imports
+
+# Local imports
+from .core import CompositePageObject
+
+
+# ============================================================================
+# Globals
+# ============================================================================
+
+
+# Query step kinds
+STEP_NAME = 0
+STEP_ANY = 1
+STEP_MATCH = 2
+STEP_DESCENDANTS = 3
+
+WILDCARD_CHARS = frozenset('*?[')
+
+# Marks an exhausted iterator
+_END = object()
+
+
+# ============================================================================
+# Traversal
+# ============================================================================
+
+
+def walk(obj, *, breadth=False, prune=None):
+    """Lazily yield (name path, object) of every descendant of obj
+
+    Descendants are yielded depth first in preorder, or breadth first if
+    breadth is True, in their parent's child order. prune, if given, is
+    called with each yielded (name path, object) and the object's children
+    are skipped if it returns True. Children are only looked up (and lazy
+    children created) when reached, so pruned subtrees are never built.
+
+    The tree must not be modified while walking.
+
+    """
+    if not isinstance(obj, CompositePageObject):
+        errmsg = ('obj arg expected {} object, got {} object instead'.
+                  format(CompositePageObject.__name__, type(obj).__name__))
+        raise TypeError(errmsg)
+    elif prune is not None and not callable(prune):
+        errmsg = ('prune arg expected callable object, got {} object '
+                  'instead'.format(type(prune).__name__))
+        raise TypeError(errmsg)
+    if breadth:
+        return _walkbreadth(obj, prune)
+    return _walkdepth(obj, prune)
+
+
+def _walkdepth(obj, prune):
+    # Stack of (path, composite, iterator over its child names)
+    stack = [((), obj, iter(obj))]
+    while stack:
+        path, parent, names = stack[-1]
+        name = next(names, _END)
+        if name is _END:
+            stack.pop()
+            continue
+        child = parent[name]
+        childpath = path + (name, )
+        yield childpath, child
+        if (isinstance(child, CompositePageObject) and
+                not (prune is not None and prune(childpath, child))):
+            stack.append((childpath, child, iter(child)))
+
+
+def _walkbreadth(obj, prune):
+    queue = deque([((), obj)])
+    while queue:
+        path, parent = queue.popleft()
+        for name in parent:
+            child = parent[name]
+            childpath = path + (name, )
+            yield childpath, child
+            if (isinstance(child, CompositePageObject) and
+                    not (prune is not None and prune(childpath, child))):
+                queue.append((childpath, child))
+
+
+# ============================================================================
+# Path queries
+# ============================================================================
+
+
+@lru_cache(maxsize=256)
+def compile_query(query):
+    """Compile a path query into a tuple of (kind, argument) steps
+
+    A query is a '/' separated list of segments, each matching children of
+    the objects matched so far:
+
+    * ``name`` matches the child with that name; a segment of digits also
+      matches an int name (eg WebObjectList items)
+    * ``*`` matches every child
+    * a segment with shell wildcards (``*``, ``?``, ``[...]``) matches the
+      children whose name, as a string, matches it
+    * ``**`` matches the current objects and all of their descendants
+
+    Compiled queries are cached.
+
+    """
+    if not isinstance(query, str):
+        errmsg = ('query arg expected {} object, got {} object instead'.
+                  format(str.__name__, type(query).__name__))
+        raise TypeError(errmsg)
+    steps = []
+    for segment in query.split('/'):
+        if not segment:
+            raise ValueError('Invalid query, empty segment: {!r}'.
+                             format(query))
+        elif segment == '**':
+            if steps and steps[-1][0] == STEP_DESCENDANTS:
+                continue
+            steps.append((STEP_DESCENDANTS, None))
+        elif segment == '*':
+            steps.append((STEP_ANY, None))
+        elif WILDCARD_CHARS.intersection(segment):
+            steps.append((STEP_MATCH, re.compile(translate(segment)).match))
+        else:
+            names = (segment, )
+            if segment.isdigit():
+                names += (int(segment), )
+            steps.append((STEP_NAME, names))
+    return tuple(steps)
+
+
+def _stepname(objs, names):
+    for obj in objs:
+        if not isinstance(obj, CompositePageObject):
+            continue
+        # Check membership first so errors raised while creating a lazy
+        # child are not mistaken for a missing name
+        for name in names:
+            if name in obj:
+                yield obj[name]
+                break
+
+
+def _stepany(objs, arg):
+    for obj in objs:
+        if isinstance(obj, CompositePageObject):
+            for name in obj:
+                yield obj[name]
+
+
+def _stepmatch(objs, match):
+    for obj in objs:
+        if isinstance(obj, CompositePageObject):
+            for name in obj:
+                if match(str(name)):
+                    yield obj[name]
+
+
+def _stepdescendants(objs, arg):
+    for obj in objs:
+        yield obj
+        if isinstance(obj, CompositePageObject):
+            for _, child in _walkdepth(obj, None):
+                yield child
+
+
+STEPS = {
+    STEP_NAME: _stepname,
+    STEP_ANY: _stepany,
+    STEP_MATCH: _stepmatch,
+    STEP_DESCENDANTS: _stepdescendants,
+}
+
+
+def select(obj, query):
+    """Lazily yield the objects below obj matching a path query
+
+    See compile_query() for the query syntax, eg ``'results/*/title'``.
+    Every step is a generator over the previous one, so no intermediate
+    collection of matches is built.
+
+    """
+    objs = iter((obj, ))
+    for kind, arg in compile_query(query):
+        objs = STEPS[kind](objs, arg)
+    return objs
+
+
+# ============================================================================
+#
+# ============================================================================
@@ -0,0 +1,449 @@
+# Module:
+# Submodules:
+# Created:
+# Copyright (C) <date> <fullname>
+#
+# This module is part of the <project name> project and is released under
+# the MIT License: http://opensource.org/licenses/MIT
+"""
+"""
+
+# ============================================================================
+# Imports
+# ============================================================================
+
+
+# Stdlib imports
+from array import array
+from collections import OrderedDict
+import json
+import struct
+import sys
+import zlib
+
+# Third-party imports
+from yarl import URL
+
+# Local imports
+from .core import CompositePageObject, Page, PageObject
+from .parser import default_backend
+
+
+# ============================================================================
+# Globals
+# ============================================================================
+
+
+MAGIC = b'SWSN'
+
+VERSION = 2
+
+# magic, version, flags, number of strings, number of nodes, string bytes
+HEADER = struct.Struct('<4sBBxxIII')
+
+# Header flags
+FLAG_ZLIB = 0x01
+
+# Node kinds, stored in the low bits of a node's flags
+KIND_OBJECT = 0
+KIND_COMPOSITE = 1
+KIND_PAGE = 2
+KIND_MASK = 0x03
+
+# Node flag set when the node's name is an int (eg WebObjectList items)
+NAME_INT = 0x04
+
+# Ints stored per node: flags, name, xpath, absxpath, source, url, class,
+# state, number of children. Strings are indexes into the string table, -1
+# is None
+NODE_SIZE = 9
+
+# Integers are stored little endian
+SWAP = sys.byteorder == 'big'
+
+
+# ============================================================================
+# Errors
+# ============================================================================
+
+
+class SnapshotError(ValueError):
+    """Data is not a valid snapshot"""
+
+
+def _readonly(*args, **kwargs):
+    raise TypeError('Snapshot objects are read-only')
+
+
+# ============================================================================
+# Encoding
+# ============================================================================
+
+
+class _Encoder:
+    """Collect nodes and a deduplicated string table"""
+    __slots__ = ('nodes', 'strings', '_index')
+
+    def __init__(self):
+        self.nodes = array('i')
+        self.strings = []
+        self._index = {}
+
+    def string(self, value):
+        """Return the string table index of value"""
+        if value is None:
+            return -1
+        index = self._index.get(value)
+        if index is None:
+            index = self._index[value] = len(self.strings)
+            self.strings.append(value.encode('utf-8', 'surrogatepass'))
+        return index
+
+    def add(self, obj):
+        """Add obj and its descendants in preorder"""
+        stack = [obj]
+        while stack:
+            obj = stack.pop()
+            name = obj.name
+            if isinstance(name, bool) or not isinstance(name, (int, str)):
+                errmsg = ('Snapshot names expected {} or {} object, got {} '
+                          'object instead'.format(str.__name__, int.__name__,
+                                                  type(name).__name__))
+                raise TypeError(errmsg)
+            flags = NAME_INT if isinstance(name, int) else 0
+            url = None
+            children = ()
+            if isinstance(obj, CompositePageObject):
+                children = list(obj.children())
+                if isinstance(obj, Page):
+                    flags |= KIND_PAGE
+                    url = str(obj.url)
+                else:
+                    flags |= KIND_COMPOSITE
+            clsname, state = _restoreinfo(obj)
+            self.nodes.extend([flags, self.string(str(name)),
+                               self.string(obj.xpath),
+                               self.string(obj.absxpath),
+                               self.string(obj.source), self.string(url),
+                               self.string(clsname), self.string(state),
+                               len(children)])
+            stack.extend(reversed(children))
+
+
+def _restoreinfo(obj):
+    """Return the class path and JSON encoded restore state of obj"""
+    if isinstance(obj, SnapshotObject):
+        strings = obj._strings
+        return strings[obj._clsid], strings[obj._stateid]
+    cls = type(obj)
+    getstate = getattr(obj, '_snapshotstate', None)
+    state = None if getstate is None else getstate()
+    return ('{}:{}'.format(cls.__module__, cls.__qualname__),
+            None if state is None else json.dumps(state, sort_keys=True))
+
+
+def dumps(obj, *, compress=False):
+    """Return a binary snapshot of a page object tree
+
+    The names, xpaths, absolute xpaths, sources, classes and structure of obj
+    and all of its descendants are stored, along with the state returned by
+    an object's _snapshotstate() method, if any, used to rebuild it (see
+    WebPage.reload); the browser and parser are not. Every registered lazy
+    child is created. If compress is True (or a zlib level from 1 to 9) the
+    body is zlib compressed.
+
+    """
+    if not isinstance(obj, PageObject):
+        errmsg = ('obj arg expected {} object, got {} object instead'.
+                  format(PageObject.__name__, type(obj).__name__))
+        raise TypeError(errmsg)
+    enc = _Encoder()
+    enc.add(obj)
+    lengths = array('I', map(len, enc.strings))
+    nodes = enc.nodes
+    if SWAP:
+        lengths.byteswap()
+        nodes.byteswap()
+    blob = b''.join(enc.strings)
+    body = b''.join([lengths.tobytes(), nodes.tobytes(), blob])
+    flags = 0
+    if compress:
+        level = -1 if compress is True else compress
+        body = zlib.compress(body, level)
+        flags |= FLAG_ZLIB
+    header = HEADER.pack(MAGIC, VERSION, flags, len(lengths),
+                         len(nodes) // NODE_SIZE, len(blob))
+    return header + body
+
+
+def dump(obj, file, *, compress=False):
+    """Write a binary snapshot of a page object tree to a binary file"""
+    file.write(dumps(obj, compress=compress))
+
+
+# ============================================================================
+# Decoding
+# ============================================================================
+
+
+class _Strings:
+    """String table decoded on access"""
+    __slots__ = ('_blob', '_offsets')
+
+    def __init__(self, blob, lengths):
+        offsets = array('Q', [0])
+        total = 0
+        for n in lengths:
+            total += n
+            offsets.append(total)
+        self._blob = blob
+        self._offsets = offsets
+
+    def __getitem__(self, index):
+        if index < 0:
+            return None
+        offsets = self._offsets
+        return str(self._blob[offsets[index]:offsets[index + 1]], 'utf-8',
+                   'surrogatepass')
+
+
+def loads(data):
+    """Return the root of the read-only tree stored in a binary snapshot
+
+    data may be any bytes-like object, including an mmap. It must not be
+    modified while the returned tree is in use.
+
+    """
+    view = memoryview(data)
+    if len(view) < HEADER.size:
+        raise SnapshotError('Snapshot data too short')
+    magic, version, flags, numstrings, numnodes, bloblen = \
+        HEADER.unpack_from(view)
+    if magic != MAGIC:
+        raise SnapshotError('Not a snapshot')
+    elif version != VERSION:
+        raise SnapshotError('Unsupported snapshot version: {}'.
+                            format(version))
+    body = view[HEADER.size:]
+    if flags & FLAG_ZLIB:
+        body = memoryview(zlib.decompress(body))
+
+    lengths = array('I')
+    nodes = array('i')
+    lensize = numstrings * lengths.itemsize
+    nodesize = numnodes * NODE_SIZE * nodes.itemsize
+    if len(body) != lensize + nodesize + bloblen:
+        raise SnapshotError('Snapshot data corrupt')
+    lengths.frombytes(body[:lensize])
+    nodes.frombytes(body[lensize:lensize + nodesize])
+    if SWAP:
+        lengths.byteswap()
+        nodes.byteswap()
+    # The string table is not copied, so sources are decoded straight from
+    # data (eg an mmap) when accessed
+    strings = _Strings(body[lensize + nodesize:], lengths)
+
+    root = None
+    # [composite, children left to add]
+    stack = []
+    for i in range(0, len(nodes), NODE_SIZE):
+        (flags, name, xpath, absxpath, source, url, clsid, stateid,
+         numchildren) = nodes[i:i + NODE_SIZE]
+        name = strings[name]
+        if flags & NAME_INT:
+            name = int(name)
+        parent = stack[-1][0] if stack else None
+        kind = flags & KIND_MASK
+        cls = SNAPSHOT_CLASSES[kind]
+        obj = cls(name, strings[xpath], strings[absxpath], parent, strings,
+                  source)
+        obj._clsid = clsid
+        obj._stateid = stateid
+        if kind == KIND_PAGE:
+            obj._url = URL(strings[url])
+        if parent is None:
+            root = obj
+        else:
+            parent._objmap[name] = obj
+            stack[-1][1] -= 1
+        if kind != KIND_OBJECT and numchildren:
+            stack.append([obj, numchildren])
+        while stack and not stack[-1][1]:
+            stack.pop()
+    if root is None or stack:
+        raise SnapshotError('Snapshot data corrupt')
+    return root
+
+
+def load(file):
+    """Read a binary snapshot from a binary file"""
+    return loads(file.read())
+
+
+# ============================================================================
+# Snapshot objects
+# ============================================================================
+
+
+@PageObject.register
+class SnapshotObject:
+    """Read-only page object loaded from a snapshot
+
+    It has no browser: visible is always False and reload() raises
+    TypeError. The source is decoded, and node parsed from it, on first
+    access.
+
+    """
+    __slots__ = ('_name', '_xpath', '_absxpath', '_parent', '_strings',
+                 '_sourceid', '_source', '_node', '_clsid', '_stateid')
+
+    def __init__(self, name, xpath, absxpath, parent, strings, sourceid):
+        self._name = name
+        self._xpath = xpath
+        self._absxpath = absxpath
+        self._parent = parent
+        self._strings = strings
+        self._sourceid = sourceid
+        self._source = None
+        self._node = None
+        self._clsid = -1
+        self._stateid = -1
+
+    def __bool__(self):
+        """Return whether the page object was valid when captured"""
+        return self._sourceid >= 0
+
+    reload = _readonly
+
+    @property
+    def name(self):
+        """Retrieve object's name"""
+        return self._name
+
+    @property
+    def source(self):
+        """Retrieve object's source"""
+        src = self._source
+        if src is None:
+            src = self._source = self._strings[self._sourceid]
+        return src
+
+    @property
+    def clsname(self):
+        """Return the module:qualname of the captured object's class"""
+        return self._strings[self._clsid]
+
+    @property
+    def state(self):
+        """Return the state stored to rebuild the captured object or None"""
+        state = self._strings[self._stateid]
+        return None if state is None else json.loads(state)
+
+    @property
+    def node(self):
+        """Return an lxml node parsed from the source"""
+        node = self._node
+        if node is None:
+            src = self.source
+            if src is not None:
+                node = self._node = default_backend.parse(src)
+        return node
+
+    @property
+    def xpath(self):
+        """Return the object's xpath relative to its parent"""
+        return self._xpath
+
+    @property
+    def absxpath(self):
+        """Return the object's absolute xpath"""
+        return self._absxpath
+
+    @property
+    def browser(self):
+        """Snapshots have no browser"""
+        return None
+
+    @property
+    def visible(self):
+        """Snapshots are never visible"""
+        return False
+
+    @property
+    def page(self):
+        """Return the object's page"""
+        cur = self
+        while cur._parent is not None:
+            cur = cur._parent
+        return cur
+
+    @property
+    def parent(self):
+        """Return the parent page object"""
+        return self._parent
+
+    @parent.setter
+    def parent(self, parent):
+        _readonly()
+
+
+@CompositePageObject.register
+class SnapshotCompositeObject(SnapshotObject):
+    """Read-only composite page object loaded from a snapshot"""
+    __slots__ = ('_objmap', )
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self._objmap = OrderedDict()
+
+    def __getitem__(self, name):
+        """Retrieve a child page object by name"""
+        return self._objmap[name]
+
+    def __contains__(self, name):
+        """Return whether name is the name of a child page object"""
+        return name in self._objmap
+
+    __delitem__ = add = clear = _readonly
+
+    def __iter__(self):
+        """Iterate over names of child page objects"""
+        return iter(self._objmap)
+
+    def __len__(self):
+        """Return the number of child page objects"""
+        return len(self._objmap)
+
+    def children(self):
+        """Iterator over child page objects"""
+        return self._objmap.values()
+
+
+@Page.register
+class SnapshotPage(SnapshotCompositeObject):
+    """Read-only page loaded from a snapshot"""
+    __slots__ = ('_url', )
+
+    go = _readonly
+
+    @property
+    def url(self):
+        """Return the page's location when captured"""
+        return self._url
+
+    @property
+    def parser(self):
+        """Return the lxml tree parsed from the page source"""
+        return self.node
+
+
+SNAPSHOT_CLASSES = {
+    KIND_OBJECT: SnapshotObject,
+    KIND_COMPOSITE: SnapshotCompositeObject,
+    KIND_PAGE: SnapshotPage,
+}
+
+
+# ============================================================================
+#
+# ============================================================================
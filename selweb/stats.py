@@ -0,0 +1,242 @@
+# Module:
+# Submodules:
+# Created:
+# Copyright (C) <date> <fullname>
+#
+# This module is part of the <project name> project and is released under
+# the MIT License: http://opensource.org/licenses/MIT
+"""
+"""
+
+# ============================================================================
+# Imports
+# ============================================================================
+
+
+# Stdlib imports
+from bisect import bisect_left
+from functools import partial
+from math import inf
+from threading import Lock
+
+# Third-party imports
+
+# Local imports
+from .condition import Condition
+
+
+# ============================================================================
+# Globals
+# ============================================================================
+
+
+# Upper bounds (in seconds) of the histogram buckets: 10ms doubling up to
+# ~5.5 minutes. Anything slower lands in a final overflow bucket.
+BUCKET_BOUNDS = tuple(0.01 * 2 ** i for i in range(16))
+
+
+# ============================================================================
+# Helpers
+# ============================================================================
+
+
+def condition_key(condition_func, xpath=None):
+    """Return the (condition name, xpath) key used to file a wait
+
+    Conditions built with functools.partial (eg WaitFor.element_text) carry
+    their locator as the first positional arg; its xpath is used when no
+    xpath is given. selweb.condition Conditions are keyed by their compiled
+    (script, args) so that distinct conditions of a type are not merged.
+
+    """
+    func = condition_func
+    if xpath is None and isinstance(func, Condition):
+        compiled = func.compile()
+        return (type(func).__name__, (compiled.script, compiled.args))
+    if isinstance(func, partial):
+        if xpath is None and func.args:
+            locator = func.args[0]
+            if isinstance(locator, tuple) and len(locator) == 2:
+                xpath = locator[1]
+        func = func.func
+    name = getattr(func, '__name__', type(func).__name__)
+    return (name, xpath)
+
+
+# ============================================================================
+# Histogram
+# ============================================================================
+
+
+class WaitHistogram:
+    """Log-bucketed histogram of the time taken to satisfy a condition"""
+    __slots__ = ('_buckets', '_count', '_total', '_min', '_max', '_timeouts')
+
+    def __init__(self):
+        self._buckets = [0] * (len(BUCKET_BOUNDS) + 1)
+        self._count = 0
+        self._total = 0.0
+        self._min = inf
+        self._max = 0.0
+        self._timeouts = 0
+
+    def add(self, seconds):
+        """Record a wait that was satisfied after the given seconds"""
+        self._buckets[bisect_left(BUCKET_BOUNDS, seconds)] += 1
+        self._count += 1
+        self._total += seconds
+        self._min = min(self._min, seconds)
+        self._max = max(self._max, seconds)
+
+    def add_timeout(self):
+        """Record a wait that was never satisfied"""
+        self._timeouts += 1
+
+    def percentile(self, p):
+        """Return the bucket bound below which p of all waits finished
+
+        Timed out waits count as never finishing, so inf is returned if the
+        percentile falls on them. None is returned if nothing was recorded.
+
+        """
+        if not 0 <= p <= 1:
+            errmsg = 'p arg expected to be between 0 and 1, got {} instead'
+            raise ValueError(errmsg.format(p))
+        total = self._count + self._timeouts
+        if not total:
+            return None
+        target = p * total
+        seen = 0
+        for bound, num in zip(BUCKET_BOUNDS + (self._max, ), self._buckets):
+            seen += num
+            if num and seen >= target:
+                return min(bound, self._max)
+        return inf
+
+    def export(self):
+        """Return the histogram as a dict of plain python values"""
+        count = self._count
+        return dict(
+            count=count,
+            timeouts=self._timeouts,
+            total=self._total,
+            mean=self._total / count if count else None,
+            min=self._min if count else None,
+            max=self._max if count else None,
+            buckets=list(self._buckets),
+        )
+
+    @property
+    def count(self):
+        """Return the number of satisfied waits"""
+        return self._count
+
+    @property
+    def timeouts(self):
+        """Return the number of waits that timed out"""
+        return self._timeouts
+
+
+# ============================================================================
+# WaitStats
+# ============================================================================
+
+
+class WaitStats:
+    """Collect WaitFor timings per condition and optionally tune timeouts
+
+    When autotimeout is True, the timeout of a condition that has at least
+    minsamples recorded waits is derived from the given percentile of its
+    observed wait times multiplied by factor, and clamped to
+    [mintimeout, maxtimeout].
+
+    """
+    __slots__ = ('_hist', '_lock', 'autotimeout', 'percentile', 'factor',
+                 'minsamples', 'mintimeout', 'maxtimeout')
+
+    def __init__(self, *, autotimeout=False, percentile=0.99, factor=2,
+                 minsamples=20, mintimeout=0.1, maxtimeout=60):
+        if not 0 <= percentile <= 1:
+            errmsg = ('percentile arg expected to be between 0 and 1, '
+                      'got {} instead'.format(percentile))
+            raise ValueError(errmsg)
+        self._hist = {}
+        self._lock = Lock()
+        self.autotimeout = autotimeout
+        self.percentile = percentile
+        self.factor = factor
+        self.minsamples = minsamples
+        self.mintimeout = mintimeout
+        self.maxtimeout = maxtimeout
+
+    def __getitem__(self, key):
+        """Return the histogram for a (condition name, xpath) key"""
+        return self._hist[key]
+
+    def __iter__(self):
+        """Iterate over recorded (condition name, xpath) keys"""
+        return iter(list(self._hist))
+
+    def __len__(self):
+        """Return the number of recorded keys"""
+        return len(self._hist)
+
+    def _histogram(self, key):
+        hist = self._hist.get(key)
+        if hist is None:
+            hist = self._hist.setdefault(key, WaitHistogram())
+        return hist
+
+    def record(self, key, seconds):
+        """Record a satisfied wait"""
+        with self._lock:
+            self._histogram(key).add(seconds)
+
+    def record_timeout(self, key):
+        """Record a wait that timed out"""
+        with self._lock:
+            self._histogram(key).add_timeout()
+
+    def timeout(self, key, default):
+        """Return the timeout to use for a wait on key
+
+        The default is returned unless autotimeout is enabled and enough
+        samples have been recorded for key.
+
+        """
+        if not self.autotimeout:
+            return default
+        hist = self._hist.get(key)
+        if hist is None or hist.count + hist.timeouts < self.minsamples:
+            return default
+        value = hist.percentile(self.percentile)
+        if value == inf:
+            return default
+        value *= self.factor
+        return min(max(value, self.mintimeout), self.maxtimeout)
+
+    def clear(self):
+        """Remove all recorded data"""
+        with self._lock:
+            self._hist.clear()
+
+    def export(self):
+        """Return all recorded data as a list of plain python dicts"""
+        with self._lock:
+            items = list(self._hist.items())
+        ret = []
+        for (name, xpath), hist in items:
+            data = dict(condition=name, xpath=xpath)
+            data.update(hist.export())
+            ret.append(data)
+        return ret
+
+    @property
+    def bucket_bounds(self):
+        """Return the upper bounds of the histogram buckets"""
+        return BUCKET_BOUNDS
+
+
+# ============================================================================
+#
+# ============================================================================
@@ -0,0 +1,156 @@
+# Module:
+# Submodules:
+# Created:
+# Copyright (C) <date> <fullname>
+#
+# This module is part of the <project name> project and is released under
+# the MIT License: http://opensource.org/licenses/MIT
+"""
+"""
+
+# ============================================================================
+# Imports
+# ============================================================================
+
+
+# Stdlib imports
+from collections import OrderedDict, namedtuple
+
+# Third-party imports
+from lxml import etree, html
+
+# Local imports
+
+
+# ============================================================================
+# Globals
+# ============================================================================
+
+
+DEFAULT_CHUNKSIZE = 64 * 1024
+
+
+Extractor = namedtuple('Extractor', 'name tag func match')
+
+
+# ============================================================================
+# StreamExtractor
+# ============================================================================
+
+
+class StreamExtractor:
+    """Extract data from an html source while it is being parsed
+
+    Extractors are registered per tag and called with each matching element
+    as soon as its end tag has been parsed, ie with its subtree complete.
+    Elements that are not inside a registered tag are freed once parsed, so
+    the tree is never fully built and peak memory stays bounded by the
+    largest matched subtree rather than the whole page.
+
+    """
+    __slots__ = ('_extractors', '_chunksize')
+
+    def __init__(self, *, chunksize=DEFAULT_CHUNKSIZE):
+        if not isinstance(chunksize, int):
+            errmsg = ('chunksize arg expected {} object, got {} object '
+                      'instead'.format(int.__name__, type(chunksize).__name__))
+            raise TypeError(errmsg)
+        elif chunksize < 1:
+            errmsg = ('chunksize arg expected to be >= 1, got {} instead'.
+                      format(chunksize))
+            raise ValueError(errmsg)
+        self._extractors = OrderedDict()
+        self._chunksize = chunksize
+
+    def register(self, name, tag, func, *, match=None):
+        """Register an extractor
+
+        func is called with every completed element with the given tag for
+        which match (if given) returns True. Non-None return values are
+        collected under name in the result of parse().
+
+        """
+        for argname, val in [('func', func), ('match', match)]:
+            if val is not None and not callable(val):
+                errmsg = ('{} arg expected callable object, got {} object '
+                          'instead'.format(argname, type(val).__name__))
+                raise TypeError(errmsg)
+        if name in self._extractors:
+            raise ValueError('Extractor {!r} already registered'.format(name))
+        self._extractors[name] = Extractor(name, tag, func, match)
+
+    def _chunks(self, source):
+        """Yield chunks of source
+
+        source may be a str or bytes object, a file-like object with a
+        read() method, or an iterable of str or bytes chunks.
+
+        """
+        size = self._chunksize
+        if isinstance(source, (str, bytes)):
+            for i in range(0, len(source), size):
+                yield source[i:i + size]
+        elif hasattr(source, 'read'):
+            while True:
+                chunk = source.read(size)
+                if not chunk:
+                    break
+                yield chunk
+        else:
+            yield from source
+
+    def parse(self, source):
+        """Parse source, running extractors as elements complete
+
+        Returns an OrderedDict mapping each extractor's name to the list of
+        values its func returned.
+
+        """
+        extractors = self._extractors
+        bytag = {}
+        for e in extractors.values():
+            bytag.setdefault(e.tag, []).append(e)
+        results = OrderedDict((name, []) for name in extractors)
+
+        parser = etree.HTMLPullParser(events=('start', 'end'))
+        parser.set_element_class_lookup(html.HtmlElementClassLookup())
+
+        # Number of currently open elements with a registered tag; while
+        # this is not zero, completed elements are still needed by an
+        # enclosing element and must not be freed
+        numopen = 0
+        for chunk in self._chunks(source):
+            parser.feed(chunk)
+            numopen = self._process(parser, bytag, results, numopen)
+        parser.close()
+        self._process(parser, bytag, results, numopen)
+        return results
+
+    @staticmethod
+    def _process(parser, bytag, results, numopen):
+        for event, el in parser.read_events():
+            matched = bytag.get(el.tag)
+            if event == 'start':
+                if matched:
+                    numopen += 1
+                continue
+            if matched:
+                numopen -= 1
+                for e in matched:
+                    if e.match is None or e.match(el):
+                        val = e.func(el)
+                        if val is not None:
+                            results[e.name].append(val)
+            if not numopen:
+                # Free the completed element and any earlier siblings
+                el.clear()
+                parent = el.getparent()
+                if parent is not None:
+                    while el.getprevious() is not None:
+                        del parent[0]
+        return numopen
+
+
+# ============================================================================
+#
+# ============================================================================
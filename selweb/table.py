@@ -0,0 +1,227 @@
+# Module:
+# Submodules:
+# Created:
+# Copyright (C) <date> <fullname>
+#
+# This module is part of the <project name> project and is released under
+# the MIT License: http://opensource.org/licenses/MIT
+"""
+"""
+
+# ============================================================================
+# Imports
+# ============================================================================
+
+
+# Stdlib imports
+from array import array
+
+# Third-party imports
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+# Local imports
+from .util import evaluate_xpath
+
+
+# ============================================================================
+# Globals
+# ============================================================================
+
+
+# Rows of a table in document order, without descending into nested tables
+ROW_XPATH = './tr | ./thead/tr | ./tbody/tr | ./tfoot/tr'
+
+# array typecodes used for columns converted with these types
+ARRAY_TYPECODE = {int: 'q', float: 'd'}
+
+
+# ============================================================================
+# Helpers
+# ============================================================================
+
+
+def _span(cell, attr):
+    """Return a cell's colspan or rowspan, treating bad values as 1"""
+    try:
+        return max(int(cell.get(attr, 1)), 1)
+    except ValueError:
+        return 1
+
+
+def iterrows(table):
+    """Iterate over the rows of a table node as lists of cell nodes
+
+    colspan and rowspan are resolved: a spanning cell is repeated in every
+    column and row it covers, so each yielded row is a dense list indexed by
+    column. Rows are not padded to a common width.
+
+    """
+    # column index -> [rows left, cell]
+    pending = {}
+    for tr in evaluate_xpath(table, ROW_XPATH):
+        row = []
+        col = 0
+        for cell in tr:
+            if cell.tag not in ('td', 'th'):
+                continue
+            while col in pending:
+                row.append(_take(pending, col))
+                col += 1
+            rowspan = _span(cell, 'rowspan')
+            for _ in range(_span(cell, 'colspan')):
+                row.append(cell)
+                if rowspan > 1:
+                    pending[col] = [rowspan - 1, cell]
+                col += 1
+        # Cells spanning into the end of this row
+        while pending and col <= max(pending):
+            row.append(_take(pending, col) if col in pending else None)
+            col += 1
+        yield row
+
+
+def _take(pending, col):
+    entry = pending[col]
+    entry[0] -= 1
+    if not entry[0]:
+        del pending[col]
+    return entry[1]
+
+
+def celltext(cell):
+    """Return the stripped text of a cell node"""
+    if not len(cell):
+        # Avoid text_content()'s xpath evaluation for text-only cells
+        text = cell.text
+        return '' if text is None else text.strip()
+    return cell.text_content().strip()
+
+
+# ============================================================================
+# Table
+# ============================================================================
+
+
+class Table:
+    """Column oriented data extracted from an html table"""
+    __slots__ = ('_columns', '_data', '_numrows')
+
+    def __init__(self, columns, data, numrows):
+        self._columns = tuple(columns)
+        self._data = dict(zip(self._columns, data))
+        self._numrows = numrows
+
+    def __getitem__(self, key):
+        """Return a column by name or index"""
+        if isinstance(key, int):
+            key = self._columns[key]
+        return self._data[key]
+
+    def __iter__(self):
+        """Iterate over column names"""
+        return iter(self._columns)
+
+    def __len__(self):
+        """Return the number of rows"""
+        return self._numrows
+
+    def todict(self):
+        """Return a dict mapping column names to column data"""
+        return dict(self._data)
+
+    @property
+    def columns(self):
+        """Return the column names"""
+        return self._columns
+
+
+# ============================================================================
+# Extraction
+# ============================================================================
+
+
+def extract_table(node, xpath=None, *, header=True, types=None,
+                  asnumpy=False):
+    """Extract an html table into columns in a single pass over its rows
+
+    node is the table element, or if xpath is given, the node the xpath is
+    evaluated relative to (eg WebPage.parser). colspan and rowspan are
+    resolved by repeating the spanning cell's value.
+
+    If header is True, the first row provides the column names; otherwise
+    columns are named by index. types maps column names or indexes to a
+    converter applied to each cell's text; empty cells of these columns are
+    missing and not converted. Columns converted with int or float are
+    stored as array.array (float columns store missing cells as nan, int
+    columns with missing cells fall back to a list); every other column is
+    a list with None for missing cells. If asnumpy is True every
+    column is returned as a numpy array, which requires numpy.
+
+    """
+    if asnumpy and numpy is None:
+        raise ImportError('asnumpy requires numpy to be installed')
+    if xpath is not None:
+        nodelist = evaluate_xpath(node, xpath)
+        if len(nodelist) != 1:
+            raise ValueError('Expected single table element, got {}'.
+                             format(len(nodelist)))
+        node = nodelist[0]
+    types = {} if types is None else types
+
+    rows = iterrows(node)
+    names = []
+    if header:
+        first = next(rows, None)
+        if first is not None:
+            names = [celltext(c) if c is not None else str(i)
+                     for i, c in enumerate(first)]
+
+    columns = [[] for _ in names]
+    converters = [types.get(n, types.get(i)) for i, n in enumerate(names)]
+    numrows = 0
+    for row in rows:
+        if len(row) > len(columns):
+            # A row wider than any seen so far adds new, backfilled columns
+            for i in range(len(columns), len(row)):
+                names.append(str(i))
+                columns.append([None] * numrows)
+                converters.append(types.get(i))
+        for i, col in enumerate(columns):
+            cell = row[i] if i < len(row) else None
+            if cell is None:
+                col.append(None)
+                continue
+            value = celltext(cell)
+            convert = converters[i]
+            if convert is not None:
+                # Empty cells of typed columns are missing values
+                value = None if not value else convert(value)
+            col.append(value)
+        numrows += 1
+
+    data = [_column(col, convert, asnumpy)
+            for col, convert in zip(columns, converters)]
+    return Table(names, data, numrows)
+
+
+def _column(values, convert, asnumpy):
+    """Return the storage for a column's values"""
+    typecode = ARRAY_TYPECODE.get(convert)
+    if typecode == 'd':
+        values = array('d', (float('nan') if v is None else v
+                             for v in values))
+    elif typecode == 'q' and None not in values:
+        values = array('q', values)
+    if asnumpy:
+        if isinstance(values, array):
+            return numpy.frombuffer(values, dtype=values.typecode).copy()
+        return numpy.array(values, dtype=object)
+    return values
+
+
+# ============================================================================
+#
+# ============================================================================
@@ -14,10 +14,14 @@
 
 
 # Stdlib imports
+from collections import OrderedDict
 from collections.abc import Sequence
 from contextlib import contextmanager
+from hashlib import blake2b
+from threading import Lock
 
 # Third-party imports
+from lxml import etree
 
 # Local imports
 
@@ -57,6 +61,129 @@ def noop_context():
     yield
 
 
+# ============================================================================
+# XPath cache
+# ============================================================================
+
+
+class XPathCache:
+    """Bounded LRU cache of compiled lxml XPath objects keyed by expression"""
+    __slots__ = ('_cache', '_lock', '_maxsize', 'hits', 'misses')
+
+    def __init__(self, maxsize=1024):
+        if not isinstance(maxsize, int):
+            errmsg = ('maxsize arg expected {} object, got {} object instead'.
+                      format(int.__name__, type(maxsize).__name__))
+            raise TypeError(errmsg)
+        elif maxsize < 1:
+            errmsg = ('maxsize arg expected to be >= 1, got {} instead'.
+                      format(maxsize))
+            raise ValueError(errmsg)
+        self._cache = OrderedDict()
+        self._lock = Lock()
+        self._maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+
+    def __getitem__(self, expr):
+        """Return the compiled XPath for expr"""
+        cache = self._cache
+        with self._lock:
+            compiled = cache.get(expr)
+            if compiled is not None:
+                cache.move_to_end(expr)
+                self.hits += 1
+                return compiled
+            self.misses += 1
+
+        # Compile outside the lock; a concurrent compile of the same
+        # expression is harmless
+        compiled = etree.XPath(expr)
+        with self._lock:
+            cache[expr] = compiled
+            if len(cache) > self._maxsize:
+                cache.popitem(last=False)
+        return compiled
+
+    def __len__(self):
+        """Return the number of cached expressions"""
+        return len(self._cache)
+
+    def clear(self):
+        """Remove all compiled expressions and reset the counters"""
+        with self._lock:
+            self._cache.clear()
+            self.hits = 0
+            self.misses = 0
+
+    @property
+    def maxsize(self):
+        """Return the maximum number of cached expressions"""
+        return self._maxsize
+
+
+# Process-wide cache used by evaluate_xpath()
+xpathcache = XPathCache()
+
+
+def evaluate_xpath(node, expr):
+    """Evaluate xpath expr against node
+
+    lxml nodes are evaluated with a cached compiled XPath. Any other object
+    is expected to provide its own xpath() method.
+
+    """
+    if isinstance(node, (etree._Element, etree._ElementTree)):
+        return xpathcache[expr](node)
+    return node.xpath(expr)
+
+
+# ============================================================================
+# Subtree digest
+# ============================================================================
+
+
+def subtree_digest(node, memo=None):
+    """Return a Merkle digest of an lxml node and its descendants
+
+    The digest of a node covers its tag, attributes and text, and the
+    digest and tail text of each of its children, so two nodes have the same
+    digest if and only if (barring collisions) their subtrees are equal.
+    The node's own tail belongs to its parent and is not included.
+
+    memo, if given, is a dict mapping nodes to their digest. It is used to
+    skip nodes whose digest is already known and is updated with every node
+    digested, so digesting several nodes of one tree costs one pass.
+
+    """
+    memo = {} if memo is None else memo
+    ret = memo.get(node)
+    if ret is not None:
+        return ret
+
+    # Reversed document order visits every node after its descendants
+    for el in reversed(list(node.iter())):
+        if el in memo:
+            continue
+        tag = el.tag
+        h = blake2b(digest_size=16)
+        h.update((tag if isinstance(tag, str) else
+                  '#' + type(el).__name__).encode('utf-8'))
+        for k, v in sorted(el.attrib.items()):
+            h.update(b'\x00')
+            h.update(k.encode('utf-8', 'surrogatepass'))
+            h.update(b'=')
+            h.update(v.encode('utf-8', 'surrogatepass'))
+        h.update(b'\x01')
+        h.update((el.text or '').encode('utf-8', 'surrogatepass'))
+        for child in el:
+            h.update(b'\x02')
+            h.update(memo[child])
+            h.update((child.tail or '').encode('utf-8', 'surrogatepass'))
+        memo[el] = h.digest()
+    return memo[node]
+
+
 # ============================================================================
 #
 # ============================================================================
@@ -0,0 +1,264 @@
+# Module:
+# Submodules:
+# Created:
+# Copyright (C) <date> <fullname>
+#
+# This module is part of the <project name> project and is released under
+# the MIT License: http://opensource.org/licenses/MIT
+"""
+"""
+
+# ============================================================================
+# Imports
+# ============================================================================
+
+
+# Stdlib imports
+from collections import namedtuple
+from itertools import chain
+from time import monotonic, sleep
+
+# Third-party imports
+
+# Local imports
+from .web import WebPage
+
+
+# ============================================================================
+# Globals
+# ============================================================================
+
+
+# Install a MutationObserver queueing the elements whose attributes, text or
+# children changed, at most arguments[0] of them. Returns false if one is
+# already installed.
+INSTALL_SCRIPT = """\
+var w = window, maxqueue = arguments[0];
+if (w.__selwebWatch) { return false; }
+var state = w.__selwebWatch = {targets: [], overflow: false};
+state.observer = new MutationObserver(function(records) {
+    if (state.overflow) { return; }
+    for (var i = 0; i < records.length; i++) {
+        var r = records[i], t = r.target;
+        state.targets.push([t.nodeType === 1 ? t : t.parentNode,
+                            r.type === 'childList']);
+    }
+    if (state.targets.length > maxqueue) {
+        state.overflow = true;
+        state.targets = [];
+    }
+});
+state.observer.observe(document, {subtree: true, childList: true,
+                                  attributes: true, characterData: true});
+return true;
+"""
+
+# Return the indexes of the xpath arguments whose element changed, or is
+# gone, since the last call and empty the queue. An element also changed if
+# children were replaced above it. Returns null if no observer is
+# installed, eg after the document changed.
+POLL_SCRIPT = """\
+var state = window.__selwebWatch;
+if (!state) { return null; }
+var targets = state.targets, overflow = state.overflow;
+state.targets = [];
+state.overflow = false;
+var ret = [];
+if (!targets.length && !overflow) { return ret; }
+for (var i = 0; i < arguments.length; i++) {
+    var e = document.evaluate(arguments[i], document, null,
+        XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    var hit = overflow || e === null;
+    for (var j = 0; !hit && j < targets.length; j++) {
+        var t = targets[j][0];
+        hit = t !== null && (e.contains(t) ||
+                             (targets[j][1] && t.contains(e)));
+    }
+    if (hit) { ret.push(i); }
+}
+return ret;
+"""
+
+# Disconnect and remove the observer
+UNINSTALL_SCRIPT = """\
+var state = window.__selwebWatch;
+if (state) {
+    state.observer.disconnect();
+    delete window.__selwebWatch;
+}
+"""
+
+# Queued mutations past which every watched object counts as changed
+MAXQUEUE = 10000
+
+
+# A change to the object at a name path. kind is 'added', 'changed' or
+# 'removed'; olddigest is the object's subtree digest before the change if
+# it was affected by an observed mutation, and source its new source.
+ChangeEvent = namedtuple('ChangeEvent', 'kind path olddigest source')
+
+
+# ============================================================================
+# PageWatcher
+# ============================================================================
+
+
+class PageWatcher:
+    """Watch a WebPage's browser document for changes
+
+    A MutationObserver injected into the document queues changed elements.
+    Every poll runs one script that maps the queue to the watched objects,
+    ie every object of the page's tree that was already created. The page
+    source is only fetched, and the page refreshed (see WebPage.refresh),
+    when a watched object was affected, and only changed objects are
+    reloaded. Changes to the document outside every watched object are
+    ignored.
+
+    Polls are at least interval seconds apart. Change events are passed to
+    callback, if given, and returned by poll(); iterating over the watcher
+    polls until stop() is called.
+
+    """
+    __slots__ = ('_page', '_interval', '_callback', '_last', '_document',
+                 '_running')
+
+    def __init__(self, page, *, interval=1.0, callback=None):
+        if not isinstance(page, WebPage):
+            errmsg = ('page arg expected {} object, got {} object instead'.
+                      format(WebPage.__name__, type(page).__name__))
+            raise TypeError(errmsg)
+        elif not isinstance(interval, (int, float)):
+            errmsg = ('interval arg expected {} object, got {} object '
+                      'instead'.format(float.__name__,
+                                       type(interval).__name__))
+            raise TypeError(errmsg)
+        elif interval < 0:
+            errmsg = ('interval arg expected to be >= 0, got {} instead'.
+                      format(interval))
+            raise ValueError(errmsg)
+        elif callback is not None and not callable(callback):
+            errmsg = ('callback arg expected callable object, got {} object '
+                      'instead'.format(type(callback).__name__))
+            raise TypeError(errmsg)
+        self._page = page
+        self._interval = interval
+        self._callback = callback
+        self._last = None
+        self._document = None
+        self._running = False
+
+    def __iter__(self):
+        """Yield change events until stop() is called"""
+        if not self._running:
+            yield from self.start()
+        while self._running:
+            yield from self.poll()
+
+    def start(self):
+        """Install the observer and bring the page up to date"""
+        self._running = True
+        self._install()
+        return self._update(None)
+
+    def stop(self):
+        """Remove the observer and end iteration"""
+        self._running = False
+        self._page.browser.execute(UNINSTALL_SCRIPT)
+
+    def poll(self):
+        """Wait for the interval to pass and return the new change events"""
+        last = self._last
+        if last is not None:
+            wait = last + self._interval - monotonic()
+            if wait > 0:
+                sleep(wait)
+        self._last = monotonic()
+
+        page = self._page
+        if self._document != page.browser.document:
+            # The browser reads another document, eg after go() or switch()
+            self._install()
+            return self._update(None)
+
+        paths, objects = self._watched()
+        affected = page.browser.execute(POLL_SCRIPT,
+                                        *[o.absxpath for o in objects])
+        if affected is None:
+            # The document was replaced, eg by a link or form submission
+            self._install()
+            return self._update(None)
+        elif not affected:
+            return []
+        return self._update({paths[i]: objects[i].nodedigest
+                             for i in affected})
+
+    def _install(self):
+        page = self._page
+        self._document = page.browser.document
+        page.browser.execute(INSTALL_SCRIPT, MAXQUEUE)
+
+    def _watched(self):
+        """Return the name paths and objects of the created descendants
+
+        Descendants are listed in preorder.
+
+        """
+        paths = []
+        objects = []
+        stack = [((), self._page)]
+        while stack:
+            path, obj = stack.pop()
+            if path:
+                paths.append(path)
+                objects.append(obj)
+            if isinstance(obj, WebPage) and path:
+                # Nested pages watch their own tree
+                continue
+            children = chain(getattr(obj, '_objmap', {}).items(),
+                             getattr(obj, '_lazyobj', {}).items())
+            stack.extend(reversed([(path + (name, ), child)
+                                   for name, child in children
+                                   if hasattr(child, '_refresh')]))
+        return paths, objects
+
+    def _update(self, olddigests):
+        """Refresh the page and publish the changes
+
+        olddigests maps the name paths of the affected objects to their
+        digest before the change.
+
+        """
+        olddigests = {} if olddigests is None else olddigests
+        page = self._page
+        report = page.refresh()
+        events = []
+        for kind, paths in zip(['added', 'changed', 'removed'], report):
+            for path in paths:
+                source = None
+                if kind == 'changed':
+                    obj = page
+                    for name in path:
+                        obj = obj[name]
+                    source = obj.source
+                events.append(ChangeEvent(kind, path, olddigests.get(path),
+                                          source))
+        callback = self._callback
+        if callback is not None:
+            for e in events:
+                callback(e)
+        return events
+
+    @property
+    def interval(self):
+        """Return the minimum number of seconds between polls"""
+        return self._interval
+
+    @property
+    def page(self):
+        """Return the watched page"""
+        return self._page
+
+
+# ============================================================================
+#
+# ============================================================================
@@ -15,16 +15,158 @@
 
 # Stdlib imports
 from abc import abstractmethod
-from collections import OrderedDict
-from contextlib import contextmanager
+from collections import OrderedDict, namedtuple
+from concurrent.futures import Executor
+from contextlib import ExitStack, contextmanager
+from copy import copy
+from hashlib import blake2b
+from importlib import import_module
+from itertools import chain
+import json
+from sys import getsizeof
+from threading import RLock, local
+from weakref import ref
 
 # Third-party imports
-from lxml import html
+from lxml import etree
 from yarl import URL
 
 # Local imports
+from .cache import ExtractionCache
+from .condition import VISIBILITY_SCRIPT
 from .core import Browser, CompositePageObject, Page, PageObject
-from .util import noop_context
+from .parser import ParserBackend, default_backend
+from .query import select, walk
+from .stream import StreamExtractor
+from .util import evaluate_xpath, noop_context, subtree_digest
+
+
+# ============================================================================
+# Globals
+# ============================================================================
+
+
+# Name paths of the objects added, changed and removed by a refresh
+RefreshReport = namedtuple('RefreshReport', 'added changed removed')
+
+# Marks the node of an object rebuilt from an ExtractionCache snapshot as
+# not bound yet
+_RESTORED = object()
+
+# Marks an exhausted iterator
+_END = object()
+
+# Marks the document token of a WebPage being built as not read yet
+_UNREAD = object()
+
+# Types of attribute values stored in snapshots to rebuild objects
+_SCALARS = (type(None), bool, int, float, str)
+
+
+# ============================================================================
+# Errors
+# ============================================================================
+
+
+class _SkipBuild(Exception):
+    """Raised at a reload context's yield to skip the code after it
+
+    Only cleanup code (eg in finally clauses) runs. refresh() rejects
+    contexts suppressing it with RuntimeError.
+
+    """
+
+
+class ChildReloadError(Exception):
+    """Some children failed to reload
+
+    errors maps the names of the failed children, in child order, to the
+    exception their reload raised.
+
+    """
+
+    def __init__(self, errors):
+        super().__init__('Failed to reload children: {}'.format(
+            ', '.join(repr(name) for name in errors)))
+        self.errors = errors
+
+
+# ============================================================================
+# Snapshot helpers
+# ============================================================================
+
+
+def _classpath(cls):
+    """Return the module:qualname path of a class"""
+    return '{}:{}'.format(cls.__module__, cls.__qualname__)
+
+
+def _importclass(path):
+    """Return the class at a module:qualname path"""
+    modname, _, qualname = path.partition(':')
+    obj = import_module(modname)
+    for attr in qualname.split('.'):
+        obj = getattr(obj, attr)
+    if not isinstance(obj, type):
+        raise ValueError('Not a class: {}'.format(path))
+    return obj
+
+
+def _importable(cls):
+    """Return whether cls can be imported back from its path"""
+    try:
+        return _importclass(_classpath(cls)) is cls
+    except (ImportError, AttributeError, ValueError):
+        return False
+
+
+def _jsonvalue(value):
+    """Return whether value survives a JSON round trip unchanged"""
+    try:
+        return json.loads(json.dumps(value)) == value
+    except (TypeError, ValueError):
+        return False
+
+
+def _subclassattrs(obj):
+    """Yield the names of attributes added by classes outside this module"""
+    for cls in type(obj).__mro__:
+        if cls.__module__ == __name__:
+            continue
+        slots = cls.__dict__.get('__slots__', ())
+        for name in (slots, ) if isinstance(slots, str) else slots:
+            if name in ('__dict__', '__weakref__'):
+                continue
+            elif name.startswith('__') and not name.endswith('__'):
+                name = '_{}{}'.format(cls.__name__.lstrip('_'), name)
+            yield name
+    yield from getattr(obj, '__dict__', ())
+
+
+def _restoreobject(snap, parent):
+    """Return the object tree rebuilt from a snapshot node
+
+    The objects are created without calling their __init__ and are bound
+    to the page's tree when first needed. Raises ValueError if snap was not
+    stored with the state to rebuild it.
+
+    """
+    cls = _importclass(snap.clsname)
+    state = snap.state
+    if (state is None or not issubclass(cls, WebObject) or
+            issubclass(cls, WebPage)):
+        raise ValueError('Cannot rebuild {} object'.format(snap.clsname))
+    obj = cls.__new__(cls)
+    obj._restore(snap, parent, state)
+    if isinstance(obj, CompositeWebObject):
+        for c in snap.children():
+            child = _restoreobject(c, obj)
+            name = child.name
+            if name in obj._factories:
+                obj._lazyobj[name] = child
+            else:
+                obj._objmap[name] = child
+    return obj
 
 
 # ============================================================================
@@ -34,10 +176,22 @@ from .util import noop_context
 
 @PageObject.register
 class WebObject:
-    """Describes a set of web elements"""
-    __slots__ = ('_name', '_xpath', '_parent', '_source', '_reload_context')
+    """Describes a set of web elements
+
+    A lean object holds only a weak reference to its parent and never keeps
+    its serialized source, so a tree is kept alive by its root alone and
+    is reclaimed without the cyclic garbage collector. Objects are lean if
+    lean is True or, when lean is None, if their parent is lean.
+
+    A reload context that is a method of the object is kept by name.
+
+    """
+    __slots__ = ('_name', '_xpath', '_parent', '_source', '_reload_context',
+                 '_absxpath', '_node', '_nodeparser', '_lean', '_nodedigest',
+                 '__weakref__')
 
-    def __init__(self, name, xpath, parent, *, reloadcontext=None):
+    def __init__(self, name, xpath, parent, *, reloadcontext=None,
+                 lean=None):
         errmsg = None
         if not isinstance(xpath, str):
             errmsg = ('{} arg expected {} object, got {} object instead'.
@@ -53,11 +207,16 @@ class WebObject:
 
         self._name = name
         self._xpath = xpath
-        self._parent = parent
+        self._lean = (getattr(parent, 'lean', False) if lean is None
+                      else bool(lean))
+        self._setparent(parent)
         self._source = None
+        self._absxpath = None
+        self._node = None
+        self._nodeparser = None
+        self._nodedigest = None
 
-        self._reload_context = (noop_context if reloadcontext is None
-                                else reloadcontext)
+        self._setcontext(reloadcontext)
 
     # --------------------
     # General methods
@@ -72,13 +231,149 @@ class WebObject:
 
     def reload(self):
         """Reload the page object"""
-        with self._reload_context():
+        with self._context()():
             parser = self.page.parser
-            nodelist = parser.xpath(self.absxpath)
+            nodelist = self._evaluate(parser)
             assert len(nodelist) == 1, ('Expected single element, got {}'.
                                         format(len(nodelist)))
-            node = nodelist[0]
-            self._source = html.tostring(node).decode('utf-8')
+            self._loadnode(parser, nodelist[0])
+
+    def _evaluate(self, parser):
+        """Return the list of nodes in parser matching this object
+
+        If the parent has already resolved its own node in parser, only this
+        object's xpath is evaluated relative to that node instead of the
+        full absxpath from the document root. This is skipped when absxpath
+        is overridden since the two would no longer be equivalent.
+
+        """
+        parent = self.parent
+        if (type(self).absxpath is WebObject.absxpath and
+                isinstance(parent, CompositeWebObject)):
+            anchor = parent._anchor(parser)
+            if anchor is not None:
+                return evaluate_xpath(anchor, '.' + self.xpath)
+        return evaluate_xpath(parser, self.absxpath)
+
+    def _loadnode(self, parser, node):
+        """Keep the node this object resolved to
+
+        The source is only serialized from the node when first accessed.
+
+        """
+        self._bindnode(parser, node)
+        self._source = None
+        self._nodedigest = None
+
+    def _bindnode(self, parser, node):
+        """Point to node without forgetting data derived from the old node"""
+        self._node = node
+        self._nodeparser = parser
+
+    def _snapshotstate(self):
+        """Return the state stored in snapshots to rebuild this object
+
+        None is returned if the object cannot be rebuilt from its class and
+        state: its class must be importable, its reload context a method of
+        the object, and attributes added by subclasses plain scalars.
+
+        """
+        if not _importable(type(self)):
+            return None
+        context = self._reload_context
+        name = None
+        if isinstance(context, str):
+            name = context
+        elif context is not noop_context:
+            return None
+        attrs = {}
+        for attr in _subclassattrs(self):
+            try:
+                value = getattr(self, attr)
+            except AttributeError:
+                continue
+            if type(value) not in _SCALARS:
+                return None
+            attrs[attr] = value
+        digest = self._nodedigest
+        return dict(context=name, lean=self._lean, attrs=attrs,
+                    digest=None if digest is None else digest.hex())
+
+    def _restore(self, snap, parent, state):
+        """Set this object, created without __init__, from a snapshot"""
+        self._name = snap.name
+        self._xpath = snap.xpath
+        self._absxpath = snap.absxpath
+        self._lean = state['lean']
+        self._setparent(parent)
+        context = state['context']
+        self._reload_context = noop_context if context is None else context
+        self._source = None if self._lean else snap.source
+        self._node = None
+        self._nodeparser = _RESTORED
+        digest = state['digest']
+        self._nodedigest = None if digest is None else bytes.fromhex(digest)
+        for attr, value in state['attrs'].items():
+            setattr(self, attr, value)
+
+    def _setcontext(self, context):
+        """Store the reload context, by name if it is a method of self
+
+        Keeping the name avoids a reference cycle through the bound method
+        and makes copies made by _clone() run their own method.
+
+        """
+        if context is None:
+            context = noop_context
+        else:
+            name = getattr(context, '__name__', None)
+            if (getattr(context, '__self__', None) is self and
+                    getattr(self, name, None) == context):
+                context = name
+        self._reload_context = context
+
+    def _context(self):
+        """Return the reload context"""
+        context = self._reload_context
+        if isinstance(context, str):
+            return getattr(self, context)
+        return context
+
+    def _clone(self, parent):
+        """Return a shallow copy of this object attached to parent
+
+        refresh() rebinds copies, leaving the objects of the previous
+        WebPage generation untouched for the threads reading them.
+
+        """
+        ret = copy(self)
+        ret._setparent(parent)
+        return ret
+
+    def _refresh(self, parser, memos, path, report):
+        """Rebind to parser, reloading only if the node's subtree changed
+
+        memos is an (old tree, new tree) pair of subtree_digest memos.
+        Returns True if the node changed, False if it did not, and None if
+        the object no longer matches a single node.
+
+        """
+        nodelist = self._evaluate(parser)
+        if len(nodelist) != 1:
+            return None
+        oldmemo, newmemo = memos
+        node = nodelist[0]
+        old = self._nodedigest
+        if old is None and self._node is not None:
+            old = subtree_digest(self._node, oldmemo)
+        new = subtree_digest(node, newmemo)
+        changed = old != new
+        if changed:
+            self._loadnode(parser, node)
+        else:
+            self._bindnode(parser, node)
+        self._nodedigest = new
+        return changed
 
     @property
     def name(self):
@@ -89,23 +384,77 @@ class WebObject:
         """
         return self._name
 
+    @property
+    def node(self):
+        """Return the lxml node this object resolved to on reload
+
+        Objects rebuilt from an ExtractionCache are bound to the page's tree,
+        parsing the page source, on first access.
+
+        """
+        if self._nodeparser is _RESTORED:
+            self.page.parser
+        return self._node
+
+    @property
+    def nodedigest(self):
+        """Return the Merkle digest of the node's subtree or None"""
+        digest = self._nodedigest
+        if digest is None:
+            node = self.node
+            if node is not None:
+                digest = self._nodedigest = subtree_digest(node)
+        return digest
+
     @property
     def source(self):
         """Retrieve object's source"""
-        return self._source
+        src = self._source
+        if src is None:
+            node = self.node
+            if node is not None:
+                backend = getattr(self.page, 'backend', default_backend)
+                src = backend.tostring(node)
+                if not self._lean:
+                    self._source = src
+        return src
+
+    def drop_source(self):
+        """Release the cached source
+
+        It is serialized again from the node if accessed.
+
+        """
+        self._source = None
+
+    def clear_absxpath(self):
+        """Forget the cached absolute xpath"""
+        self._absxpath = None
 
     @property
     def absxpath(self):
-        """Calculate and return the xpath to the page object"""
-        xpath = []
-        cur = self
-        while True:
-            xpath.append(cur.xpath)
-            parent = cur.parent
-            if parent is None:
-                xpath.reverse()
-                return ''.join(xpath)
-            cur = parent
+        """Calculate and return the xpath to the page object
+
+        The result is cached until the parent is reassigned.
+
+        """
+        ret = self._absxpath
+        if ret is not None:
+            return ret
+        parent = self.parent
+        if isinstance(parent, WebObject):
+            # Builds on the parent's (possibly overridden) absxpath
+            ret = ''.join([parent.absxpath, self.xpath])
+        else:
+            xpath = []
+            cur = self
+            while cur is not None:
+                xpath.append(cur.xpath)
+                cur = cur.parent
+            xpath.reverse()
+            ret = ''.join(xpath)
+        self._absxpath = ret
+        return ret
 
     @property
     def xpath(self):
@@ -133,10 +482,18 @@ class WebObject:
                 return cur
             cur = parent
 
+    @property
+    def lean(self):
+        """Return True if the object is in memory-lean mode"""
+        return self._lean
+
     @property
     def parent(self):
         """Return the parent page object"""
-        return self._parent
+        parent = self._parent
+        if self._lean and parent is not None:
+            return parent()
+        return parent
 
     @parent.setter
     def parent(self, parent):
@@ -146,9 +503,145 @@ class WebObject:
                       format(CompositePageObject.__name__,
                              type(parent).__name__))
             raise TypeError(errmsg)
+        self._setparent(parent)
+        self.clear_absxpath()
+
+    def _setparent(self, parent):
+        """Store parent, by weak reference if lean"""
+        if self._lean and parent is not None:
+            try:
+                parent = ref(parent)
+            except TypeError:
+                # Parent does not support weak references
+                self._lean = False
         self._parent = parent
 
 
+# ============================================================================
+# Field
+# ============================================================================
+
+
+def text(value):
+    """Default field converter: stripped text content of a node"""
+    if isinstance(value, str):
+        return value.strip()
+    return value.text_content().strip()
+
+
+class Field:
+    """Declarative value extracted from a CompositeWebObject's node
+
+    Fields are declared as class attributes of CompositeWebObject (and so
+    WebPage) subclasses. xpath is relative to the object's node, like a
+    child's xpath. The value is the matched node's stripped text, or the
+    value of attribute attr if given, passed through convert if given. If
+    many is True the value is a list of every match, otherwise the first
+    match or default if nothing matched.
+
+    All fields of a class are compiled into a single extraction plan when
+    the class is created, and are extracted together from the lxml tree on
+    first access after each reload.
+
+    """
+    __slots__ = ('_name', '_xpath', '_compiled', '_attr', '_convert',
+                 '_many', '_default')
+
+    def __init__(self, xpath, *, attr=None, convert=None, many=False,
+                 default=None):
+        if not isinstance(xpath, str):
+            errmsg = ('{} arg expected {} object, got {} object instead'.
+                      format('xpath', str.__name__, type(xpath).__name__))
+            raise TypeError(errmsg)
+        elif not xpath.startswith('/'):
+            raise ValueError('Given xpath missing leading /')
+        elif convert is not None and not callable(convert):
+            errmsg = ('convert arg expected callable object, got {} object '
+                      'instead'.format(type(convert).__name__))
+            raise TypeError(errmsg)
+        self._name = None
+        self._xpath = xpath
+        self._compiled = etree.XPath('.' + xpath)
+        self._attr = attr
+        self._convert = convert
+        self._many = many
+        self._default = default
+
+    def __set_name__(self, owner, name):
+        self._name = name
+
+    def __get__(self, obj, type=None):
+        if obj is None:
+            return self
+        return obj.extract()[self._name]
+
+    def extract(self, node):
+        """Return the field's value for the given node"""
+        if isinstance(node, (etree._Element, etree._ElementTree)):
+            found = self._compiled(node)
+        else:
+            found = node.xpath('.' + self._xpath)
+        values = [self._value(v) for v in found]
+        if self._many:
+            return values
+        return values[0] if values else self._default
+
+    def _value(self, found):
+        attr = self._attr
+        if attr is not None and not isinstance(found, str):
+            found = found.get(attr)
+            if found is None:
+                return self._default
+        else:
+            found = text(found)
+        convert = self._convert
+        return found if convert is None else convert(found)
+
+    @property
+    def name(self):
+        """Return the attribute name the field is bound to"""
+        return self._name
+
+    @property
+    def xpath(self):
+        """Return the field's xpath"""
+        return self._xpath
+
+
+class FieldPlan:
+    """Every field of a class, extracted in one pass over an object's node"""
+    __slots__ = ('_fields', )
+
+    def __init__(self, fields):
+        self._fields = tuple(fields)
+
+    def __bool__(self):
+        return bool(self._fields)
+
+    def __iter__(self):
+        return iter(self._fields)
+
+    def extract(self, node):
+        """Return a dict mapping field names to values"""
+        if node is None:
+            return {f.name: [] if f._many else f._default
+                    for f in self._fields}
+        return {f.name: f.extract(node) for f in self._fields}
+
+    @classmethod
+    def fromclass(cls, objcls):
+        """Collect the fields of objcls and its bases"""
+        fields = OrderedDict()
+        for base in reversed(objcls.__mro__):
+            for name, val in vars(base).items():
+                if isinstance(val, Field):
+                    fields[name] = val
+                elif name in fields:
+                    # Overridden by a non-field attribute
+                    del fields[name]
+        return cls(fields.values())
+
+
 # ============================================================================
 # CompositeWebObject
 # ============================================================================
@@ -157,17 +650,29 @@ class WebObject:
 @CompositePageObject.register
 class CompositeWebObject(WebObject):
 
-    __slots__ = ('_objmap', )
+    __slots__ = ('_objmap', '_factories', '_lazyobj', '_fieldvalues')
 
-    def __init__(self, name, xpath, parent, *, factory=None, reloadcontext=None):
-        super().__init__(name, xpath, parent, reloadcontext=reloadcontext)
+    # Extraction plan of the class's declared fields
+    _fieldplan = FieldPlan(())
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._fieldplan = FieldPlan.fromclass(cls)
+
+    def __init__(self, name, xpath, parent, *, factory=None,
+                 reloadcontext=None, lean=None):
+        super().__init__(name, xpath, parent, reloadcontext=reloadcontext,
+                         lean=lean)
         self._objmap = OrderedDict() if factory is None else factory()
+        self._factories = OrderedDict()
+        self._lazyobj = {}
+        self._fieldvalues = None
 
     @contextmanager
     def unnested_reload_context(self):
         """Ensure no nested reload contexts are run"""
         context = self._reload_context
-        with context():
+        with self._context()():
             self._reload_context = noop_context
             try:
                 yield
@@ -175,20 +680,88 @@ class CompositeWebObject(WebObject):
                 self._reload_context = context
 
     def __getitem__(self, name):
-        """Retrieve a child page object by name"""
-        return self._objmap[name]
+        """Retrieve a child page object by name
+
+        Children registered via register() are created and reloaded on first
+        access.
+
+        """
+        try:
+            return self._objmap[name]
+        except KeyError:
+            if name not in self._factories:
+                raise
+        return self._lazychild(name)
+
+    def __contains__(self, name):
+        """Return whether name is the name of a child page object"""
+        return name in self._objmap or name in self._factories
 
     def __delitem__(self, name):
         """Remove a chld page object"""
-        self._objmap.__delitem__(name)
+        if name in self._objmap or name not in self._factories:
+            self._objmap.__delitem__(name)
+        else:
+            del self._factories[name]
+            self._lazyobj.pop(name, None)
 
     def __iter__(self):
         """Iterate over names of child page objects"""
-        return iter(self._objmap)
+        objmap = self._objmap
+        if not self._factories:
+            return iter(objmap)
+        return chain(objmap, (n for n in self._factories if n not in objmap))
 
     def __len__(self):
         """Return the number of child page objects"""
-        return len(self._objmap)
+        objmap = self._objmap
+        if not self._factories:
+            return len(objmap)
+        return len(objmap) + sum(1 for n in self._factories
+                                 if n not in objmap)
+
+    def _lazychild(self, name):
+        """Return the lazy child, creating and reloading it if needed"""
+        obj = self._lazyobj.get(name)
+        if obj is None:
+            obj = self._factories[name](self)
+            if not isinstance(obj, PageObject):
+                errmsg = ('factory expected to return {} object, got {} '
+                          'object instead'.format(PageObject.__name__,
+                                                  type(obj).__name__))
+                raise TypeError(errmsg)
+            elif obj.name != name:
+                errmsg = ('factory expected to return object named {!r}, '
+                          'got {!r} instead'.format(name, obj.name))
+                raise ValueError(errmsg)
+            obj.reload()
+            self._lazyobj[name] = obj
+        return obj
+
+    def _peekchild(self, name):
+        """Return the child, or a new unreloaded one if not created yet"""
+        obj = self._objmap.get(name)
+        if obj is None:
+            obj = self._lazyobj.get(name)
+        if obj is None:
+            obj = self._factories[name](self)
+        return obj
+
+    def register(self, name, factory):
+        """Register a child that is only created when first accessed
+
+        factory is called with this object as its only argument and must
+        return a page object with the given name. The created child is
+        reloaded on creation and kept until this object is reloaded or
+        cleared; the registration itself is kept across reloads.
+
+        """
+        if not callable(factory):
+            errmsg = ('factory arg expected callable object, got {} object '
+                      'instead'.format(type(factory).__name__))
+            raise TypeError(errmsg)
+        self._factories[name] = factory
+        self._lazyobj.pop(name, None)
 
     def reload(self):
         """Reload the page object"""
@@ -196,6 +769,340 @@ class CompositeWebObject(WebObject):
             super().reload()
             self.clear()
 
+    def reload_children(self, *, executor=None):
+        """Reload every created child, in parallel if given an executor
+
+        Each child's reload() is submitted to executor, a
+        concurrent.futures.Executor, and all of them are waited for. Without
+        an executor the children are reloaded one after the other. Children
+        registered but not created yet are left alone. Workers see the same
+        WebPage generations as the calling thread, so this may be called
+        from a reload context.
+
+        Returns an OrderedDict mapping child names, in child order, to what
+        their reload() returned. If any reload raised, ChildReloadError is
+        raised once every reload is done.
+
+        """
+        if executor is not None and not isinstance(executor, Executor):
+            errmsg = ('executor arg expected {} object, got {} object '
+                      'instead'.format(Executor.__name__,
+                                       type(executor).__name__))
+            raise TypeError(errmsg)
+        objmap = self._objmap
+        lazyobj = self._lazyobj
+        built = []
+        for name in self:
+            child = objmap.get(name)
+            if child is None:
+                child = lazyobj.get(name)
+            if child is not None:
+                built.append((name, child))
+        if executor is None:
+            calls = [(name, child.reload) for name, child in built]
+        else:
+            pins = []
+            cur = self
+            while cur is not None:
+                if isinstance(cur, WebPage):
+                    pins.append((cur, cur._current()))
+                cur = cur.parent
+            calls = [(name, executor.submit(_pinnedreload, child, pins).result)
+                     for name, child in built]
+
+        results = OrderedDict()
+        errors = OrderedDict()
+        for name, call in calls:
+            try:
+                results[name] = call()
+            except Exception as err:
+                errors[name] = err
+        if errors:
+            raise ChildReloadError(errors) from next(iter(errors.values()))
+        return results
+
+    def _anchor(self, parser):
+        """Return the node children may evaluate their xpath against
+
+        None is returned if the node was not resolved from parser.
+
+        """
+        if self._nodeparser is not parser:
+            return None
+        return self._node
+
+    def _loadnode(self, parser, node):
+        """Keep the node and forget previously extracted fields"""
+        super()._loadnode(parser, node)
+        self._fieldvalues = None
+
+    def _clone(self, parent):
+        """Return a shallow copy with its own child mappings"""
+        ret = super()._clone(parent)
+        ret._objmap = copy(self._objmap)
+        ret._factories = copy(self._factories)
+        ret._lazyobj = dict(self._lazyobj)
+        return ret
+
+    def _snapshotstate(self):
+        """Add the registered factories and extracted fields to the state
+
+        Factories must be importable classes.
+
+        """
+        state = super()._snapshotstate()
+        if state is None or type(self._objmap) is not OrderedDict:
+            return None
+        factories = []
+        for name, factory in self._factories.items():
+            if not isinstance(factory, type) or not _importable(factory):
+                return None
+            factories.append([name, _classpath(factory)])
+        state.update(factories=factories, fields=self._snapshotfields())
+        return state
+
+    def _snapshotfields(self):
+        """Return the extracted fields if they can be stored, else None"""
+        if not self._fieldplan:
+            return None
+        try:
+            values = self.extract()
+        except Exception:
+            return None
+        return values if _jsonvalue(values) else None
+
+    def _restore(self, snap, parent, state):
+        super()._restore(snap, parent, state)
+        self._objmap = OrderedDict()
+        self._factories = OrderedDict((name, _importclass(path))
+                                      for name, path in state['factories'])
+        self._lazyobj = {}
+        self._fieldvalues = state['fields']
+
+    def refresh(self):
+        """Rebind to the page's current parse, rebuilding changed subtrees
+
+        Children whose subtree digest did not change are kept with their
+        cached source and fields. Changed objects with a reload context are
+        rebuilt by it, keeping their unchanged children; other changed ones
+        are reloaded and their children refreshed in turn. Kept children are
+        replaced by refreshed copies, but this object is refreshed in place,
+        so other threads must not read it meanwhile (see WebPage.refresh).
+
+        Returns a RefreshReport of the name paths, relative to this object,
+        of the objects added, changed and removed.
+
+        """
+        report = RefreshReport([], [], [])
+        status = self._refresh(self.page.parser, ({}, {}), (), report)
+        assert status is not None, 'Expected single element, got none'
+        return report
+
+    def _refresh(self, parser, memos, path, report):
+        before = list(self)
+        old = (copy(self._objmap), dict(self._lazyobj))
+        changed = super()._refresh(parser, memos, path, report)
+        if changed and self._reload_context is not noop_context:
+            # Rerun the build of the children, as reload() would
+            with self.unnested_reload_context():
+                self.clear()
+            self._mergechildren(old, parser, memos, path, report, before)
+        elif changed is not None:
+            self._refreshchildren(parser, memos, path, report, before)
+        return changed
+
+    def _refreshchildren(self, parser, memos, path, report, before):
+        """Refresh copies of the created children and report what changed"""
+        gone = set()
+        built = [(children, name, child)
+                 for children in (self._objmap, self._lazyobj)
+                 for name, child in list(children.items())]
+        for children, name, child in built:
+            if not self._keepchild(name, child, parser, memos, path, report):
+                del children[name]
+                gone.add(name)
+        self._reportnames(path, report, before, gone)
+
+    def _mergechildren(self, old, parser, memos, path, report, before):
+        """Carry unchanged children over to the rebuilt children
+
+        old is the (objmap, lazyobj) pair of children before the rebuild. A
+        rebuilt child of the same class and subtree digest as the old child
+        of its name is replaced by a refreshed copy of the old one; changed
+        ones get their own children merged in turn. Old children that were
+        not rebuilt but whose name still exists, eg lazy children and list
+        items, are refreshed.
+
+        """
+        gone = set()
+        oldmemo, newmemo = memos
+        for name, prev in chain(old[0].items(), old[1].items()):
+            childpath = path + (name, )
+            child = self._objmap.get(name, self._lazyobj.get(name))
+            if child is None:
+                if name in self and not self._keepchild(
+                        name, prev, parser, memos, path, report):
+                    gone.add(name)
+                continue
+            elif (type(child) is not type(prev) or
+                    isinstance(child, WebPage) or
+                    not hasattr(prev, '_refresh')):
+                continue
+            olddigest = prev._nodedigest
+            if olddigest is None and prev._node is not None:
+                olddigest = subtree_digest(prev._node, oldmemo)
+            node = child._node
+            if (node is not None and
+                    olddigest == subtree_digest(node, newmemo)):
+                copied = prev._clone(self)
+                if copied._refresh(parser, memos, childpath,
+                                   report) is False:
+                    self._setchild(name, copied)
+                    continue
+            if isinstance(child, CompositeWebObject):
+                child._mergechildren((prev._objmap, prev._lazyobj), parser,
+                                     memos, childpath, report, list(prev))
+            report.changed.append(childpath)
+        self._reportnames(path, report, before, gone)
+
+    def _keepchild(self, name, child, parser, memos, path, report):
+        """Refresh a copy of child in its place, returning False if gone"""
+        if not hasattr(child, '_refresh'):
+            return False
+        childpath = path + (name, )
+        child = child._clone(self)
+        changed = child._refresh(parser, memos, childpath, report)
+        if changed is None:
+            return False
+        self._setchild(name, child)
+        if changed:
+            report.changed.append(childpath)
+        return True
+
+    def _setchild(self, name, child):
+        """Store a created child in the mapping for its kind"""
+        if name in self._factories:
+            self._lazyobj[name] = child
+        else:
+            self._objmap[name] = child
+
+    def _reportnames(self, path, report, before, gone):
+        """Report the names added and removed since before"""
+        names = list(self)
+        oldnames = set(before)
+        report.added.extend(path + (n, ) for n in names if n not in oldnames)
+        newnames = set(names)
+        report.removed.extend(path + (n, ) for n in before
+                              if n in gone or n not in newnames)
+
+    def extract(self):
+        """Return a dict of every declared field's value
+
+        All fields are extracted together on first call after a reload.
+
+        """
+        values = self._fieldvalues
+        if values is None:
+            values = self._fieldvalues = self._fieldplan.extract(self.node)
+        return values
+
+    def clear_absxpath(self):
+        """Forget the cached absolute xpath of this object and descendants"""
+        super().clear_absxpath()
+        for c in chain(self._objmap.values(), self._lazyobj.values()):
+            clear = getattr(c, 'clear_absxpath', None)
+            if clear is not None:
+                clear()
+
+    def drop_source(self):
+        """Release the cached sources of this object and built descendants"""
+        super().drop_source()
+        for c in chain(self._objmap.values(), self._lazyobj.values()):
+            drop = getattr(c, 'drop_source', None)
+            if drop is not None:
+                drop()
+
+    def memory_usage(self):
+        """Return a report of the memory held by this object tree
+
+        Only objects that were already created are counted. The returned
+        dict holds the number of objects, the bytes used by the objects and
+        their child mappings, and the number and bytes of the distinct
+        source strings they keep.
+
+        """
+        usage = dict(objects=0, objectbytes=0, sources=0, sourcebytes=0)
+        seen = set()
+        stack = [self]
+        while stack:
+            obj = stack.pop()
+            usage['objects'] += 1
+            usage['objectbytes'] += getsizeof(obj)
+            src = getattr(obj, '_source', None)
+            if src is not None and id(src) not in seen:
+                seen.add(id(src))
+                usage['sources'] += 1
+                usage['sourcebytes'] += getsizeof(src)
+            for attr in ('_objmap', '_lazyobj'):
+                children = getattr(obj, attr, None)
+                if children is not None:
+                    usage['objectbytes'] += getsizeof(children)
+                    stack.extend(children.values())
+        return usage
+
+    def walk(self, *, breadth=False, prune=None):
+        """Lazily yield (name path, object) of every descendant
+
+        Depth first in preorder unless breadth is True; see
+        selweb.query.walk() for pruning.
+
+        """
+        return walk(self, breadth=breadth, prune=prune)
+
+    def select(self, query):
+        """Lazily yield the descendants matching a path query
+
+        For example page.select('results/*/title') yields the title child of
+        every child of results; see selweb.query.compile_query().
+
+        """
+        return select(self, query)
+
+    def visibility(self):
+        """Return whether every descendant exists and is visible
+
+        All descendants are checked by a single script run in the browser
+        instead of one element lookup and is_displayed() call per object.
+        Returns an OrderedDict mapping each descendant's name path (the
+        tuple of names leading to it from this object) to an
+        (exists, visible) tuple. Children not created yet are checked
+        without creating or reloading them.
+
+        """
+        paths = []
+        xpaths = []
+        # Children not created yet are made without reloading them, so
+        # missing ones are reported by the script instead of raising
+        stack = [((), self, iter(self))]
+        while stack:
+            path, parent, names = stack[-1]
+            name = next(names, _END)
+            if name is _END:
+                stack.pop()
+                continue
+            peek = getattr(parent, '_peekchild', None)
+            child = parent[name] if peek is None else peek(name)
+            childpath = path + (name, )
+            paths.append(childpath)
+            xpaths.append(child.absxpath)
+            if isinstance(child, CompositePageObject):
+                stack.append((childpath, child, iter(child)))
+        if not xpaths:
+            return OrderedDict()
+        result = self.browser.execute(VISIBILITY_SCRIPT, *xpaths)
+        return OrderedDict((p, (bool(exists), bool(visible)))
+                           for p, (exists, visible) in zip(paths, result))
+
     def add(self, obj):
         """Add a new child page object"""
         if not isinstance(obj, PageObject):
@@ -206,11 +1113,205 @@ class CompositeWebObject(WebObject):
 
     def children(self):
         """Iterator over child page objects"""
-        return self._objmap.values()
+        if not self._factories:
+            return self._objmap.values()
+        return [self[n] for n in self]
 
     def clear(self):
-        """Remove all child page objects"""
+        """Remove all child page objects
+
+        Registered lazy children stay registered and are recreated on next
+        access.
+
+        """
         self._objmap.clear()
+        self._lazyobj.clear()
+
+
+def _pinnedreload(obj, pins):
+    """Reload obj seeing the given (WebPage, generation) pairs"""
+    with ExitStack() as stack:
+        for page, state in pins:
+            stack.enter_context(page._pinned(state))
+        return obj.reload()
+
+
+# ============================================================================
+# WebObjectList
+# ============================================================================
+
+
+class WebObjectListItem(CompositeWebObject):
+    """Item of a WebObjectList
+
+    The item's name is its index in the list and its xpath is the list's item
+    xpath. On reload the item binds directly to the node matched by the list
+    instead of re-evaluating its absxpath.
+
+    """
+    __slots__ = ()
+
+    def __init__(self, parent, index, *, factory=None, reloadcontext=None):
+        if not isinstance(parent, WebObjectList):
+            errmsg = ('parent arg expected {} object, got {} object instead'.
+                      format(WebObjectList.__name__, type(parent).__name__))
+            raise TypeError(errmsg)
+        elif not isinstance(index, int):
+            errmsg = ('index arg expected {} object, got {} object instead'.
+                      format(int.__name__, type(index).__name__))
+            raise TypeError(errmsg)
+        elif index < 0:
+            errmsg = ('index arg expected to be >= 0, got {} instead'.
+                      format(index))
+            raise ValueError(errmsg)
+        super().__init__(index, parent.itemxpath, parent, factory=factory,
+                         reloadcontext=reloadcontext)
+
+    def _evaluate(self, parser):
+        """Return the node the parent list matched for this item"""
+        node = self.parent._itemnode(self._name, parser)
+        if node is None:
+            return super()._evaluate(parser)
+        return [node]
+
+    @property
+    def absxpath(self):
+        """Calculate and return the xpath to the page object"""
+        ret = self._absxpath
+        if ret is None:
+            ret = '({}{})[{}]'.format(self.parent.absxpath, self.xpath,
+                                      self._name + 1)
+            self._absxpath = ret
+        return ret
+
+    @property
+    def index(self):
+        """Return the item's index in its list"""
+        return self._name
+
+
+class WebObjectList(CompositeWebObject):
+    """Sequence of page objects matching a repeated element
+
+    The item xpath is evaluated once, relative to the list's own node, on
+    reload. Items are created by itemfactory(list, index), which must return
+    a WebObjectListItem, on first access and are bound to their matched node
+    without any further xpath evaluation.
+
+    """
+    __slots__ = ('_itemxpath', '_itemfactory', '_itemnodes')
+
+    def __init__(self, name, xpath, parent, itemxpath, *, itemfactory=None,
+                 reloadcontext=None):
+        if not isinstance(itemxpath, str):
+            errmsg = ('{} arg expected {} object, got {} object instead'.
+                      format('itemxpath', str.__name__,
+                             type(itemxpath).__name__))
+            raise TypeError(errmsg)
+        elif not itemxpath.startswith('/'):
+            raise ValueError('Given itemxpath missing leading /')
+        super().__init__(name, xpath, parent, reloadcontext=reloadcontext)
+        self._itemxpath = itemxpath
+        self._itemfactory = (WebObjectListItem if itemfactory is None
+                             else itemfactory)
+        self._itemnodes = []
+
+    def __getitem__(self, index):
+        """Retrieve an item by index or a list of items by slice"""
+        if isinstance(index, slice):
+            return [self._item(i)
+                    for i in range(*index.indices(len(self._itemnodes)))]
+        elif not isinstance(index, int):
+            errmsg = ('index expected {} or {} object, got {} object instead'.
+                      format(int.__name__, slice.__name__,
+                             type(index).__name__))
+            raise TypeError(errmsg)
+        size = len(self._itemnodes)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError('list index out of range')
+        return self._item(index)
+
+    def __contains__(self, index):
+        """Return whether index is the index of an item"""
+        return (isinstance(index, int) and
+                0 <= index < len(self._itemnodes))
+
+    def __delitem__(self, index):
+        """Items cannot be removed from a list"""
+        raise TypeError('{} items cannot be removed'.
+                        format(type(self).__name__))
+
+    def __iter__(self):
+        """Iterate over the indexes of the items"""
+        return iter(range(len(self._itemnodes)))
+
+    def __len__(self):
+        """Return the number of matched items"""
+        return len(self._itemnodes)
+
+    def _item(self, index):
+        """Return the item at a valid index, creating it if needed"""
+        objmap = self._objmap
+        item = objmap.get(index)
+        if item is None:
+            item = self._itemfactory(self, index)
+            if not isinstance(item, WebObjectListItem):
+                errmsg = ('itemfactory expected to return {} object, got {} '
+                          'object instead'.format(WebObjectListItem.__name__,
+                                                  type(item).__name__))
+                raise TypeError(errmsg)
+            item.reload()
+            objmap[index] = item
+        return item
+
+    def _peekchild(self, index):
+        """Return the item, or a new unreloaded one if not created yet"""
+        item = self._objmap.get(index)
+        if item is None:
+            item = self._itemfactory(self, index)
+        return item
+
+    def _itemnode(self, index, parser):
+        """Return the node matched for index or None if unavailable"""
+        nodes = self._itemnodes
+        if self._nodeparser is not parser or not 0 <= index < len(nodes):
+            return None
+        return nodes[index]
+
+    def _bindnode(self, parser, node):
+        """Keep the node and evaluate the item xpath once"""
+        super()._bindnode(parser, node)
+        self._itemnodes = evaluate_xpath(node, '.' + self._itemxpath)
+
+    def _snapshotstate(self):
+        """Add the item xpath and factory to the state"""
+        state = super()._snapshotstate()
+        factory = self._itemfactory
+        if (state is None or not isinstance(factory, type) or
+                not _importable(factory)):
+            return None
+        state.update(itemxpath=self._itemxpath,
+                     itemfactory=_classpath(factory))
+        return state
+
+    def _restore(self, snap, parent, state):
+        super()._restore(snap, parent, state)
+        self._itemxpath = state['itemxpath']
+        self._itemfactory = _importclass(state['itemfactory'])
+        # Every item was created when the snapshot was stored; their nodes
+        # are found once the list is bound
+        self._itemnodes = [None] * len(snap)
+
+    def children(self):
+        """Iterator over the items"""
+        return (self._item(i) for i in range(len(self._itemnodes)))
+
+    @property
+    def itemxpath(self):
+        """Return the xpath of the items relative to the list"""
+        return self._itemxpath
 
 
 # ============================================================================
@@ -218,27 +1319,150 @@ class CompositeWebObject(WebObject):
 # ============================================================================
 
 
+class _PageState:
+    """One generation of a WebPage's parse and children"""
+    __slots__ = ('generation', '_source', '_digest', '_docid', '_parser',
+                 '_node', '_nodeparser', '_nodedigest', '_fieldvalues',
+                 '_objmap', '_lazyobj')
+
+    def __init__(self):
+        for name in self.__slots__:
+            setattr(self, name, None)
+        self.generation = 0
+
+    def copy(self):
+        """Return a copy with its own child mappings"""
+        ret = _PageState()
+        for name in self.__slots__:
+            setattr(ret, name, getattr(self, name))
+        if ret._objmap is not None:
+            ret._objmap = copy(ret._objmap)
+            ret._lazyobj = dict(ret._lazyobj)
+        return ret
+
+
+class _StateAttribute:
+    """WebPage attribute read from the generation seen by the thread"""
+    __slots__ = ('_name', )
+
+    def __init__(self, name):
+        self._name = name
+
+    def __get__(self, obj, type=None):
+        if obj is None:
+            return self
+        return getattr(obj._current(), self._name)
+
+    def __set__(self, obj, value):
+        setattr(obj._current(), self._name, value)
+
+
 @Page.register
 class WebPage(CompositeWebObject):
-    __slots__ = ('_url', '_browser', '_parser')
+    """Page object for a whole browser document
+
+    The page's parse and children form a generation. reload() and refresh()
+    build the next generation off to the side, only visible to the thread
+    running them, and then swap it in with a single assignment: other
+    threads keep reading the previous generation, without locking, until
+    the swap. Use pin() to read several objects of one generation.
+
+    """
+    __slots__ = ('_url', '_browser', '_backend', '_cache', '_state',
+                 '_local', '_writelock', '_parselock', '_readdoc')
+
+    # Per generation attributes
+    _source = _StateAttribute('_source')
+    _digest = _StateAttribute('_digest')
+    _docid = _StateAttribute('_docid')
+    _parser = _StateAttribute('_parser')
+    _node = _StateAttribute('_node')
+    _nodeparser = _StateAttribute('_nodeparser')
+    _nodedigest = _StateAttribute('_nodedigest')
+    _fieldvalues = _StateAttribute('_fieldvalues')
+    _objmap = _StateAttribute('_objmap')
+    _lazyobj = _StateAttribute('_lazyobj')
 
     def __init__(self, name, url, browser, *, parent=None, factory=None,
-                 reloadcontext=None):
-        for v, cls in [('url', URL), ('browser', Browser)]:
+                 reloadcontext=None, backend=None, cache=None, lean=None):
+        backend = default_backend if backend is None else backend
+        for v, cls in [('url', URL), ('browser', Browser),
+                       ('backend', ParserBackend),
+                       ('cache', ExtractionCache)]:
             val = locals()[v]
-            if not isinstance(val, cls):
+            if v == 'cache' and val is None:
+                continue
+            elif not isinstance(val, cls):
                 errmsg = ('{} arg expected {} object, got {} object instead'.
                           format(v, cls.__name__, type(val).__name__))
                 raise TypeError(errmsg)
+        self._state = _PageState()
+        self._local = local()
+        self._writelock = RLock()
+        self._parselock = RLock()
+        self._readdoc = False
         xpath = '/html'
         super().__init__(name, xpath, self if parent is None else parent,
-                         factory=factory, reloadcontext=reloadcontext)
+                         factory=factory, reloadcontext=reloadcontext,
+                         lean=lean)
         if parent is None:
             self._parent = None
 
         self._url = url
         self._browser = browser
-        self._parser = None
+        self._backend = backend
+        self._cache = cache
+
+    def _current(self):
+        """Return the generation this thread reads and writes"""
+        state = getattr(self._local, 'state', None)
+        return self._state if state is None else state
+
+    def _nextgeneration(self, build):
+        """Run build on a copy of the current generation, then swap it in
+
+        The previous generation is kept if build raises.
+
+        """
+        with self._writelock:
+            old = self._current()
+            new = old.copy()
+            tls = self._local
+            prev = getattr(tls, 'state', None)
+            tls.state = new
+            try:
+                ret = build()
+            finally:
+                tls.state = prev
+            if new._docid is _UNREAD:
+                new._docid = None
+            if new._digest != old._digest:
+                new.generation += 1
+            self._state = new
+        return ret
+
+    @contextmanager
+    def pin(self):
+        """Read one generation of the page from this thread
+
+        Within the context, this thread sees the generation current on
+        entry even if another thread swaps in a new one.
+
+        """
+        state = getattr(self._local, 'state', None)
+        with self._pinned(self._state if state is None else state):
+            yield self
+
+    @contextmanager
+    def _pinned(self, state):
+        """Make this thread see the given generation"""
+        tls = self._local
+        prev = getattr(tls, 'state', None)
+        tls.state = state
+        try:
+            yield
+        finally:
+            tls.state = prev
 
     # --------------------
     # Page methods
@@ -250,6 +1474,25 @@ class WebPage(CompositeWebObject):
         b.go(self._url)
         self.reload()
 
+    def stream(self, extractor):
+        """Run a StreamExtractor over the browser's current source
+
+        The page's own parser, source and children are left untouched and no
+        full tree of the source is built.
+
+        """
+        if not isinstance(extractor, StreamExtractor):
+            errmsg = ('extractor arg expected {} object, got {} object '
+                      'instead'.format(StreamExtractor.__name__,
+                                       type(extractor).__name__))
+            raise TypeError(errmsg)
+        return extractor.parse(self.browser.source)
+
+    @property
+    def backend(self):
+        """Return the ParserBackend used to parse the page source"""
+        return self._backend
+
     @property
     def url(self):
         """Return the current page's location"""
@@ -260,16 +1503,297 @@ class WebPage(CompositeWebObject):
     # --------------------
 
     def reload(self):
-        """Reload the page source"""
-        with self._reload_context():
-            self._source = s = self.browser.source
-            self._parser = html.fromstring(s)
-            self.clear()
+        """Reload the page source as a new generation (see WebPage)
 
-    # @property
-    # def source(self):
-    #     """Retrieve page source"""
-    #     return self._source
+        If the source did not change, or was seen before by the page's
+        ExtractionCache, the code after the reload context's yield is
+        skipped. Nested pages share the parse of their enclosing page when
+        both were read from the same document (see Browser.document).
+        Returns True if the source changed, False otherwise.
+
+        """
+        return self._nextgeneration(self._reload)
+
+    def _reload(self):
+        skip = None
+        try:
+            with self._context()():
+                # The source is fetched inside the context so that code
+                # before its yield (eg waiting for content) runs first
+                shared, s, digest = self._fetch()
+                cache = self._cache if shared is None else None
+                if digest == self._digest:
+                    skip = False
+                elif cache is not None:
+                    key = cache.key(type(self), self._url, digest)
+                    snap = cache.get(key)
+                    if snap is not None and self._loadsnapshot(s, snap):
+                        self._digest = digest
+                        skip = True
+                if skip is not None:
+                    raise _SkipBuild()
+
+                # The new parse is visible to nested pages reloaded by the
+                # context; it is discarded with the generation on error
+                self._source = None if self._lean else s
+                self._digest = digest
+                self._parser = (self._backend.parse(s) if shared is None
+                                else shared.parser)
+                self._node = None
+                self._fieldvalues = None
+                self.clear()
+        except _SkipBuild:
+            pass
+        if skip is not None:
+            return skip
+        if cache is not None and self._snapshotready():
+            cache.put(key, self)
+        return True
+
+    def refresh(self):
+        """Reload the page source, rebuilding only changed objects
+
+        The reload context rebuilds the children, carrying over unchanged
+        ones as copies (see CompositeWebObject.refresh). The ExtractionCache
+        is not used. Returns a RefreshReport.
+
+        """
+        return self._nextgeneration(self._refreshpage)
+
+    def _refreshpage(self):
+        report = RefreshReport([], [], [])
+        memos = ({}, {})
+        rebuild = self._reload_context is not noop_context
+        skip = False
+        try:
+            with self._context()():
+                shared, s, digest = self._fetch()
+                if digest == self._digest:
+                    skip = True
+                    raise _SkipBuild()
+                before = list(self)
+                old = (copy(self._objmap), dict(self._lazyobj))
+                self._source = None if self._lean else s
+                self._digest = digest
+                parser = self._parser = (self._backend.parse(s)
+                                         if shared is None else
+                                         shared.parser)
+                self._node = None
+                self._fieldvalues = None
+                if rebuild:
+                    # The code after the context's yield rebuilds them
+                    self.clear()
+                else:
+                    self._refreshchildren(parser, memos, (), report, before)
+        except _SkipBuild:
+            return report
+        if skip:
+            raise RuntimeError('Reload context must not suppress '
+                               'exceptions when refreshing')
+        if rebuild:
+            self._mergechildren(old, parser, memos, (), report, before)
+        return report
+
+    def _clone(self, parent):
+        """Return the page itself, attached to parent
+
+        A nested page refreshes as a new generation of its own.
+
+        """
+        self._setparent(parent)
+        return self
+
+    def _refresh(self, parser, memos, path, report):
+        """Refresh a nested page from its own source"""
+        sub = self.refresh()
+        for attr, paths in zip(sub._fields, sub):
+            getattr(report, attr).extend(path + p for p in paths)
+        return bool(sub.added or sub.changed or sub.removed)
+
+    def _fetch(self):
+        """Return (shared page, source, digest) of the current document
+
+        The source and digest are taken from the enclosing WebPage if it
+        was parsed from the same document. The document token is only read
+        by nested pages and by pages that nested pages asked for it.
+
+        """
+        shared = self._documentpage()
+        docid = _UNREAD
+        if shared is not None or self._readdoc:
+            docid = self._browser.document
+        self._docid = docid
+        if shared is not None and shared._fromdocument(docid):
+            return shared, shared._source, shared._digest
+        s = self.browser.source
+        digest = (len(s), blake2b(s.encode('utf-8', 'surrogatepass'),
+                                  digest_size=16).digest())
+        return None, s, digest
+
+    def _loadsnapshot(self, source, snap):
+        """Replace the parser and children with ones rebuilt from a snapshot
+
+        Children are rebuilt as objects of their classes, without calling
+        their __init__, and bound to the tree when a node is first needed,
+        which parses the source. Returns False, leaving the page as it was,
+        if they cannot be rebuilt (eg a class was renamed since).
+
+        """
+        try:
+            children = [_restoreobject(c, self) for c in snap.children()]
+        except (ImportError, AttributeError, KeyError, TypeError,
+                ValueError):
+            return False
+        state = snap.state
+        self._source = source
+        self._parser = None
+        self._node = None
+        self._fieldvalues = None if state is None else state['fields']
+        self.clear()
+        for child in children:
+            name = child.name
+            if name in self._factories:
+                self._lazyobj[name] = child
+            else:
+                self._objmap[name] = child
+        return True
+
+    def _snapshotready(self):
+        """Return whether every object below the page can be rebuilt
+
+        Every registered lazy child is created, as storing a snapshot does,
+        and the objects' node digests are computed so they are stored too.
+
+        """
+        memo = {}
+        stack = list(self.children())
+        while stack:
+            obj = stack.pop()
+            if (isinstance(obj, WebPage) or
+                    getattr(obj, '_snapshotstate', None) is None or
+                    obj._snapshotstate() is None):
+                return False
+            node = obj._node
+            if obj._nodedigest is None and node is not None:
+                obj._nodedigest = subtree_digest(node, memo)
+            if isinstance(obj, CompositeWebObject):
+                stack.extend(obj.children())
+        return True
+
+    def _snapshotstate(self):
+        """Return the page's extracted fields
+
+        The page itself is not rebuilt from snapshots, only its children.
+
+        """
+        return dict(fields=self._snapshotfields())
+
+    def _bindrestored(self, parser):
+        """Bind the objects rebuilt from a snapshot to the parsed tree"""
+        stack = list(chain(self._objmap.values(), self._lazyobj.values()))
+        stack.reverse()
+        while stack:
+            obj = stack.pop()
+            if getattr(obj, '_nodeparser', None) is not _RESTORED:
+                continue
+            nodelist = obj._evaluate(parser)
+            if len(nodelist) == 1:
+                obj._bindnode(parser, nodelist[0])
+            else:
+                obj._nodeparser = None
+            if isinstance(obj, CompositeWebObject):
+                children = list(chain(obj._objmap.values(),
+                                      obj._lazyobj.values()))
+                stack.extend(reversed(children))
+
+    def _documentpage(self):
+        """Return the enclosing WebPage this page may share a parse with
+
+        None is returned if there is no enclosing WebPage, or if it uses
+        another browser or backend.
+
+        """
+        cur = self.parent
+        while cur is not None and not isinstance(cur, WebPage):
+            cur = getattr(cur, 'parent', None)
+        if (cur is None or cur._browser is not self._browser or
+                cur._backend is not self._backend):
+            return None
+        return cur
+
+    def _fromdocument(self, docid):
+        """Return whether the page was parsed from the document docid
+
+        A page that did not read its document token takes docid if this
+        thread is still building it, else reads its token from its next
+        reload on.
+
+        """
+        cur = self._docid
+        if cur is _UNREAD:
+            cur = self._docid = docid
+        elif cur is None:
+            self._readdoc = True
+        return self._digest is not None and cur == docid
+
+    def _anchor(self, parser):
+        """Return the /html node children may evaluate their xpath against"""
+        if parser is not self._parser:
+            return None
+        return self.node
+
+    @property
+    def node(self):
+        """Return the lxml /html node of the page"""
+        parser = self.parser
+        if parser is None:
+            return None
+        node = self._node
+        if node is None:
+            nodelist = evaluate_xpath(parser, self.absxpath)
+            if len(nodelist) == 1:
+                node = self._node = nodelist[0]
+                self._nodeparser = parser
+        return node
+
+    def drop_source(self):
+        """Release the page source and the cached sources of descendants
+
+        The page is parsed first if it was loaded from the cache without
+        parsing.
+
+        """
+        self.parser
+        super().drop_source()
+
+    def memory_usage(self):
+        """Return a report of the memory held by this page's tree
+
+        In addition to the CompositeWebObject report, treenodes is the
+        number of elements in the parsed tree, or 0 if not parsed.
+
+        """
+        usage = super().memory_usage()
+        parser = self._parser
+        usage['treenodes'] = (0 if parser is None else
+                              sum(1 for _ in parser.iter()))
+        return usage
+
+    @property
+    def source(self):
+        """Retrieve page source
+
+        If the source was released, it is serialized from the parsed tree.
+
+        """
+        src = self._source
+        if src is None:
+            node = self.node if self._parser is not None else None
+            if node is not None:
+                src = self._backend.tostring(node)
+                if not self._lean:
+                    self._source = src
+        return src
 
     @property
     def absxpath(self):
@@ -291,10 +1815,252 @@ class WebPage(CompositeWebObject):
         """Return the object's page"""
         return self if self.parent is None else super().page
 
+    @property
+    def cache(self):
+        """Return the page's ExtractionCache or None"""
+        return self._cache
+
+    @property
+    def generation(self):
+        """Return the number of source changes seen by reload or refresh"""
+        return self._current().generation
+
     @property
     def parser(self):
-        """Return an lxml html parser"""
-        return self._parser
+        """Return the root of the tree parsed by the page's backend
+
+        After a cache hit the source is only parsed on first access, and the
+        rebuilt children are then bound to the tree.
+
+        """
+        parser = self._parser
+        if parser is None and self._source is not None:
+            # Not the write lock, which a reload holds while it runs
+            with self._parselock:
+                parser = self._parser
+                if parser is None and self._source is not None:
+                    parser = self._backend.parse(self._source)
+                    # Children are bound before the parser is published, so
+                    # other threads never see unbound children with it
+                    self._bindrestored(parser)
+                    self._parser = parser
+                    if self._lean:
+                        self._source = None
+        return parser
+
+
+# ============================================================================
+# PageRouter
+# ============================================================================
+
+
+# A page class returned by PageRouter.match() and the values captured by its
+# path template
+RouteMatch = namedtuple('RouteMatch', 'pagecls params')
+
+
+class _Route:
+    """A registered page class with its parameter names and query"""
+    __slots__ = ('pagecls', 'params', 'query')
+
+    def __init__(self, pagecls, params, query):
+        self.pagecls = pagecls
+        self.params = params
+        self.query = query
+
+    def accepts(self, query):
+        """Return whether a url's query satisfies the route's constraints"""
+        for key, value in self.query:
+            found = query.get(key)
+            if found is None or (value is not None and found != value):
+                return False
+        return True
+
+
+class _RouteNode:
+    """Node of a path trie, one level per path segment"""
+    __slots__ = ('literals', 'param', 'rest', 'routes')
+
+    def __init__(self):
+        # Child nodes by literal segment
+        self.literals = {}
+        # Child node matching any single segment
+        self.param = None
+        # Routes matching any remaining segments
+        self.rest = []
+        # Routes ending at this node
+        self.routes = []
+
+    def find(self, segments, index, values, query):
+        """Return (route, captured values) for segments[index:] or None
+
+        Literal segments are tried before parameters, and parameters before
+        a trailing rest parameter.
+
+        """
+        if index == len(segments):
+            for route in self.routes:
+                if route.accepts(query):
+                    return route, values
+        else:
+            seg = segments[index]
+            child = self.literals.get(seg)
+            if child is not None:
+                found = child.find(segments, index + 1, values, query)
+                if found is not None:
+                    return found
+            child = self.param
+            if child is not None:
+                found = child.find(segments, index + 1, values + [seg],
+                                   query)
+                if found is not None:
+                    return found
+        for route in self.rest:
+            if route.accepts(query):
+                return route, values + ['/'.join(segments[index:])]
+        return None
+
+
+class PageRouter:
+    """Map urls to the WebPage subclass that handles them
+
+    Page classes are registered with a host, a path template and query
+    constraints:
+
+    * host is an exact host name, ``'*.example.com'`` for any subdomain of
+      example.com, or None for any host
+    * path is a '/' separated template whose segments are literals,
+      ``{name}`` to capture any single segment, or a final ``{name*}`` to
+      capture all remaining segments (possibly none)
+    * query maps query keys to the value they must have, or to None if
+      they only need to be present
+
+    Registrations are compiled into a dict of hosts, each holding a trie of
+    path segments, so matching a url only costs a few dict lookups per path
+    segment however many classes are registered. The exact host is tried
+    first, then the most specific subdomain wildcard, then any host; within
+    a host, literal segments win over parameters, and routes sharing a
+    template are tried in registration order.
+
+    """
+    __slots__ = ('_hosts', '_subdomains', '_anyhost')
+
+    def __init__(self):
+        self._hosts = {}
+        self._subdomains = {}
+        self._anyhost = _RouteNode()
+
+    def register(self, pagecls=None, *, host=None, path='/', query=None):
+        """Register a page class for urls matching host, path and query
+
+        Returns pagecls. If pagecls is not given, returns a class decorator
+        registering the decorated class.
+
+        """
+        if pagecls is None:
+            def decorator(cls):
+                return self.register(cls, host=host, path=path, query=query)
+            return decorator
+        if not (isinstance(pagecls, type) and issubclass(pagecls, WebPage)):
+            errmsg = ('pagecls arg expected {} subclass, got {!r} instead'.
+                      format(WebPage.__name__, pagecls))
+            raise TypeError(errmsg)
+        for name, val in [('host', host), ('path', path)]:
+            if val is not None and not isinstance(val, str):
+                errmsg = ('{} arg expected {} object, got {} object instead'.
+                          format(name, str.__name__, type(val).__name__))
+                raise TypeError(errmsg)
+        if path is None or not path.startswith('/'):
+            raise ValueError('Given path missing leading /')
+        query = () if query is None else tuple(dict(query).items())
+        for key, value in query:
+            if (not isinstance(key, str) or
+                    not (value is None or isinstance(value, str))):
+                errmsg = ('query arg expected str keys and str or None '
+                          'values, got {!r}: {!r} instead'.format(key, value))
+                raise TypeError(errmsg)
+
+        node = self._hostnode(host)
+        params = []
+        segments = _pathsegments(path)
+        for i, seg in enumerate(segments):
+            if seg.startswith('{') and seg.endswith('}'):
+                name = seg[1:-1]
+                if name.endswith('*'):
+                    if i != len(segments) - 1:
+                        errmsg = ('Rest parameter {} expected to be the last '
+                                  'path segment'.format(seg))
+                        raise ValueError(errmsg)
+                    params.append(name[:-1])
+                    node.rest.append(_Route(pagecls, tuple(params), query))
+                    return pagecls
+                params.append(name)
+                if node.param is None:
+                    node.param = _RouteNode()
+                node = node.param
+            else:
+                node = node.literals.setdefault(seg, _RouteNode())
+        node.routes.append(_Route(pagecls, tuple(params), query))
+        return pagecls
+
+    def _hostnode(self, host):
+        """Return the path trie of a host pattern, creating it if needed"""
+        if host is None:
+            return self._anyhost
+        host = host.lower()
+        if host.startswith('*.'):
+            table, host = self._subdomains, host[2:]
+        else:
+            table = self._hosts
+        if not host or '*' in host:
+            raise ValueError('Invalid host pattern: {!r}'.format(host))
+        node = table.get(host)
+        if node is None:
+            node = table[host] = _RouteNode()
+        return node
+
+    def match(self, url):
+        """Return the RouteMatch for url, or None if no page class matches
+
+        url may be a str or yarl.URL, eg browser.location.
+
+        """
+        if isinstance(url, str):
+            url = URL(url)
+        elif not isinstance(url, URL):
+            errmsg = ('url arg expected {} object, got {} object instead'.
+                      format(URL.__name__, type(url).__name__))
+            raise TypeError(errmsg)
+        segments = _pathsegments(url.path)
+        query = url.query
+        for node in self._hostnodes(url.host):
+            found = node.find(segments, 0, [], query)
+            if found is not None:
+                route, values = found
+                return RouteMatch(route.pagecls,
+                                  OrderedDict(zip(route.params, values)))
+        return None
+
+    def _hostnodes(self, host):
+        """Yield the path tries to try for host, most specific first"""
+        if host:
+            host = host.lower()
+            node = self._hosts.get(host)
+            if node is not None:
+                yield node
+            subdomains = self._subdomains
+            if subdomains:
+                labels = host.split('.')
+                for i in range(1, len(labels)):
+                    node = subdomains.get('.'.join(labels[i:]))
+                    if node is not None:
+                        yield node
+        yield self._anyhost
+
+
+def _pathsegments(path):
+    """Return the non-empty segments of a url path"""
+    return [seg for seg in path.split('/') if seg]
 
 
 # ============================================================================
@@ -59,9 +59,9 @@ def test_tmp(google, bindir):
         print('========')
         for r in results_page['results'].children():
             print(r['title'].title)
-            print(r['label'].label)
+            print(r.label)
             print(r['title'].url)
-            print(r['summary'].text)
+            print(r.summary)
             print()
         #  print(len(results_page['results']))
 
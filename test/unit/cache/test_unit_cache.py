@@ -0,0 +1,380 @@
+# Module:
+# Submodules:
+# Created:
+# Copyright (C) <date> <fullname>
+#
+# This module is part of the <project name> project and is released under
+# the MIT License: http://opensource.org/licenses/MIT
+"""
+"""
+
+# ============================================================================
+# Imports
+# ============================================================================
+
+
+# Stdlib imports
+from contextlib import contextmanager
+import os
+from threading import Thread
+
+# Third-party imports
+from lxml import html
+import pytest
+from yarl import URL
+
+# Local imports
+from selweb.cache import ExtractionCache
+from selweb.core import Browser
+from selweb.driver import BrowserDriver
+from selweb.web import (CompositeWebObject, Field, RefreshReport, WebObject,
+                        WebObjectList, WebObjectListItem, WebPage)
+
+
+# ============================================================================
+# Fixtures
+# ============================================================================
+
+
+PAGE_SOURCE = '<html><body><p>hello</p></body></html>'
+
+
+class CachedPage(WebPage):
+    """Page with one registered child"""
+    __slots__ = ()
+
+    def __init__(self, browser, **kwargs):
+        super().__init__('page', URL('https://google.ca'), browser, **kwargs)
+        self.register('p', lambda parent: WebObject('p', '/body/p', parent))
+
+
+TREE_SOURCE = ('<html><body><div><h1>head</h1><p>text</p>'
+               '<ul><li><b>1</b></li><li><b>2</b></li></ul>'
+               '</div></body></html>')
+
+
+class Para(WebObject):
+    """Lazy child of Section"""
+    __slots__ = ()
+
+    def __init__(self, parent):
+        super().__init__('para', '/p', parent)
+
+
+class Item(WebObjectListItem):
+    """List item with a field"""
+    __slots__ = ()
+
+    title = Field('/b')
+
+
+class Section(CompositeWebObject):
+    """Composite with a field, an attribute and a lazy child"""
+    __slots__ = ('label', )
+
+    heading = Field('/h1')
+
+    def __init__(self, parent):
+        super().__init__('section', '/body/div', parent)
+        self.label = 'main'
+        self.register('para', Para)
+
+
+class TreePage(WebPage):
+    """Page building its children in its reload context"""
+    __slots__ = ()
+
+    def __init__(self, browser, **kwargs):
+        super().__init__('page', URL('https://google.ca'), browser,
+                         reloadcontext=self.build, **kwargs)
+
+    @contextmanager
+    def build(self):
+        yield
+        section = Section(self)
+        section.reload()
+        self.add(section)
+        items = WebObjectList('items', '/ul', section, '/li',
+                              itemfactory=Item)
+        items.reload()
+        section.add(items)
+
+
+class PlainPara(WebObject):
+    """Child without __slots__, as in the examples"""
+
+    def __init__(self, parent):
+        super().__init__('para', '/body/p', parent)
+        self.label = 'plain'
+
+
+class PlainList(WebObjectList):
+    """List without __slots__"""
+
+    def __init__(self, parent):
+        super().__init__('items', '/body/ul', parent, '/li')
+
+
+class PlainPage(WebPage):
+    """Page without __slots__ registering unslotted children"""
+
+    def __init__(self, browser, **kwargs):
+        super().__init__('page', URL('https://google.ca'), browser, **kwargs)
+        self.register('para', PlainPara)
+        self.register('items', PlainList)
+
+
+@pytest.fixture
+def browser():
+    """Return a browser whose source is PAGE_SOURCE"""
+
+    @BrowserDriver.register
+    class Driver:
+        pass
+
+    class TestBrowser(Browser):
+        document = 'doc'
+        source = PAGE_SOURCE
+
+    return TestBrowser(Driver())
+
+
+@pytest.fixture
+def cache(tmpdir):
+    """Return an empty cache in a temporary directory"""
+    return ExtractionCache(str(tmpdir.join('cache')))
+
+
+# ============================================================================
+# Test ExtractionCache
+# ============================================================================
+
+
+@pytest.mark.parametrize('val', [4.2, '42'])
+def test_init_maxsize_badtype(tmpdir, val):
+    """Raise error if maxsize arg is not an int"""
+    expected = ('maxsize arg expected int object, got {} object '
+                'instead'.format(type(val).__name__), )
+    with pytest.raises(TypeError) as err:
+        ExtractionCache(str(tmpdir), maxsize=val)
+    assert err.value.args == expected
+
+
+def test_key(cache):
+    """Keys differ by page class, url and digest"""
+    url = URL('https://google.ca')
+    key = cache.key(CachedPage, url, (1, b'x'))
+    assert key == cache.key(CachedPage, url, (1, b'x'))
+    assert key != cache.key(WebPage, url, (1, b'x'))
+    assert key != cache.key(CachedPage, URL('https://google.com'), (1, b'x'))
+    assert key != cache.key(CachedPage, url, (1, b'y'))
+
+
+def test_put_get(cache, browser):
+    """A stored tree is returned as a snapshot"""
+    page = CachedPage(browser)
+    page.reload()
+    assert cache.get('key') is None
+
+    cache.put('key', page)
+    snap = cache.get('key')
+    assert snap.source == PAGE_SOURCE
+    assert snap['p'].source == '<p>hello</p>'
+    assert cache.size > 0
+    assert not list(cache.directory.glob('*.tmp'))
+
+    cache.clear()
+    assert cache.get('key') is None
+    assert cache.size == 0
+
+
+def test_get_corrupt(cache):
+    """Empty or corrupt entries are misses"""
+    for key, data in [('empty', b''), ('corrupt', b'XXXX' * 10)]:
+        with open(str(cache.directory / (key + '.snap')), 'wb') as f:
+            f.write(data)
+        assert cache.get(key) is None
+
+
+def test_evict_lru(tmpdir, browser):
+    """Least recently used entries are evicted past maxsize"""
+    page = CachedPage(browser)
+    page.reload()
+    cache = ExtractionCache(str(tmpdir), maxsize=None)
+    for i, key in enumerate(['a', 'b', 'c']):
+        cache.put(key, page)
+        os.utime(str(cache.directory / (key + '.snap')), (i, i))
+    entrysize = cache.size // 3
+
+    # A hit makes an entry the most recently used
+    assert cache.get('a') is not None
+
+    cache._maxsize = entrysize * 2
+    cache.evict()
+    assert cache.get('b') is None
+    assert cache.get('a') is not None
+    assert cache.get('c') is not None
+
+
+# ============================================================================
+# Test WebPage
+# ============================================================================
+
+
+def test_webpage_cache_badtype(browser):
+    """Raise error if cache arg is not an ExtractionCache"""
+    expected = ('cache arg expected ExtractionCache object, got int object '
+                'instead', )
+    with pytest.raises(TypeError) as err:
+        CachedPage(browser, cache=42)
+    assert err.value.args == expected
+
+
+def test_webpage_cache_hit(monkeypatch, cache, browser):
+    """A cache hit skips parsing and the rest of the reload context"""
+    called = []
+    orig_fromstring = html.fromstring
+
+    def fake_fromstring(s):
+        called.append('fromstring')
+        return orig_fromstring(s)
+
+    @contextmanager
+    def rcontext():
+        called.append('rcontext')
+        yield
+        called.append('built')
+
+    monkeypatch.setattr(html, 'fromstring', fake_fromstring)
+
+    first = CachedPage(browser, cache=cache, reloadcontext=rcontext)
+    assert first.reload() is True
+    assert called == ['rcontext', 'fromstring', 'built']
+    assert first.cache is cache
+    del called[:]
+
+    page = CachedPage(browser, cache=cache, reloadcontext=rcontext)
+    assert page.reload() is True
+    assert called == ['rcontext']
+    del called[:]
+
+    child = page['p']
+    assert type(child) is WebObject
+    assert child.parent is page
+    assert child.source == '<p>hello</p>'
+    assert page.source == PAGE_SOURCE
+    assert page.reload() is False
+    assert called == ['rcontext']
+
+    # The page source is parsed on demand
+    assert child.node.tag == 'p'
+    assert child.node.getroottree().getroot() is page.node
+    assert called == ['rcontext', 'fromstring']
+
+
+def test_webpage_cache_parse_during_reload(cache, browser):
+    """The lazy parse after a hit does not wait for a running reload"""
+    CachedPage(browser, cache=cache).reload()
+    page = CachedPage(browser, cache=cache)
+    page.reload()
+    parsed = []
+    reader = Thread(target=lambda: parsed.append(page.parser))
+    with page._writelock:
+        reader.start()
+        reader.join(5)
+        assert parsed and parsed[0] is page.parser
+
+
+def test_webpage_cache_rebuilds_objects(monkeypatch, cache, browser):
+    """A cache hit rebuilds objects of their classes with their fields"""
+    called = []
+    orig_fromstring = html.fromstring
+
+    def fake_fromstring(s):
+        called.append('fromstring')
+        return orig_fromstring(s)
+
+    monkeypatch.setattr(html, 'fromstring', fake_fromstring)
+    type(browser).source = TREE_SOURCE
+    TreePage(browser, cache=cache).reload()
+    del called[:]
+
+    page = TreePage(browser, cache=cache)
+    assert page.reload() is True
+    section = page['section']
+    assert type(section) is Section
+    assert section.parent is page
+    assert section.label == 'main'
+    assert section.heading == 'head'
+    items = section['items']
+    assert type(items) is WebObjectList
+    assert len(items) == 2
+    assert type(items[1]) is Item
+    assert items[1].title == '2'
+    assert items[1].source == '<li><b>2</b></li>'
+    assert called == []
+
+    # Nodes are bound on first access
+    para = section['para']
+    assert type(para) is Para
+    assert para.node.tag == 'p'
+    assert called == ['fromstring']
+    assert items[0].node.getroottree().getroot() is page.parser
+    assert items[0].node.text_content() == '1'
+
+    # Rebuilt objects reload and refresh like built ones
+    type(browser).source = TREE_SOURCE.replace('head', 'title')
+    assert page.refresh() == RefreshReport([], [('section', )], [])
+    assert page['section'].heading == 'title'
+    section = page['section']
+    section.reload()
+    assert section['para'].source == '<p>text</p>'
+
+
+def test_webpage_cache_unslotted(monkeypatch, cache, browser):
+    """Classes without __slots__ are stored and rebuilt"""
+    called = []
+    orig_fromstring = html.fromstring
+
+    def fake_fromstring(s):
+        called.append('fromstring')
+        return orig_fromstring(s)
+
+    monkeypatch.setattr(html, 'fromstring', fake_fromstring)
+    type(browser).source = ('<html><body><p>text</p>'
+                            '<ul><li>1</li><li>2</li></ul></body></html>')
+    PlainPage(browser, cache=cache).reload()
+    assert cache.size > 0
+    del called[:]
+
+    page = PlainPage(browser, cache=cache)
+    assert page.reload() is True
+    para = page['para']
+    assert type(para) is PlainPara
+    assert para.label == 'plain'
+    assert para.source == '<p>text</p>'
+    assert len(page['items']) == 2
+    assert called == []
+
+
+def test_webpage_cache_unrebuildable(cache, browser):
+    """Pages with objects that cannot be rebuilt are not stored"""
+
+    class Local(WebObject):
+        __slots__ = ()
+
+    @contextmanager
+    def rcontext():
+        yield
+        obj = Local('local', '/body/p', page)
+        obj.reload()
+        page.add(obj)
+
+    page = CachedPage(browser, cache=cache, reloadcontext=rcontext)
+    assert page.reload() is True
+    assert cache.size == 0
+
+
+# ============================================================================
+#
+# ============================================================================
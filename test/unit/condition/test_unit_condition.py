@@ -0,0 +1,184 @@
+# Module:
+# Submodules:
+# Created:
+# Copyright (C) <date> <fullname>
+#
+# This module is part of the <project name> project and is released under
+# the MIT License: http://opensource.org/licenses/MIT
+"""
+"""
+
+# ============================================================================
+# Imports
+# ============================================================================
+
+
+# Stdlib imports
+
+# Third-party imports
+import pytest
+
+# Local imports
+from selweb import core
+from selweb.condition import (All, Any, Attribute, CompiledCondition,
+                              Condition, Not, Present, SCRIPT_PRELUDE, Text,
+                              Visible)
+
+
+# ============================================================================
+# Helpers
+# ============================================================================
+
+
+def expression(cond):
+    """Return the expression part of the compiled script"""
+    script = cond.compile().script
+    assert script.startswith(SCRIPT_PRELUDE)
+    return script[len(SCRIPT_PRELUDE):]
+
+
+# ============================================================================
+# Test leaf conditions
+# ============================================================================
+
+
+@pytest.mark.parametrize('cls,func', [(Present, 'present'),
+                                      (Visible, 'visible')])
+def test_leaf_compile(cls, func):
+    """Leaf conditions pass their xpath as a script argument"""
+    compiled = cls('/html/body').compile()
+    assert isinstance(compiled, CompiledCondition)
+    assert compiled.args == ('/html/body', )
+    assert expression(cls('/html/body')) == f'return !!({func}(0));'
+
+
+def test_text_compile():
+    """Text condition passes xpath and text"""
+    cond = Text('/html/title', "it's", exact=True)
+    assert cond.compile().args == ('/html/title', "it's")
+    assert expression(cond) == 'return !!(text(0, 1, true));'
+
+
+def test_attribute_compile():
+    """Attribute condition with and without a value"""
+    cond = Attribute('/a', 'href')
+    assert cond.compile().args == ('/a', 'href')
+    assert expression(cond) == 'return !!(attr(0, 1, -1, false));'
+
+    cond = Attribute('/a', 'href', 'google')
+    assert cond.compile().args == ('/a', 'href', 'google')
+    assert expression(cond) == 'return !!(attr(0, 1, 2, false));'
+
+
+@pytest.mark.parametrize('val', [42, None, b'/html'])
+def test_leaf_xpath_badtype(val):
+    """Raise error if xpath arg is not a string"""
+    expected = (f'xpath arg expected str object, got {type(val).__name__} '
+                'object instead', )
+    with pytest.raises(TypeError) as err:
+        Present(val)
+
+    assert err.value.args == expected
+
+
+# ============================================================================
+# Test combinators
+# ============================================================================
+
+
+def test_operators():
+    """&, | and ~ build combined conditions"""
+    a, b, c = Present('/a'), Visible('/b'), Present('/c')
+
+    cond = a & b & c
+    assert isinstance(cond, All)
+    assert cond.conditions == (a, b, c)
+
+    cond = a | b
+    assert isinstance(cond, Any)
+    assert cond.conditions == (a, b)
+
+    cond = ~a
+    assert isinstance(cond, Not)
+    assert ~cond is a
+
+
+def test_operator_non_condition():
+    """Combining with a non-condition is a TypeError"""
+    with pytest.raises(TypeError):
+        Present('/a') & 42
+
+
+def test_incomplete_condition():
+    """A condition without an expression cannot be instantiated"""
+
+    class Incomplete(Condition):
+        __slots__ = ()
+
+    with pytest.raises(TypeError):
+        Condition()
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_combined_compile_shares_args():
+    """Repeated values share one script argument"""
+    cond = (Visible('/a') & Text('/a', 'x')) | ~Present('/b')
+    compiled = cond.compile()
+    assert compiled.args == ('/a', 'x', '/b')
+    assert expression(cond) == ('return !!(((visible(0) && text(0, 1, false))'
+                                ' || !(present(2))));')
+
+
+def test_compile_cached():
+    """Compilation happens once"""
+    cond = Present('/a') & Present('/b')
+    assert cond.compile() is cond.compile()
+
+
+def test_empty_all():
+    """All needs at least one condition"""
+    with pytest.raises(ValueError):
+        All()
+
+
+# ============================================================================
+# Test evaluation
+# ============================================================================
+
+
+def test_compiled_single_round_trip():
+    """Calling a compiled condition runs one script"""
+    called = []
+
+    class FakeDriver:
+
+        def execute_script(self, script, *args):
+            called.append(args)
+            return True
+
+    cond = Visible('/a') & Text('/b', 'hello') & ~Attribute('/c', 'disabled')
+    assert cond()(FakeDriver()) is True
+    assert called == [('/a', '/b', 'hello', '/c', 'disabled')]
+
+
+def test_waitfor_condition():
+    """WaitFor.condition passes the condition to __call__"""
+
+    class FakeWaitFor(core.WaitFor):
+
+        def __call__(self, condfunc, *, xpath=None, timeout=1):
+            self.call_args = (condfunc, xpath, timeout)
+
+    cond = Present('/a')
+    w = FakeWaitFor()
+    w.condition(cond, timeout=42)
+    assert w.call_args == (cond, None, 42)
+
+    with pytest.raises(TypeError):
+        w.condition(42)
+
+
+# ============================================================================
+#
+# ============================================================================
@@ -464,6 +464,25 @@ def test_switch_with_iframe(browser_driver):
     assert called == [('frame', 42)]
 
 
+def test_document(browser_driver):
+    """The document token is read from the document by script"""
+    called = []
+
+    class FakeSeleniumDriver:
+
+        def execute_script(self, script, *args):
+            called.append(script)
+            return 'token'
+
+    @browser_driver.register
+    class FakeDriver:
+        driver = FakeSeleniumDriver()
+
+    b = Browser(FakeDriver())
+    assert b.document == 'token'
+    assert called == [core.DOCUMENT_SCRIPT]
+
+
 # ============================================================================
 # Test driver
 # ============================================================================
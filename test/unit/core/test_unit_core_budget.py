@@ -0,0 +1,404 @@
+# Module:
+# Submodules:
+# Created:
+# Copyright (C) <date> <fullname>
+#
+# This module is part of the <project name> project and is released under
+# the MIT License: http://opensource.org/licenses/MIT
+"""
+"""
+
+# ============================================================================
+# Imports
+# ============================================================================
+
+
+# Stdlib imports
+from contextlib import contextmanager
+
+# Third-party imports
+import pytest
+from selenium.common.exceptions import TimeoutException
+
+# Local imports
+import selweb.core as core
+from selweb.core import Browser, Budget, BudgetExhausted
+from selweb.driver import BrowserDriver
+from selweb.web import WebPage
+
+
+# ============================================================================
+# Fixtures
+# ============================================================================
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Replace time.monotonic used by the core module"""
+    c = FakeClock()
+    monkeypatch.setattr(core, 'monotonic', c)
+    return c
+
+
+@pytest.fixture
+def browser_driver():
+    """docstring for browser_driver"""
+
+    class TestBrowserDriver(BrowserDriver):
+        pass
+
+    return TestBrowserDriver
+
+
+# ============================================================================
+# Test Budget
+# ============================================================================
+
+
+@pytest.mark.parametrize('val', ['42', None, [42]])
+def test_init_arg_seconds_badtype(val):
+    """Raise error if seconds arg is not a number"""
+    expected = ('seconds arg expected int or float object, got '
+                f'{type(val).__name__} object instead', )
+    with pytest.raises(TypeError) as err:
+        Budget(val)
+
+    assert err.value.args == expected
+
+
+def test_init_arg_seconds_negative():
+    """Raise error if seconds arg is negative"""
+    expected = ('seconds arg expected to be >= 0, got -1 instead', )
+    with pytest.raises(ValueError) as err:
+        Budget(-1)
+
+    assert err.value.args == expected
+
+
+def test_remaining(clock):
+    """Remaining time counts down to zero"""
+    b = Budget(10)
+    assert b.remaining == 10
+    clock.now += 4
+    assert b.remaining == 6
+    assert not b.exhausted
+    clock.now += 10
+    assert b.remaining == 0
+    assert b.exhausted
+
+
+def test_nested_budget_capped_by_parent(clock):
+    """A nested budget never extends past its parent's deadline"""
+    outer = Budget(5)
+    inner = Budget(60, parent=outer)
+    assert inner.deadline == outer.deadline
+    inner = Budget(1, parent=outer)
+    assert inner.remaining == 1
+
+
+@pytest.mark.parametrize('timeout,expected', [(1, 1), (30, 10), (None, 10)])
+def test_timeout_capped(clock, timeout, expected):
+    """Given timeout is capped to the remaining time"""
+    b = Budget(10)
+    assert b.timeout(timeout) == expected
+
+
+def test_timeout_exhausted(clock):
+    """Raise BudgetExhausted once no time is left"""
+    b = Budget(1)
+    clock.now += 1
+    with pytest.raises(BudgetExhausted):
+        b.timeout(5)
+
+
+def test_exhausted_is_timeout_exception():
+    """BudgetExhausted can be handled as a selenium TimeoutException"""
+    assert issubclass(BudgetExhausted, TimeoutException)
+
+
+# ============================================================================
+# Test Browser.budget
+# ============================================================================
+
+
+def test_browser_budget_context(clock, browser_driver):
+    """Budget is only active inside the context"""
+
+    @browser_driver.register
+    class FakeDriver:
+        pass
+
+    b = Browser(FakeDriver())
+    assert b.current_budget is None
+    with b.budget(10) as outer:
+        assert b.current_budget is outer
+        with b.budget(60) as inner:
+            assert b.current_budget is inner
+            assert inner.deadline == outer.deadline
+        assert b.current_budget is outer
+    assert b.current_budget is None
+
+
+def test_browser_budget_element_exhausted(clock, browser_driver):
+    """Driver commands raise once the budget is exhausted"""
+    called = []
+
+    class FakeSeleniumDriver:
+
+        def find_element_by_xpath(self, xpath):
+            called.append(xpath)
+            return 42
+
+    @browser_driver.register
+    class FakeDriver:
+        driver = FakeSeleniumDriver()
+
+    b = Browser(FakeDriver())
+    with b.budget(1):
+        assert b.element('/html') == 42
+        clock.now += 1
+        with pytest.raises(BudgetExhausted):
+            b.element('/html')
+
+    assert called == ['/html']
+
+
+@pytest.mark.parametrize('attr', ['document', 'location', 'source', 'title'])
+def test_browser_budget_properties_exhausted(clock, browser_driver, attr):
+    """Properties reading the document raise once the budget is exhausted"""
+
+    class FakeSeleniumDriver:
+        current_url = 'https://google.ca'
+        page_source = '<html></html>'
+        title = 'hello'
+
+        def execute_script(self, script, *args):
+            return 'doc'
+
+    @browser_driver.register
+    class FakeDriver:
+        driver = FakeSeleniumDriver()
+
+    b = Browser(FakeDriver())
+    with b.budget(1):
+        getattr(b, attr)
+        clock.now += 1
+        with pytest.raises(BudgetExhausted):
+            getattr(b, attr)
+
+
+def test_browser_budget_page_reload_exhausted(clock, browser_driver):
+    """WebPage.reload() issues no driver command once the budget is gone"""
+    called = []
+
+    class FakeSeleniumDriver:
+
+        @property
+        def page_source(self):
+            called.append('page_source')
+            return '<html></html>'
+
+        def execute_script(self, script, *args):
+            called.append('execute_script')
+            return 'doc'
+
+    @browser_driver.register
+    class FakeDriver:
+        driver = FakeSeleniumDriver()
+
+    b = Browser(FakeDriver())
+    page = WebPage('page', core.URL('https://google.ca'), b)
+    with b.budget(1):
+        clock.now += 1
+        with pytest.raises(BudgetExhausted):
+            page.reload()
+
+    assert called == []
+
+
+def test_browser_budget_go_sets_pageload_timeout(clock, browser_driver):
+    """go() uses the remaining time as page load timeout"""
+    called = []
+
+    class TestWaitFor:
+
+        @contextmanager
+        def pageload(self, *, timeout=1):
+            yield
+
+    class FakeSeleniumDriver:
+
+        def set_page_load_timeout(self, timeout):
+            called.append(('set_page_load_timeout', timeout))
+
+        def get(self, url):
+            called.append(('get', url))
+
+    @browser_driver.register
+    class FakeDriver:
+        driver = FakeSeleniumDriver()
+
+    class TestBrowser(Browser):
+        waitfor = TestWaitFor()
+
+    b = TestBrowser(FakeDriver())
+    with b.budget(10):
+        clock.now += 3
+        b.go(core.URL('https://google.ca'))
+
+    assert called == [
+        ('set_page_load_timeout', 7),
+        ('get', 'https://google.ca'),
+        ('set_page_load_timeout', core.PAGELOAD_TIMEOUT)
+    ]
+
+
+def mkpageload_browser(browser_driver, called, *, timeouts=None, fail=False):
+    """Return a browser whose driver records page load timeouts"""
+
+    class TestWaitFor:
+
+        @contextmanager
+        def pageload(self, *, timeout=1):
+            yield
+
+    class FakeSeleniumDriver:
+
+        def set_page_load_timeout(self, timeout):
+            called.append(('set_page_load_timeout', timeout))
+
+        def get(self, url):
+            called.append(('get', url))
+            if fail:
+                raise TimeoutException()
+
+    if timeouts is not None:
+        FakeSeleniumDriver.timeouts = timeouts
+
+    @browser_driver.register
+    class FakeDriver:
+        driver = FakeSeleniumDriver()
+
+    class TestBrowser(Browser):
+        waitfor = TestWaitFor()
+
+    return TestBrowser(FakeDriver())
+
+
+def test_browser_budget_restores_set_pageload_timeout(clock, browser_driver):
+    """The timeout set on the browser is restored, not the default"""
+    called = []
+    b = mkpageload_browser(browser_driver, called)
+    b.pageload_timeout = 20
+    with b.budget(10):
+        with b.budget(5):
+            b.go(core.URL('https://google.ca'))
+            b.pageload_timeout = 30
+        assert called[-1] == ('get', 'https://google.ca')
+    assert b.pageload_timeout == 30
+
+    assert called == [
+        ('set_page_load_timeout', 20),
+        ('set_page_load_timeout', 5),
+        ('get', 'https://google.ca'),
+        ('set_page_load_timeout', 30)
+    ]
+
+
+def test_browser_budget_restores_driver_pageload_timeout(clock,
+                                                         browser_driver):
+    """The timeout reported by the driver is restored"""
+    class Timeouts:
+        page_load = 60
+
+    called = []
+    b = mkpageload_browser(browser_driver, called, timeouts=Timeouts())
+    with b.budget(100):
+        b.go(core.URL('https://google.ca'))
+
+    assert called == [
+        ('set_page_load_timeout', 60),
+        ('get', 'https://google.ca'),
+        ('set_page_load_timeout', 60)
+    ]
+
+
+@pytest.mark.parametrize('seconds,exc', [
+    (5, BudgetExhausted), (500, TimeoutException)
+])
+def test_browser_budget_go_timeout(clock, browser_driver, seconds, exc):
+    """A page load timed out by the budget raises BudgetExhausted"""
+    b = mkpageload_browser(browser_driver, [], fail=True)
+    with b.budget(seconds):
+        with pytest.raises(TimeoutException) as err:
+            b.go(core.URL('https://google.ca'))
+    assert type(err.value) is exc
+
+
+def test_browser_pageload_timeout_badtype(browser_driver):
+    """Raise error if the page load timeout is not a number"""
+    b = mkpageload_browser(browser_driver, [])
+    with pytest.raises(TypeError):
+        b.pageload_timeout = '1'
+
+
+# ============================================================================
+# Test WaitFor under budget
+# ============================================================================
+
+
+class FakeWebDriverWait:
+    timeouts = []
+
+    def __init__(self, driver, timeout):
+        self.timeouts.append(timeout)
+
+    def until(self, method, message=''):
+        raise TimeoutException()
+
+
+def test_waitfor_timeout_capped(monkeypatch, clock):
+    """WaitFor uses the remaining budget as its timeout"""
+    FakeWebDriverWait.timeouts = []
+    monkeypatch.setattr(core, 'WebDriverWait', FakeWebDriverWait)
+
+    class Parent:
+        selenium_driver = 42
+        current_budget = Budget(0.5)
+
+    w = core.WaitFor(parent=Parent)
+    with pytest.raises(BudgetExhausted):
+        w.__call__(lambda: None, timeout=5)
+
+    assert FakeWebDriverWait.timeouts == [0.5]
+
+
+def test_waitfor_own_timeout_not_budget(monkeypatch, clock):
+    """A wait timing out within the budget raises a plain TimeoutException"""
+    FakeWebDriverWait.timeouts = []
+    monkeypatch.setattr(core, 'WebDriverWait', FakeWebDriverWait)
+
+    class Parent:
+        selenium_driver = 42
+        current_budget = Budget(10)
+
+    w = core.WaitFor(parent=Parent)
+    with pytest.raises(TimeoutException) as err:
+        w.__call__(lambda: None, timeout=1)
+
+    assert not isinstance(err.value, BudgetExhausted)
+    assert FakeWebDriverWait.timeouts == [1]
+
+
+# ============================================================================
+#
+# ============================================================================
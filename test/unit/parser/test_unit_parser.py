@@ -0,0 +1,158 @@
+# Module:
+# Submodules:
+# Created:
+# Copyright (C) <date> <fullname>
+#
+# This module is part of the <project name> project and is released under
+# the MIT License: http://opensource.org/licenses/MIT
+"""
+"""
+
+# ============================================================================
+# Imports
+# ============================================================================
+
+
+# Stdlib imports
+
+# Third-party imports
+import pytest
+from yarl import URL
+
+# Local imports
+from selweb.core import Browser
+from selweb.driver import BrowserDriver
+import selweb.parser as parser
+from selweb.parser import (Html5ParserBackend, LxmlBackend, ParserBackend,
+                           available_backends, default_backend, get_backend)
+from selweb.util import evaluate_xpath
+from selweb.web import WebObject, WebPage
+
+
+# ============================================================================
+# Globals
+# ============================================================================
+
+
+SOURCE = '<html><body><p class="x">hello</p></body></html>'
+
+
+# ============================================================================
+# Fixtures
+# ============================================================================
+
+
+@pytest.fixture
+def mkpage():
+    """Return a factory of pages whose browser returns SOURCE"""
+
+    @BrowserDriver.register
+    class Driver:
+        pass
+
+    class TestBrowser(Browser):
+        document = 'doc'
+        source = SOURCE
+
+    def factory(**kwargs):
+        browser = TestBrowser(Driver())
+        return WebPage('page', URL('https://google.ca'), browser, **kwargs)
+
+    return factory
+
+
+# ============================================================================
+# Tests
+# ============================================================================
+
+
+def test_lxml_backend_roundtrip():
+    """The lxml backend parses into an xpath-able tree and serializes"""
+    b = LxmlBackend()
+    root = b.parse(SOURCE)
+    [p] = evaluate_xpath(root, '//p')
+    assert p.text_content() == 'hello'
+    assert b.tostring(p) == '<p class="x">hello</p>'
+
+
+def test_registry():
+    """Backends are looked up by name"""
+    assert isinstance(get_backend('lxml'), LxmlBackend)
+    assert 'lxml' in available_backends()
+    assert isinstance(default_backend, LxmlBackend)
+
+    with pytest.raises(ValueError) as err:
+        get_backend('nope')
+    assert err.value.args == ("Unknown parser backend: 'nope'", )
+
+
+def test_html5parser_missing(monkeypatch):
+    """html5-parser backend is unavailable without html5-parser"""
+    monkeypatch.setattr(parser, 'html5_parser', None)
+    assert not Html5ParserBackend.available()
+    assert 'html5-parser' not in available_backends()
+    with pytest.raises(ImportError):
+        get_backend('html5-parser')
+
+
+def test_html5parser_backend(monkeypatch):
+    """html5-parser backend builds an lxml.html tree"""
+    called = []
+
+    class FakeHtml5Parser:
+        @staticmethod
+        def parse(source, treebuilder):
+            called.append(treebuilder)
+            return LxmlBackend().parse(source)
+
+    monkeypatch.setattr(parser, 'html5_parser', FakeHtml5Parser)
+    b = get_backend('html5-parser')
+    [p] = evaluate_xpath(b.parse(SOURCE), '//p')
+    assert called == ['lxml_html']
+    assert b.tostring(p) == '<p class="x">hello</p>'
+
+
+def test_webpage_default_backend(mkpage):
+    """WebPage uses the default backend when none is given"""
+    assert mkpage().backend is default_backend
+
+
+def test_webpage_backend_badtype(mkpage):
+    """Raise error if backend arg given non-ParserBackend object"""
+    expected = ('backend arg expected ParserBackend object, got str object '
+                'instead', )
+    with pytest.raises(TypeError) as err:
+        mkpage(backend='lxml')
+    assert err.value.args == expected
+
+
+def test_webpage_uses_backend(mkpage):
+    """WebPage and its children parse and serialize with the page's backend"""
+    called = []
+
+    class TestBackend(LxmlBackend):
+        def parse(self, source):
+            called.append('parse')
+            return super().parse(source)
+
+        def tostring(self, node):
+            called.append('tostring')
+            return super().tostring(node)
+
+    page = mkpage(backend=TestBackend())
+    page.register('p', lambda parent: WebObject('p', '/body/p', parent))
+    page.reload()
+    assert called == ['parse']
+    assert page['p'].source == '<p class="x">hello</p>'
+    assert called == ['parse', 'tostring']
+
+
+def test_backend_abstract():
+    """ParserBackend cannot be instantiated directly"""
+    with pytest.raises(TypeError):
+        ParserBackend()
+
+
+# ============================================================================
+#
+# ============================================================================
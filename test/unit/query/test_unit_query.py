@@ -0,0 +1,283 @@
+# Module:
+# Submodules:
+# Created:
+# Copyright (C) <date> <fullname>
+#
+# This module is part of the <project name> project and is released under
+# the MIT License: http://opensource.org/licenses/MIT
+"""
+"""
+
+# ============================================================================
+# Imports
+# ============================================================================
+
+
+# Stdlib imports
+from types import GeneratorType
+
+# Third-party imports
+import pytest
+from yarl import URL
+
+# Local imports
+from selweb.core import Browser
+from selweb.driver import BrowserDriver
+from selweb.query import (STEP_ANY, STEP_DESCENDANTS, STEP_NAME,
+                          compile_query, select, walk)
+from selweb.web import CompositeWebObject, WebObject, WebObjectList, WebPage
+
+
+# ============================================================================
+# Fixtures
+# ============================================================================
+
+
+PAGE_SOURCE = """<html><body>
+<div id="results">
+<div class="r"><h3>first</h3><a>1</a></div>
+<div class="r"><h3>second</h3><a>2</a></div>
+</div>
+<ul><li>x</li><li>y</li></ul>
+<p id="footer">footer</p>
+</body></html>"""
+
+
+def addobj(cls, name, xpath, parent):
+    obj = cls(name, xpath, parent)
+    obj.reload()
+    parent.add(obj)
+    return obj
+
+
+@pytest.fixture
+def page():
+    """Return a page with results, a list and a lazy footer
+
+    page
+        results
+            r1: title, link
+            r2: title, link
+        items: 0, 1
+        footer (lazy)
+
+    """
+
+    @BrowserDriver.register
+    class Driver:
+        pass
+
+    class TestBrowser(Browser):
+        document = 'doc'
+        source = PAGE_SOURCE
+
+    p = WebPage('page', URL('https://google.ca'), TestBrowser(Driver()))
+    p.reload()
+    results = addobj(CompositeWebObject, 'results',
+                     "/body/div[@id='results']", p)
+    for i in [1, 2]:
+        r = addobj(CompositeWebObject, 'r{}'.format(i),
+                   '/div[{}]'.format(i), results)
+        addobj(WebObject, 'title', '/h3', r)
+        addobj(WebObject, 'link', '/a', r)
+    items = WebObjectList('items', '/body/ul', p, '/li')
+    items.reload()
+    p.add(items)
+    p.register('footer', lambda parent: WebObject(
+        'footer', "/body/p[@id='footer']", parent))
+    return p
+
+
+def lazybuilt(page):
+    return 'footer' in page._lazyobj
+
+
+# ============================================================================
+# Test walk
+# ============================================================================
+
+
+def test_walk_badobj():
+    """Raise error if obj is not a composite page object"""
+    expected = ('obj arg expected CompositePageObject object, got int '
+                'object instead', )
+    with pytest.raises(TypeError) as err:
+        walk(42)
+    assert err.value.args == expected
+
+
+def test_walk_badprune(page):
+    """Raise error if prune is not callable"""
+    with pytest.raises(TypeError):
+        walk(page, prune=42)
+
+
+def test_walk_depth(page):
+    """Descendants are yielded depth first in preorder"""
+    w = page.walk()
+    assert isinstance(w, GeneratorType)
+    assert [path for path, _ in w] == [
+        ('results', ),
+        ('results', 'r1'),
+        ('results', 'r1', 'title'),
+        ('results', 'r1', 'link'),
+        ('results', 'r2'),
+        ('results', 'r2', 'title'),
+        ('results', 'r2', 'link'),
+        ('items', ),
+        ('items', 0),
+        ('items', 1),
+        ('footer', ),
+    ]
+
+
+def test_walk_breadth(page):
+    """Descendants are yielded breadth first"""
+    assert [path for path, _ in page.walk(breadth=True)] == [
+        ('results', ),
+        ('items', ),
+        ('footer', ),
+        ('results', 'r1'),
+        ('results', 'r2'),
+        ('items', 0),
+        ('items', 1),
+        ('results', 'r1', 'title'),
+        ('results', 'r1', 'link'),
+        ('results', 'r2', 'title'),
+        ('results', 'r2', 'link'),
+    ]
+
+
+@pytest.mark.parametrize('breadth', [False, True])
+def test_walk_prune(page, breadth):
+    """Pruned objects are yielded without their descendants"""
+    def prune(path, obj):
+        return len(path) == 2 or obj.name == 'items'
+    paths = [path for path, _ in page.walk(breadth=breadth, prune=prune)]
+    assert sorted(paths, key=str) == sorted([
+        ('results', ), ('results', 'r1'), ('results', 'r2'), ('items', ),
+        ('footer', )
+    ], key=str)
+
+
+def test_walk_objects(page):
+    """The yielded objects are the ones found by path"""
+    for path, obj in page.walk():
+        cur = page
+        for name in path:
+            cur = cur[name]
+        assert obj is cur
+
+
+def test_walk_lazy(page):
+    """Lazy children are only created when reached"""
+    w = page.walk()
+    assert next(w)[0] == ('results', )
+    assert not lazybuilt(page)
+    list(w)
+    assert lazybuilt(page)
+
+
+# ============================================================================
+# Test compile_query
+# ============================================================================
+
+
+def test_compile_badquery():
+    """Raise error if query is not a str"""
+    with pytest.raises(TypeError):
+        compile_query(42)
+
+
+@pytest.mark.parametrize('query', ['', '/results', 'results/', 'a//b'])
+def test_compile_emptysegment(query):
+    """Raise error if a segment is empty"""
+    with pytest.raises(ValueError):
+        compile_query(query)
+
+
+def test_compile_steps():
+    """Segments are compiled to steps and repeated ** collapsed"""
+    assert compile_query('results/*/**/**/0') == (
+        (STEP_NAME, ('results', )),
+        (STEP_ANY, None),
+        (STEP_DESCENDANTS, None),
+        (STEP_NAME, ('0', 0)),
+    )
+
+
+def test_compile_cached():
+    """The same compiled query is returned for the same string"""
+    query = ''.join(['results', '/*'])
+    assert compile_query(query) is compile_query('results/*')
+
+
+# ============================================================================
+# Test select
+# ============================================================================
+
+
+def test_select_wildcard(page):
+    """* matches every child"""
+    found = page.select('results/*/title')
+    assert isinstance(found, GeneratorType)
+    assert [o.source for o in found] == ['<h3>first</h3>', '<h3>second</h3>']
+
+
+def test_select_name(page):
+    """Names match a single child and missing names match nothing"""
+    assert list(page.select('results/r2/link')) == [
+        page['results']['r2']['link']
+    ]
+    assert list(page.select('results/missing/link')) == []
+    assert list(page.select('results/r2/link/deeper')) == []
+
+
+def test_select_int_name(page):
+    """Digit segments match int names"""
+    assert list(page.select('items/1')) == [page['items'][1]]
+    assert list(page.select('items/2')) == []
+
+
+def test_select_factory_error(page):
+    """Errors creating a lazy child are not taken for a missing name"""
+    def factory(parent):
+        raise KeyError('bug in factory')
+    page.register('broken', factory)
+    with pytest.raises(KeyError) as err:
+        list(page.select('broken'))
+    assert err.value.args == ('bug in factory', )
+
+
+def test_select_pattern(page):
+    """Shell wildcards match names"""
+    assert [o.name for o in page.select('results/r[2-9]')] == ['r2']
+    assert [o.name for o in page.select('*/r?/l*')] == ['link', 'link']
+
+
+def test_select_descendants(page):
+    """** matches the objects and all their descendants"""
+    assert [o.name for o in page.select('results/**/title')] == [
+        'title', 'title'
+    ]
+    assert [o.name for o in page.select('results/**')] == [
+        'results', 'r1', 'title', 'link', 'r2', 'title', 'link'
+    ]
+
+
+def test_select_lazy(page):
+    """Matches are produced one at a time"""
+    found = page.select('*')
+    assert next(found) is page['results']
+    assert not lazybuilt(page)
+    assert list(found)[-1] is page['footer']
+
+
+def test_select_function(page):
+    """select() works on any composite page object"""
+    assert list(select(page['results'], 'r1')) == [page['results']['r1']]
+
+
+# ============================================================================
+#
+# ============================================================================
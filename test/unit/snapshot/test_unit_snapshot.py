@@ -0,0 +1,186 @@
+# Module:
+# Submodules:
+# Created:
+# Copyright (C) <date> <fullname>
+#
+# This module is part of the <project name> project and is released under
+# the MIT License: http://opensource.org/licenses/MIT
+"""
+"""
+
+# ============================================================================
+# Imports
+# ============================================================================
+
+
+# Stdlib imports
+from io import BytesIO
+import pickle
+
+# Third-party imports
+import pytest
+from yarl import URL
+
+# Local imports
+from selweb.core import Browser, CompositePageObject, Page, PageObject
+from selweb.driver import BrowserDriver
+from selweb.snapshot import (SnapshotError, SnapshotPage, dump, dumps, load,
+                             loads)
+from selweb.web import CompositeWebObject, WebObject, WebObjectList, WebPage
+
+
+# ============================================================================
+# Fixtures
+# ============================================================================
+
+
+PAGE_SOURCE = """<html><body>
+<div id="res"><p>one</p><p>two é</p></div>
+<span>hello</span>
+</body></html>"""
+
+
+@pytest.fixture
+def page():
+    """Return a reloaded page with a nested tree of objects"""
+
+    @BrowserDriver.register
+    class Driver:
+        pass
+
+    class TestBrowser(Browser):
+        document = 'doc'
+        source = PAGE_SOURCE
+
+    p = WebPage('page', URL('https://google.ca/search'),
+                TestBrowser(Driver()))
+    p.reload()
+    res = CompositeWebObject('res', "/body/div[@id='res']", p)
+    res.reload()
+    p.add(res)
+    items = WebObjectList('items', "/body/div[@id='res']", p, '/p')
+    items.reload()
+    p.add(items)
+    p.register('span', lambda parent: WebObject('span', '/body/span',
+                                                parent))
+    return p
+
+
+# ============================================================================
+# Tests
+# ============================================================================
+
+
+@pytest.mark.parametrize('compress', [False, True, 9])
+def test_roundtrip(page, compress):
+    """Names, xpaths, sources and structure survive a round trip"""
+    snap = loads(dumps(page, compress=compress))
+
+    assert isinstance(snap, SnapshotPage)
+    assert isinstance(snap, Page)
+    assert snap.name == 'page'
+    assert snap.url == page.url
+    assert snap.source == page.source
+    assert snap.parent is None
+    assert list(snap) == ['res', 'items', 'span']
+
+    res = snap['res']
+    assert isinstance(res, CompositePageObject)
+    assert res.parent is snap
+    assert res.page is snap
+    assert res.absxpath == page['res'].absxpath
+    assert res.source == page['res'].source
+    assert len(res) == 0
+
+    items = snap['items']
+    assert list(items) == [0, 1]
+    assert items[1].name == 1
+    assert items[1].absxpath == page['items'][1].absxpath
+    assert items[1].source == page['items'][1].source
+
+    span = snap['span']
+    assert isinstance(span, PageObject)
+    assert not isinstance(span, CompositePageObject)
+    assert span.xpath == '/body/span'
+    assert span.node.text == 'hello'
+
+
+def test_class_and_state(page):
+    """Classes and the states to rebuild objects are stored"""
+    snap = loads(dumps(page))
+    assert snap.clsname == 'selweb.web:WebPage'
+    assert snap.state == dict(fields=None)
+
+    items = snap['items']
+    assert items.clsname == 'selweb.web:WebObjectList'
+    assert items.state['itemxpath'] == '/p'
+    assert items.state['itemfactory'] == 'selweb.web:WebObjectListItem'
+    assert items[0].clsname == 'selweb.web:WebObjectListItem'
+
+    # Snapshots of snapshots keep them
+    again = loads(dumps(snap))
+    assert again['items'].clsname == items.clsname
+    assert again['items'].state == items.state
+
+
+def test_compressed_smaller(page):
+    """Compressed snapshots are smaller"""
+    assert len(dumps(page, compress=True)) < len(dumps(page))
+
+
+def test_file_roundtrip(page):
+    """dump and load work with binary files"""
+    f = BytesIO()
+    dump(page, f)
+    f.seek(0)
+    assert load(f).source == page.source
+
+
+def test_snapshot_picklable(page):
+    """The snapshot holds no browser, parser or reload context"""
+    data = dumps(page)
+    assert pickle.loads(pickle.dumps(data)) == data
+
+
+def test_readonly(page):
+    """Snapshot objects cannot be modified or reloaded"""
+    snap = loads(dumps(page))
+    for func in [snap.reload, snap.go, snap.clear, snap['span'].reload]:
+        with pytest.raises(TypeError):
+            func()
+    with pytest.raises(TypeError):
+        snap.add(snap['span'])
+    with pytest.raises(TypeError):
+        del snap['span']
+    with pytest.raises(TypeError):
+        snap['span'].parent = None
+    assert snap.browser is None
+    assert snap.visible is False
+
+
+def test_dumps_badtype():
+    """Raise error if obj arg is not a page object"""
+    expected = ('obj arg expected PageObject object, got int object '
+                'instead', )
+    with pytest.raises(TypeError) as err:
+        dumps(42)
+    assert err.value.args == expected
+
+
+@pytest.mark.parametrize('data', [b'', b'XXXX' + bytes(16),
+                                  b'SWSN\x02' + bytes(16)])
+def test_loads_invalid(data):
+    """Raise SnapshotError for data that is not a snapshot"""
+    with pytest.raises(SnapshotError):
+        loads(data)
+
+
+def test_loads_corrupt(page):
+    """Raise SnapshotError for truncated snapshots"""
+    with pytest.raises(SnapshotError):
+        loads(dumps(page)[:-1])
+
+
+# ============================================================================
+#
+# ============================================================================
@@ -0,0 +1,231 @@
+# Module:
+# Submodules:
+# Created:
+# Copyright (C) <date> <fullname>
+#
+# This module is part of the <project name> project and is released under
+# the MIT License: http://opensource.org/licenses/MIT
+"""
+"""
+
+# ============================================================================
+# Imports
+# ============================================================================
+
+
+# Stdlib imports
+from functools import partial
+from math import inf
+
+# Third-party imports
+import pytest
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as ec
+
+# Local imports
+from selweb.condition import Present, Visible
+import selweb.core as core
+from selweb.stats import (BUCKET_BOUNDS, WaitHistogram, WaitStats,
+                          condition_key)
+
+
+# ============================================================================
+# Test condition_key
+# ============================================================================
+
+
+def test_condition_key_xpath():
+    """Key is the condition name and the given xpath"""
+    key = condition_key(ec.presence_of_element_located, '/html')
+    assert key == ('presence_of_element_located', '/html')
+
+
+def test_condition_key_partial_locator():
+    """Xpath is taken from a partial's locator arg"""
+    func = partial(ec.text_to_be_present_in_element, (By.XPATH, '/a'), 'b')
+    key = condition_key(func)
+    assert key == ('text_to_be_present_in_element', '/a')
+
+
+def test_condition_key_partial_nonlocator():
+    """Partials without a locator have no xpath"""
+    func = partial(ec.title_is, 'hello')
+    assert condition_key(func) == ('title_is', None)
+
+
+def test_condition_key_condition():
+    """Conditions are keyed by their compiled script and args"""
+    assert condition_key(Visible('/a')) == condition_key(Visible('/a'))
+    assert condition_key(Visible('/a')) != condition_key(Visible('/b'))
+    first = Visible('/a') & Present('/b')
+    second = Present('/a') & Visible('/b')
+    assert condition_key(first)[0] == condition_key(second)[0] == 'All'
+    assert condition_key(first) != condition_key(second)
+
+
+# ============================================================================
+# Test WaitHistogram
+# ============================================================================
+
+
+def test_histogram_empty():
+    """Empty histogram has no percentile"""
+    h = WaitHistogram()
+    assert h.percentile(0.5) is None
+    assert h.export()['mean'] is None
+
+
+def test_histogram_add():
+    """Samples are bucketed and summarized"""
+    h = WaitHistogram()
+    for val in [0.005, 0.015, 0.015, 0.3]:
+        h.add(val)
+
+    data = h.export()
+    assert data['count'] == 4
+    assert data['min'] == 0.005
+    assert data['max'] == 0.3
+    assert sum(data['buckets']) == 4
+    assert data['buckets'][0] == 1
+    assert data['buckets'][1] == 2
+
+
+def test_histogram_percentile():
+    """Percentile returns the bucket bound, never more than the max"""
+    h = WaitHistogram()
+    for _ in range(9):
+        h.add(0.015)
+    h.add(0.3)
+    assert h.percentile(0.5) == BUCKET_BOUNDS[1]
+    assert h.percentile(1) == 0.3
+
+
+def test_histogram_percentile_timeouts():
+    """Percentile is inf when it falls on timed out waits"""
+    h = WaitHistogram()
+    h.add(0.015)
+    h.add_timeout()
+    assert h.percentile(0.5) == 0.015
+    assert h.percentile(0.99) == inf
+
+
+@pytest.mark.parametrize('val', [-0.1, 1.1])
+def test_histogram_percentile_badval(val):
+    """Raise error if p is not between 0 and 1"""
+    with pytest.raises(ValueError):
+        WaitHistogram().percentile(val)
+
+
+# ============================================================================
+# Test WaitStats
+# ============================================================================
+
+
+def test_stats_record_export():
+    """Recorded waits are exported per key"""
+    s = WaitStats()
+    key = ('presence_of_element_located', '/html')
+    s.record(key, 0.02)
+    s.record_timeout(key)
+
+    assert list(s) == [key]
+    data = s.export()
+    assert len(data) == 1
+    assert data[0]['condition'] == key[0]
+    assert data[0]['xpath'] == key[1]
+    assert data[0]['count'] == 1
+    assert data[0]['timeouts'] == 1
+
+
+def test_stats_timeout_disabled():
+    """Default timeout is used if autotimeout is off"""
+    s = WaitStats(minsamples=1)
+    s.record('key', 0.015)
+    assert s.timeout('key', 42) == 42
+
+
+def test_stats_timeout_not_enough_samples():
+    """Default timeout is used until minsamples waits are recorded"""
+    s = WaitStats(autotimeout=True, minsamples=2, mintimeout=0)
+    s.record('key', 0.015)
+    assert s.timeout('key', 42) == 42
+    s.record('key', 0.015)
+    assert s.timeout('key', 42) == 0.015 * s.factor
+
+
+def test_stats_timeout_clamped():
+    """Derived timeouts are clamped"""
+    s = WaitStats(autotimeout=True, minsamples=1, mintimeout=0.5,
+                  maxtimeout=1)
+    s.record('fast', 0.001)
+    s.record('slow', 10)
+    assert s.timeout('fast', 42) == 0.5
+    assert s.timeout('slow', 42) == 1
+
+
+def test_stats_timeout_mostly_timeouts():
+    """Default timeout is used if the percentile falls on timeouts"""
+    s = WaitStats(autotimeout=True, minsamples=1)
+    s.record_timeout('key')
+    assert s.timeout('key', 42) == 42
+
+
+# ============================================================================
+# Test WaitFor recording
+# ============================================================================
+
+
+class FakeWebDriverWait:
+    timeouts = []
+    fail = False
+
+    def __init__(self, driver, timeout):
+        self.timeouts.append(timeout)
+
+    def until(self, method, message=''):
+        if self.fail:
+            raise TimeoutException()
+        return method
+
+
+def test_waitfor_records(monkeypatch):
+    """WaitFor records satisfied and timed out waits"""
+    monkeypatch.setattr(core, 'WebDriverWait', FakeWebDriverWait)
+
+    class Parent:
+        selenium_driver = 42
+        waitstats = WaitStats()
+
+    w = core.WaitFor(parent=Parent)
+    w.element('/html')
+    FakeWebDriverWait.fail = True
+    try:
+        with pytest.raises(TimeoutException):
+            w.element('/html')
+    finally:
+        FakeWebDriverWait.fail = False
+
+    hist = Parent.waitstats[('presence_of_element_located', '/html')]
+    assert hist.count == 1
+    assert hist.timeouts == 1
+
+
+def test_waitfor_autotimeout(monkeypatch):
+    """WaitFor uses the derived timeout"""
+    FakeWebDriverWait.timeouts = []
+    monkeypatch.setattr(core, 'WebDriverWait', FakeWebDriverWait)
+
+    class Parent:
+        selenium_driver = 42
+        waitstats = WaitStats(autotimeout=True, minsamples=1, mintimeout=0)
+
+    Parent.waitstats.record(('presence_of_element_located', '/html'), 0.015)
+    w = core.WaitFor(parent=Parent)
+    w.element('/html', timeout=30)
+    assert FakeWebDriverWait.timeouts == [0.015 * Parent.waitstats.factor]
+
+
+# ============================================================================
+#
+# ============================================================================
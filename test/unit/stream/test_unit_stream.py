@@ -0,0 +1,160 @@
+# Module:
+# Submodules:
+# Created:
+# Copyright (C) <date> <fullname>
+#
+# This module is part of the <project name> project and is released under
+# the MIT License: http://opensource.org/licenses/MIT
+"""
+"""
+
+# ============================================================================
+# Imports
+# ============================================================================
+
+
+# Stdlib imports
+from io import BytesIO
+
+# Third-party imports
+import pytest
+from yarl import URL
+
+# Local imports
+from selweb.core import Browser
+from selweb.driver import BrowserDriver
+from selweb.stream import StreamExtractor
+from selweb.web import WebPage
+
+
+# ============================================================================
+# Globals
+# ============================================================================
+
+
+SOURCE = """<html><body>
+<ul><li class="a">one <b>1</b></li><li>two</li><li class="a">three</li></ul>
+<p>para</p>
+</body></html>"""
+
+
+def litext(el):
+    return el.text_content().strip()
+
+
+# ============================================================================
+# Test __init__ / register
+# ============================================================================
+
+
+@pytest.mark.parametrize('val,err', [('1', TypeError), (0, ValueError)])
+def test_init_arg_chunksize_bad(val, err):
+    """Raise error if chunksize is not a positive int"""
+    with pytest.raises(err):
+        StreamExtractor(chunksize=val)
+
+
+def test_register_bad():
+    """func and match must be callable, names unique"""
+    s = StreamExtractor()
+    with pytest.raises(TypeError):
+        s.register('li', 'li', 42)
+    with pytest.raises(TypeError):
+        s.register('li', 'li', litext, match=42)
+    s.register('li', 'li', litext)
+    with pytest.raises(ValueError):
+        s.register('li', 'li', litext)
+
+
+# ============================================================================
+# Test parse
+# ============================================================================
+
+
+@pytest.mark.parametrize('chunksize', [1, 7, 1024])
+def test_parse_chunks(chunksize):
+    """Extractors run on completed elements regardless of chunk size"""
+    s = StreamExtractor(chunksize=chunksize)
+    s.register('items', 'li', litext)
+    s.register('marked', 'li', litext, match=lambda el: el.get('class') == 'a')
+    s.register('para', 'p', litext)
+
+    result = s.parse(SOURCE)
+    assert list(result) == ['items', 'marked', 'para']
+    assert result['items'] == ['one 1', 'two', 'three']
+    assert result['marked'] == ['one 1', 'three']
+    assert result['para'] == ['para']
+
+
+@pytest.mark.parametrize('source', [SOURCE.encode('utf-8'),
+                                    BytesIO(SOURCE.encode('utf-8')),
+                                    [SOURCE[:20], SOURCE[20:]]])
+def test_parse_source_types(source):
+    """bytes, file-like objects and chunk iterables are accepted"""
+    s = StreamExtractor()
+    s.register('items', 'li', litext)
+    assert s.parse(source)['items'] == ['one 1', 'two', 'three']
+
+
+def test_parse_none_not_collected():
+    """None return values are not collected"""
+    s = StreamExtractor()
+    s.register('items', 'li', lambda el: el.get('class'))
+    assert s.parse(SOURCE)['items'] == ['a', 'a']
+
+
+def test_parse_frees_processed_elements():
+    """Completed elements outside registered tags are freed"""
+    seen = []
+
+    def record(el):
+        # The completed list was emptied
+        body = el.getparent()
+        seen.append([(c.tag, len(c)) for c in body])
+
+    s = StreamExtractor(chunksize=16)
+    s.register('ul', 'ul', lambda el: None)
+    s.register('p', 'p', record)
+    s.parse(SOURCE)
+    assert seen == [[('ul', 0), ('p', 0)]]
+
+
+def test_parse_nested_kept():
+    """Elements inside an open registered element are kept for it"""
+    s = StreamExtractor(chunksize=4)
+    s.register('b', 'b', litext)
+    s.register('ul', 'ul', lambda el: len(el))
+    result = s.parse(SOURCE)
+    assert result['b'] == ['1']
+    assert result['ul'] == [3]
+
+
+# ============================================================================
+# Test WebPage.stream
+# ============================================================================
+
+
+def test_webpage_stream():
+    """WebPage.stream parses the browser source without loading the page"""
+
+    @BrowserDriver.register
+    class Driver:
+        pass
+
+    class TestBrowser(Browser):
+        document = 'doc'
+        source = SOURCE
+
+    page = WebPage('page', URL('https://google.ca'), TestBrowser(Driver()))
+    s = StreamExtractor()
+    s.register('items', 'li', litext)
+    assert page.stream(s)['items'] == ['one 1', 'two', 'three']
+    assert page.parser is None
+
+    with pytest.raises(TypeError):
+        page.stream(42)
+
+
+# ============================================================================
+#
+# ============================================================================
@@ -0,0 +1,203 @@
+# Module:
+# Submodules:
+# Created:
+# Copyright (C) <date> <fullname>
+#
+# This module is part of the <project name> project and is released under
+# the MIT License: http://opensource.org/licenses/MIT
+"""
+"""
+
+# ============================================================================
+# Imports
+# ============================================================================
+
+
+# Stdlib imports
+from array import array
+from math import isnan
+
+# Third-party imports
+from lxml import html
+import pytest
+
+# Local imports
+import selweb.table as table
+from selweb.table import Table, extract_table, iterrows
+
+
+# ============================================================================
+# Helpers
+# ============================================================================
+
+
+def mktable(body):
+    """Return the table node of an html document containing body"""
+    root = html.fromstring(f'<html><body><table>{body}</table></body></html>')
+    return root.xpath('//table')[0]
+
+
+def texts(row):
+    return [None if c is None else c.text_content() for c in row]
+
+
+# ============================================================================
+# Test iterrows
+# ============================================================================
+
+
+def test_iterrows_plain():
+    """Rows are lists of cells"""
+    t = mktable('<tr><th>a</th><th>b</th></tr><tr><td>1</td><td>2</td></tr>')
+    assert [texts(r) for r in iterrows(t)] == [['a', 'b'], ['1', '2']]
+
+
+def test_iterrows_sections():
+    """Rows in thead/tbody/tfoot are found but not nested tables"""
+    t = mktable('<thead><tr><th>a</th></tr></thead>'
+                '<tbody><tr><td>1<table><tr><td>x</td></tr></table></td></tr>'
+                '</tbody>')
+    rows = [texts(r) for r in iterrows(t)]
+    assert rows == [['a'], ['1x']]
+
+
+def test_iterrows_colspan():
+    """colspan repeats the cell across columns"""
+    t = mktable('<tr><td colspan="2">a</td><td>b</td></tr>')
+    assert [texts(r) for r in iterrows(t)] == [['a', 'a', 'b']]
+
+
+def test_iterrows_rowspan():
+    """rowspan repeats the cell in the following rows"""
+    t = mktable('<tr><td rowspan="3">a</td><td>b</td></tr>'
+                '<tr><td>c</td></tr>'
+                '<tr><td>d</td><td rowspan="2" colspan="2">e</td></tr>'
+                '<tr><td>f</td></tr>')
+    assert [texts(r) for r in iterrows(t)] == [
+        ['a', 'b'],
+        ['a', 'c'],
+        ['a', 'd', 'e', 'e'],
+        ['f', None, 'e', 'e'],
+    ]
+
+
+def test_iterrows_rowspan_past_row_end():
+    """Spanning cells after a short row's last cell are kept"""
+    t = mktable('<tr><td>a</td><td>b</td><td rowspan="2">c</td></tr>'
+                '<tr><td>d</td></tr>')
+    assert [texts(r) for r in iterrows(t)] == [
+        ['a', 'b', 'c'], ['d', None, 'c']
+    ]
+
+
+@pytest.mark.parametrize('val', ['0', 'x', '-2'])
+def test_iterrows_bad_span(val):
+    """Bad span values are treated as 1"""
+    t = mktable(f'<tr><td colspan="{val}">a</td><td>b</td></tr>')
+    assert [texts(r) for r in iterrows(t)] == [['a', 'b']]
+
+
+# ============================================================================
+# Test extract_table
+# ============================================================================
+
+
+TABLE = """
+<tr><th>name</th><th>count</th><th>price</th></tr>
+<tr><td>a</td><td>1</td><td>1.5</td></tr>
+<tr><td>b</td><td>2</td><td></td></tr>
+<tr><td>c</td><td>3</td></tr>
+"""
+
+
+def test_extract_columns():
+    """Columns are named by the header row"""
+    t = extract_table(mktable(TABLE))
+    assert isinstance(t, Table)
+    assert t.columns == ('name', 'count', 'price')
+    assert len(t) == 3
+    assert t['name'] == ['a', 'b', 'c']
+    assert t[1] == ['1', '2', '3']
+    assert t['price'] == ['1.5', '', None]
+
+
+def test_extract_noheader():
+    """Columns are named by index without a header"""
+    t = extract_table(mktable(TABLE), header=False)
+    assert t.columns == ('0', '1', '2')
+    assert len(t) == 4
+
+
+def test_extract_types():
+    """Typed columns are converted and stored as arrays"""
+    t = extract_table(mktable(TABLE), types={
+        'count': int,
+        2: lambda v: float(v) if v else None,
+    })
+    assert t['count'] == array('q', [1, 2, 3])
+    assert t['price'] == [1.5, None, None]
+
+    t = extract_table(mktable(TABLE.replace('<td></td>', '<td>2</td>')),
+                      types={'price': float, 'name': str.upper})
+    price = t['price']
+    assert isinstance(price, array)
+    assert price[:2] == array('d', [1.5, 2.0])
+    assert isnan(price[2])
+    assert t['name'] == ['A', 'B', 'C']
+
+
+def test_extract_int_missing_is_list():
+    """int columns with missing cells fall back to a list"""
+    t = extract_table(mktable(TABLE.replace('<td>3</td>', '')),
+                      types={'count': int})
+    assert t['count'] == [1, 2, None]
+
+
+def test_extract_typed_empty_cells():
+    """Empty cells of typed columns are missing values"""
+    t = extract_table(mktable('<tr><th>a</th><th>b</th><th>c</th></tr>'
+                              '<tr><td>x</td><td>1</td><td>1.5</td></tr>'
+                              '<tr><td></td><td> </td><td></td></tr>'),
+                      types={'b': int, 'c': float})
+    assert t['a'] == ['x', '']
+    assert t['b'] == [1, None]
+    assert t['c'][0] == 1.5
+    assert isnan(t['c'][1])
+
+
+def test_extract_wide_row():
+    """Rows wider than the header add backfilled columns"""
+    t = extract_table(mktable('<tr><th>a</th></tr><tr><td>1</td></tr>'
+                              '<tr><td>2</td><td>3</td></tr>'))
+    assert t.todict() == {'a': ['1', '2'], '1': [None, '3']}
+
+
+def test_extract_xpath():
+    """The table is found via xpath relative to the given node"""
+    t = mktable(TABLE)
+    root = t.getroottree().getroot()
+    assert extract_table(root, '//table').columns == ('name', 'count',
+                                                      'price')
+    with pytest.raises(ValueError):
+        extract_table(root, '//tr')
+
+
+def test_extract_numpy():
+    """Columns are returned as numpy arrays"""
+    numpy = pytest.importorskip('numpy')
+    t = extract_table(mktable(TABLE), types={'count': int}, asnumpy=True)
+    assert t['count'].dtype == numpy.int64
+    assert list(t['count']) == [1, 2, 3]
+    assert t['name'].dtype == object
+
+
+def test_extract_numpy_missing(monkeypatch):
+    """Raise error if numpy is requested but not installed"""
+    monkeypatch.setattr(table, 'numpy', None)
+    with pytest.raises(ImportError):
+        extract_table(mktable(TABLE), asnumpy=True)
+
+
+# ============================================================================
+#
+# ============================================================================
@@ -16,10 +16,12 @@
 # Stdlib imports
 
 # Third-party imports
+from lxml import etree, html
 import pytest
 
 # Local imports
-from selweb.util import noop_context, xpath_clsmatch
+from selweb.util import (XPathCache, evaluate_xpath, noop_context,
+                         subtree_digest, xpath_clsmatch)
 
 
 # ============================================================================
@@ -87,6 +89,95 @@ def test_noop_context_noerrors():
         pass
 
 
+# ============================================================================
+# XPathCache
+# ============================================================================
+
+
+def test_xpathcache_hits():
+    """Compiled expressions are reused and counted"""
+    cache = XPathCache()
+    compiled = cache['/html']
+    assert isinstance(compiled, etree.XPath)
+    assert (cache.hits, cache.misses) == (0, 1)
+    assert cache['/html'] is compiled
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    cache.clear()
+    assert len(cache) == 0
+    assert (cache.hits, cache.misses) == (0, 0)
+
+
+def test_xpathcache_bounded():
+    """Least recently used expression is evicted"""
+    cache = XPathCache(maxsize=2)
+    first = cache['/a']
+    cache['/b']
+    cache['/a']
+    cache['/c']
+    assert len(cache) == 2
+    assert cache['/a'] is first
+    assert cache.misses == 3
+    cache['/b']
+    assert cache.misses == 4
+
+
+@pytest.mark.parametrize('val,err', [('1', TypeError), (0, ValueError)])
+def test_xpathcache_badmaxsize(val, err):
+    """Raise error if maxsize is not a positive int"""
+    with pytest.raises(err):
+        XPathCache(maxsize=val)
+
+
+def test_evaluate_xpath_lxml():
+    """lxml nodes are evaluated with a compiled expression"""
+    root = html.fromstring('<html><body><p>a</p><p>b</p></body></html>')
+    nodes = evaluate_xpath(root, '/html/body/p')
+    assert [n.text for n in nodes] == ['a', 'b']
+
+
+def test_evaluate_xpath_other():
+    """Non-lxml nodes use their own xpath method"""
+
+    class Fake:
+        def xpath(self, expr):
+            return [expr]
+
+    assert evaluate_xpath(Fake(), '/html') == ['/html']
+
+
+# ============================================================================
+# Test subtree_digest
+# ============================================================================
+
+
+@pytest.mark.parametrize('other,same', [
+    ('<div><p a="1" b="2">x</p>t<!-- c --></div>', True),
+    ('<div><p b="2" a="1">x</p>t<!-- c --></div>', True),
+    ('<div><p a="1" b="3">x</p>t<!-- c --></div>', False),
+    ('<div><p a="1" b="2">y</p>t<!-- c --></div>', False),
+    ('<div><p a="1" b="2">x</p>u<!-- c --></div>', False),
+    ('<div><p a="1" b="2">x</p>t<!-- d --></div>', False),
+    ('<div><span a="1" b="2">x</span>t<!-- c --></div>', False),
+])
+def test_subtree_digest(other, same):
+    """Equal subtrees have equal digests"""
+    source = '<div><p a="1" b="2">x</p>t<!-- c --></div>'
+    node = html.fragment_fromstring(source)
+    other = html.fragment_fromstring(other)
+    assert (subtree_digest(node) == subtree_digest(other)) is same
+
+
+def test_subtree_digest_memo():
+    """Digests of descendants are memoized and the node's tail ignored"""
+    root = html.fragment_fromstring('<div><p>x</p>tail<p>x</p></div>')
+    memo = {}
+    digest = subtree_digest(root, memo)
+    assert len(memo) == 3
+    assert memo[root] == digest
+    assert subtree_digest(root[0], memo) == subtree_digest(root[1])
+
+
 # ============================================================================
 #
 # ============================================================================
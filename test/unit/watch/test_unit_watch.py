@@ -0,0 +1,188 @@
+# Module:
+# Submodules:
+# Created:
+# Copyright (C) <date> <fullname>
+#
+# This module is part of the <project name> project and is released under
+# the MIT License: http://opensource.org/licenses/MIT
+"""
+"""
+
+# ============================================================================
+# Imports
+# ============================================================================
+
+
+# Stdlib imports
+
+# Third-party imports
+import pytest
+from yarl import URL
+
+# Local imports
+from selweb.core import Browser
+from selweb.driver import BrowserDriver
+import selweb.watch as watch
+from selweb.watch import (INSTALL_SCRIPT, POLL_SCRIPT, UNINSTALL_SCRIPT,
+                          ChangeEvent, PageWatcher)
+from selweb.web import WebObject, WebPage
+
+
+# ============================================================================
+# Fixtures
+# ============================================================================
+
+
+PAGE_SOURCE = """<html><body>
+<div id="a">one</div><div id="b">two</div>
+</body></html>"""
+
+
+@pytest.fixture
+def page():
+    """Return a page with two children whose browser records scripts"""
+
+    @BrowserDriver.register
+    class Driver:
+        pass
+
+    class TestBrowser(Browser):
+        document = 'doc'
+        source = PAGE_SOURCE
+        scripts = []
+        results = []
+
+        def execute(self, script, *args):
+            self.scripts.append((script, args))
+            if script == POLL_SCRIPT:
+                result = self.results.pop(0)
+                if isinstance(result, tuple):
+                    # The document changes as the script runs
+                    result, type(self).source = result
+                return result
+            return None
+
+    p = WebPage('page', URL('https://google.ca'), TestBrowser(Driver()))
+    p.reload()
+    for name in ['a', 'b']:
+        obj = WebObject(name, "/body/div[@id='{}']".format(name), p)
+        obj.reload()
+        p.add(obj)
+    return p
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Replace the watcher's clock, recording sleeps"""
+    now = [100.0]
+    slept = []
+
+    def fake_sleep(seconds):
+        slept.append(seconds)
+        now[0] += seconds
+
+    monkeypatch.setattr(watch, 'monotonic', lambda: now[0])
+    monkeypatch.setattr(watch, 'sleep', fake_sleep)
+    return now, slept
+
+
+def setsource(page, source):
+    type(page.browser).source = source
+
+
+# ============================================================================
+# Tests
+# ============================================================================
+
+
+def test_init_badpage():
+    """Raise error if page arg is not a WebPage"""
+    expected = ('page arg expected WebPage object, got int object '
+                'instead', )
+    with pytest.raises(TypeError) as err:
+        PageWatcher(42)
+    assert err.value.args == expected
+
+
+def test_init_badinterval(page):
+    """Raise error if interval arg is negative"""
+    with pytest.raises(ValueError):
+        PageWatcher(page, interval=-1)
+
+
+def test_start_installs_observer(page):
+    """start() installs the observer"""
+    w = PageWatcher(page)
+    assert w.start() == []
+    assert page.browser.scripts == [(INSTALL_SCRIPT, (watch.MAXQUEUE, ))]
+
+
+def test_poll_nothing_changed(page, clock):
+    """No source is fetched if no watched object was affected"""
+    w = PageWatcher(page)
+    w.start()
+    page.browser.results.append([])
+    setsource(page, 'not fetched')
+    assert w.poll() == []
+    assert page.browser.scripts[-1] == (
+        POLL_SCRIPT, ("/html/body/div[@id='a']", "/html/body/div[@id='b']")
+    )
+
+
+def test_poll_changed(page, clock):
+    """Affected objects are refreshed and reported"""
+    events = []
+    b = page['b']
+    olddigest = b.nodedigest
+    w = PageWatcher(page, callback=events.append)
+    w.start()
+    page.browser.results.append([1])
+    setsource(page, PAGE_SOURCE.replace('two', 'deux'))
+
+    expected = [ChangeEvent('changed', ('b', ), olddigest,
+                            '<div id="b">deux</div>\n')]
+    assert w.poll() == expected
+    assert events == expected
+    # The previous generation's object is left as it was
+    assert b.nodedigest == olddigest
+    assert page['b'].nodedigest != olddigest
+
+
+def test_poll_document_replaced(page, clock):
+    """The observer is reinstalled if the document was replaced"""
+    w = PageWatcher(page)
+    w.start()
+    page.browser.results.append(None)
+    setsource(page, PAGE_SOURCE.replace('<div id="a">one</div>', ''))
+    assert w.poll() == [ChangeEvent('removed', ('a', ), None, None)]
+    assert page.browser.scripts[-1] == (INSTALL_SCRIPT, (watch.MAXQUEUE, ))
+
+
+def test_poll_interval(page, clock):
+    """Polls are at least interval seconds apart"""
+    now, slept = clock
+    w = PageWatcher(page, interval=5)
+    w.start()
+    page.browser.results.extend([[], []])
+    w.poll()
+    now[0] += 2
+    w.poll()
+    assert slept == [3]
+
+
+def test_iterate_until_stopped(page, clock):
+    """Iterating yields events until stop() is called"""
+    w = PageWatcher(page)
+    page.browser.results.extend([
+        [], ([0], PAGE_SOURCE.replace('one', 'un'))
+    ])
+    for event in w:
+        assert event.path == ('a', )
+        w.stop()
+    assert not page.browser.results
+    assert page.browser.scripts[-1] == (UNINSTALL_SCRIPT, ())
+
+
+# ============================================================================
+#
+# ============================================================================
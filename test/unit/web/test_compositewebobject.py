@@ -18,10 +18,13 @@ from collections import OrderedDict
 from contextlib import contextmanager
 
 # Third-party imports
+from lxml import html
 import pytest
+from yarl import URL
 
 # Local imports
-from selweb.core import CompositePageObject, PageObject
+from selweb.core import Browser, CompositePageObject, PageObject
+from selweb.driver import BrowserDriver
 from selweb.util import noop_context
 import selweb.web as web
 from selweb.web import CompositeWebObject
@@ -188,6 +191,152 @@ def test_add_arg_obj_badtype(webgroup, val):
         w.add(val)
 
 
+# ============================================================================
+# Test lazy children
+# ============================================================================
+
+
+@pytest.fixture
+def lazychild(webgroup):
+    """Return a factory that records creation and reload of children"""
+    called = []
+
+    @PageObject.register
+    class Child:
+
+        def __init__(self, name, parent):
+            self.name = name
+            self.parent = parent
+            called.append(('create', name))
+
+        def reload(self):
+            called.append(('reload', self.name))
+
+    def factory(name):
+        return lambda parent: Child(name, parent)
+
+    factory.called = called
+    return factory
+
+
+def test_register_lazy(webgroup, lazychild):
+    """Registered children are created and reloaded on first access"""
+
+    @webgroup.register
+    class TestParent:
+        pass
+
+    w = CompositeWebObject('name', '/hello', TestParent())
+    w.register('a', lazychild('a'))
+    w.register('b', lazychild('b'))
+
+    assert list(w) == ['a', 'b']
+    assert len(w) == 2
+    assert 'a' in w and 'c' not in w
+    assert lazychild.called == []
+
+    a = w['a']
+    assert a.parent is w
+    assert w['a'] is a
+    assert lazychild.called == [('create', 'a'), ('reload', 'a')]
+
+    assert [c.name for c in w.children()] == ['a', 'b']
+    assert lazychild.called[2:] == [('create', 'b'), ('reload', 'b')]
+
+
+def test_register_cleared_on_clear(webgroup, lazychild):
+    """Created lazy children are dropped on clear but stay registered"""
+
+    @webgroup.register
+    class TestParent:
+        pass
+
+    w = CompositeWebObject('name', '/hello', TestParent())
+    w.register('a', lazychild('a'))
+    a = w['a']
+    w.clear()
+    assert list(w) == ['a']
+    assert w['a'] is not a
+
+
+def test_register_mixed_with_add(webgroup, lazychild):
+    """Added children come first and shadow registered ones"""
+
+    @webgroup.register
+    class Fake:
+        name = 'fake'
+
+    @webgroup.register
+    class TestParent:
+        pass
+
+    w = CompositeWebObject('name', '/hello', TestParent())
+    w.register('a', lazychild('a'))
+    w.register('fake', lazychild('fake'))
+    f = Fake()
+    w.add(f)
+
+    assert list(w) == ['fake', 'a']
+    assert len(w) == 2
+    assert w['fake'] is f
+
+    del w['a']
+    assert list(w) == ['fake']
+    with pytest.raises(KeyError):
+        w['a']
+
+
+def test_register_bad_factory(webgroup):
+    """Factory must be callable and return a page object with the name"""
+
+    @webgroup.register
+    class Fake:
+        name = 'fake'
+
+    @webgroup.register
+    class TestParent:
+        pass
+
+    w = CompositeWebObject('name', '/hello', TestParent())
+    with pytest.raises(TypeError):
+        w.register('a', 42)
+
+    w.register('a', lambda parent: 42)
+    with pytest.raises(TypeError):
+        w['a']
+
+    w.register('a', lambda parent: Fake())
+    with pytest.raises(ValueError):
+        w['a']
+
+
+# ============================================================================
+# Test absxpath
+# ============================================================================
+
+
+def test_parent_set_clears_descendant_absxpath(webgroup):
+    """Reassigning the parent clears the cached absxpath of descendants"""
+
+    @webgroup.register
+    class TestParent:
+        parent = None
+
+        def __init__(self, xpath):
+            self.xpath = xpath
+
+    w = CompositeWebObject('name', '/hello', TestParent('/html'))
+    child = CompositeWebObject('child', '/world', w)
+    grandchild = web.WebObject('grandchild', '/answer', child)
+    w.add(child)
+    child.add(grandchild)
+    assert grandchild.absxpath == '/html/hello/world/answer'
+
+    w.parent = TestParent('/body')
+    assert child.absxpath == '/body/hello/world'
+    assert grandchild.absxpath == '/body/hello/world/answer'
+
+
 # ============================================================================
 # Test reload
 # ============================================================================
@@ -199,7 +348,7 @@ def test_reload_uses_unnested_reload_context(monkeypatch, webgroup):
     def fake_tostring(n):
         return b'42'
 
-    monkeypatch.setattr(web.html, 'tostring', fake_tostring)
+    monkeypatch.setattr(html, 'tostring', fake_tostring)
 
     called = []
 
@@ -242,6 +391,176 @@ def test_reload_uses_unnested_reload_context(monkeypatch, webgroup):
     assert called == ['enter context', 'called xpath', 'exit context']
 
 
+# ============================================================================
+# Test relative evaluation
+# ============================================================================
+
+
+PAGE_SOURCE = """
+<html><body>
+<div id="a"><p class="x">one</p><div id="b"><p class="x">two</p></div></div>
+<div id="c"><p class="x">three</p></div>
+</body></html>
+"""
+
+
+@pytest.fixture
+def page():
+    """Return a WebPage loaded from PAGE_SOURCE"""
+
+    @BrowserDriver.register
+    class Driver:
+        pass
+
+    class TestBrowser(Browser):
+        document = 'doc'
+        source = PAGE_SOURCE
+
+    p = web.WebPage('page', URL('https://google.ca'), TestBrowser(Driver()))
+    p.reload()
+    return p
+
+
+def test_child_evaluated_relative_to_parent(monkeypatch, page):
+    """Children evaluate their own xpath against the parent's node"""
+    called = []
+    orig = web.evaluate_xpath
+
+    def fake_evaluate(node, expr):
+        called.append(expr)
+        return orig(node, expr)
+
+    monkeypatch.setattr(web, 'evaluate_xpath', fake_evaluate)
+
+    a = CompositeWebObject('a', "//div[@id='a']", page)
+    page.add(a)
+    a.reload()
+    b = CompositeWebObject('b', "/div[@id='b']", a)
+    a.add(b)
+    b.reload()
+    p = web.WebObject('p', '//p', b)
+    b.add(p)
+    p.reload()
+
+    assert called == ['/html', ".//div[@id='a']", "./div[@id='b']", './/p']
+    assert p.source.strip() == '<p class="x">two</p>'
+
+
+def test_relative_matches_absolute(page):
+    """Relative evaluation finds the same node as the absolute xpath"""
+    a = CompositeWebObject('a', "//div[@id='a']", page)
+    page.add(a)
+    a.reload()
+
+    # //p has two matches below div#a and so must fail as it does with the
+    # absolute xpath
+    p = web.WebObject('p', '//p', a)
+    with pytest.raises(AssertionError):
+        p.reload()
+    assert len(page.parser.xpath(p.absxpath)) == 2
+
+    p = web.WebObject('p', "/p[@class='x']", a)
+    p.reload()
+    assert p.source == html.tostring(
+        page.parser.xpath(p.absxpath)[0]).decode('utf-8')
+
+
+def test_overridden_absxpath_is_absolute(monkeypatch, page):
+    """Objects overriding absxpath are evaluated from the document root"""
+    called = []
+    orig = web.evaluate_xpath
+
+    def fake_evaluate(node, expr):
+        called.append(expr)
+        return orig(node, expr)
+
+    monkeypatch.setattr(web, 'evaluate_xpath', fake_evaluate)
+
+    class Indexed(CompositeWebObject):
+
+        @property
+        def absxpath(self):
+            return f'({super().absxpath})[2]'
+
+    item = Indexed('item', "//p[@class='x']", page)
+    page.add(item)
+    item.reload()
+
+    # The child's absxpath builds on the overridden absxpath of its parent so
+    # it can be evaluated relative to the parent's node
+    child = web.WebObject('child', '/self::p', item)
+    child.reload()
+
+    assert child.absxpath == "(/html//p[@class='x'])[2]/self::p"
+    assert called == ["(/html//p[@class='x'])[2]", './self::p']
+    assert child.node.text == 'two'
+
+
+def test_stale_parent_node_not_used(page):
+    """A parent node from a previous parse is not used as anchor"""
+    a = CompositeWebObject('a', "//div[@id='c']", page)
+    page.add(a)
+    a.reload()
+    old_parser = page.parser
+    type(page.browser).source = PAGE_SOURCE.replace('three', 'four')
+    page.reload()
+    assert page.parser is not old_parser
+    assert a._anchor(page.parser) is None
+
+
+# ============================================================================
+# Test visibility
+# ============================================================================
+
+
+def test_visibility_single_script(page):
+    """Every descendant is checked with one script"""
+    called = []
+
+    def fake_execute(self, script, *args):
+        called.append(args)
+        return [[True, True], [True, False], [False, False]]
+
+    type(page.browser).execute = fake_execute
+
+    a = CompositeWebObject('a', "/body/div[@id='a']", page)
+    page.add(a)
+    a.reload()
+    a.add(web.WebObject('p', '/p', a))
+    page.add(web.WebObject('c', '/body/nope', page))
+
+    expected = OrderedDict([(('a', ), (True, True)),
+                            (('a', 'p'), (True, False)),
+                            (('c', ), (False, False))])
+    assert page.visibility() == expected
+    assert called == [("/html/body/div[@id='a']",
+                       "/html/body/div[@id='a']/p", '/html/body/nope')]
+
+
+def test_visibility_lazy_not_reloaded(page):
+    """Lazy children are checked without creating or reloading them"""
+    called = []
+
+    def fake_execute(self, script, *args):
+        called.append(args)
+        return [[False, False]]
+
+    type(page.browser).execute = fake_execute
+    page.register('missing', lambda parent: web.WebObject(
+        'missing', '/body/missing', parent))
+
+    expected = OrderedDict([(('missing', ), (False, False))])
+    assert page.visibility() == expected
+    assert called == [('/html/body/missing', )]
+    assert page._lazyobj == {}
+
+
+def test_visibility_no_descendants(page):
+    """No script is run without descendants"""
+    type(page.browser).execute = None
+    assert page.visibility() == OrderedDict()
+
+
 # ============================================================================
 #
 # ============================================================================
@@ -0,0 +1,174 @@
+# Module:
+# Submodules:
+# Created:
+# Copyright (C) <date> <fullname>
+#
+# This module is part of the <project name> project and is released under
+# the MIT License: http://opensource.org/licenses/MIT
+"""
+"""
+
+# ============================================================================
+# Imports
+# ============================================================================
+
+
+# Stdlib imports
+
+# Third-party imports
+import pytest
+from yarl import URL
+
+# Local imports
+from selweb.core import Browser
+from selweb.driver import BrowserDriver
+from selweb.web import CompositeWebObject, Field, FieldPlan, WebPage
+
+
+# ============================================================================
+# Fixtures
+# ============================================================================
+
+
+PAGE_SOURCE = """
+<html><head><title> Test page </title></head><body>
+<div id="item">
+  <a href="/one">One</a> <a href="/two">Two</a>
+  <span class="count">42</span>
+</div>
+</body></html>
+"""
+
+
+@pytest.fixture
+def browser():
+    """Return a browser whose source is PAGE_SOURCE"""
+
+    @BrowserDriver.register
+    class Driver:
+        pass
+
+    class TestBrowser(Browser):
+        document = 'doc'
+        source = PAGE_SOURCE
+
+    return TestBrowser(Driver())
+
+
+class FieldPage(WebPage):
+    title = Field('/head/title')
+    links = Field("//a", attr='href', many=True)
+    missing = Field("//table", default='none')
+
+    def __init__(self, browser):
+        super().__init__('page', URL('https://google.ca'), browser)
+
+
+class Item(CompositeWebObject):
+    count = Field("/span[@class='count']", convert=int)
+    first = Field('/descendant::a[1]/@href')
+
+
+# ============================================================================
+# Test Field
+# ============================================================================
+
+
+@pytest.mark.parametrize('val,err', [(42, TypeError), ('a', ValueError)])
+def test_init_arg_xpath_bad(val, err):
+    """Raise error if xpath is not a string starting with /"""
+    with pytest.raises(err):
+        Field(val)
+
+
+def test_init_arg_convert_badtype():
+    """Raise error if convert is not callable"""
+    with pytest.raises(TypeError):
+        Field('/a', convert=42)
+
+
+def test_class_attribute():
+    """Fields accessed on the class return the field"""
+    assert isinstance(FieldPage.title, Field)
+    assert FieldPage.title.name == 'title'
+
+
+# ============================================================================
+# Test FieldPlan
+# ============================================================================
+
+
+def test_plan_compiled_at_class_creation():
+    """Every field of the class and its bases is in the plan"""
+    names = [f.name for f in FieldPage._fieldplan]
+    assert names == ['title', 'links', 'missing']
+
+    class SubPage(FieldPage):
+        title = None
+        extra = Field('/body')
+
+    assert [f.name for f in SubPage._fieldplan] == ['links', 'missing',
+                                                    'extra']
+    assert not CompositeWebObject._fieldplan
+
+
+def test_plan_unloaded():
+    """Defaults are returned when there is no node"""
+    plan = FieldPlan.fromclass(FieldPage)
+    assert plan.extract(None) == dict(title=None, links=[], missing='none')
+
+
+# ============================================================================
+# Test extraction
+# ============================================================================
+
+
+def test_page_fields(browser):
+    """Page fields are extracted from the page's node"""
+    page = FieldPage(browser)
+    assert page.title is None
+    page.reload()
+
+    assert page.title == 'Test page'
+    assert page.links == ['/one', '/two']
+    assert page.missing == 'none'
+
+
+def test_fields_extracted_once(monkeypatch, browser):
+    """All fields are extracted together once per reload"""
+    called = []
+    orig = FieldPlan.extract
+
+    def fake_extract(self, node):
+        called.append(node.tag)
+        return orig(self, node)
+
+    monkeypatch.setattr(FieldPlan, 'extract', fake_extract)
+
+    page = FieldPage(browser)
+    page.reload()
+    page.title
+    page.links
+    assert called == ['html']
+
+    type(browser).source = PAGE_SOURCE.replace('Test page', 'Changed')
+    page.reload()
+    assert page.title == 'Changed'
+    assert called == ['html', 'html']
+
+
+def test_composite_fields(browser):
+    """Composite fields are relative to the object's node"""
+    page = FieldPage(browser)
+    page.reload()
+    item = Item('item', "//div[@id='item']", page)
+    item.reload()
+
+    assert item.count == 42
+    assert item.first == '/one'
+    assert item.extract() == dict(count=42, first='/one')
+
+
+# ============================================================================
+#
+# ============================================================================
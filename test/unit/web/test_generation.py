@@ -0,0 +1,171 @@
+# Module:
+# Submodules:
+# Created:
+# Copyright (C) <date> <fullname>
+#
+# This module is part of the <project name> project and is released under
+# the MIT License: http://opensource.org/licenses/MIT
+"""
+"""
+
+# ============================================================================
+# Imports
+# ============================================================================
+
+
+# Stdlib imports
+from contextlib import contextmanager
+from threading import Event, Thread
+
+# Third-party imports
+import pytest
+from yarl import URL
+
+# Local imports
+from selweb.core import Browser
+from selweb.driver import BrowserDriver
+from selweb.web import WebObject, WebPage
+
+
+# ============================================================================
+# Fixtures
+# ============================================================================
+
+
+class Page(WebPage):
+    """Page adding a title child on every reload
+
+    If building is set, the reload stops after clearing the children until
+    resume is set.
+
+    """
+    __slots__ = ('building', 'resume', 'fail')
+
+    def __init__(self, browser):
+        super().__init__('page', URL('https://google.ca'), browser,
+                         reloadcontext=self.reload_context)
+        self.building = None
+        self.resume = None
+        self.fail = False
+
+    @contextmanager
+    def reload_context(self):
+        yield
+        if self.building is not None:
+            self.building.set()
+            self.resume.wait(5)
+        if self.fail:
+            raise RuntimeError('reload failed')
+        title = WebObject('title', '/body/h1', self)
+        title.reload()
+        self.add(title)
+
+
+@pytest.fixture
+def page():
+    """Return a reloaded page whose browser source can be changed"""
+
+    @BrowserDriver.register
+    class Driver:
+        pass
+
+    class TestBrowser(Browser):
+        document = 'doc'
+        source = '<html><body><h1>one</h1></body></html>'
+
+    p = Page(TestBrowser(Driver()))
+    p.reload()
+    return p
+
+
+def setsource(page, text):
+    type(page.browser).source = ('<html><body><h1>{}</h1></body></html>'.
+                                 format(text))
+
+
+def title(page):
+    return page['title'].node.text
+
+
+# ============================================================================
+# Tests
+# ============================================================================
+
+
+def test_generation_counts_changes(page):
+    """The generation only changes with the source"""
+    assert page.generation == 1
+    assert page.reload() is False
+    assert page.generation == 1
+    setsource(page, 'two')
+    assert page.reload() is True
+    assert page.generation == 2
+    setsource(page, 'three')
+    page.refresh()
+    assert page.generation == 3
+
+
+def test_reload_keeps_old_generation(page):
+    """Reloading does not touch the previous generation's children"""
+    old = page['title']
+    setsource(page, 'two')
+    page.reload()
+    assert page['title'] is not old
+    assert old.node.text == 'one'
+    assert title(page) == 'two'
+
+
+def test_readers_see_previous_generation(page):
+    """Other threads read the previous generation until the swap"""
+    page.building = Event()
+    page.resume = Event()
+    setsource(page, 'two')
+    t = Thread(target=page.reload)
+    t.start()
+    try:
+        assert page.building.wait(5)
+        # The reloading thread has cleared its children
+        assert list(page) == ['title']
+        assert title(page) == 'one'
+        assert page.generation == 1
+    finally:
+        page.resume.set()
+        t.join(5)
+    assert title(page) == 'two'
+    assert page.generation == 2
+
+
+def test_failed_reload(page):
+    """The previous generation is kept if reload raises"""
+    old = page['title']
+    page.fail = True
+    setsource(page, 'two')
+    with pytest.raises(RuntimeError):
+        page.reload()
+    assert page['title'] is old
+    assert page.generation == 1
+
+    # The failed source is reloaded again
+    page.fail = False
+    assert page.reload() is True
+    assert title(page) == 'two'
+
+
+def test_pin(page):
+    """A pinned thread reads one generation"""
+    old = page['title']
+    with page.pin() as p:
+        assert p is page
+        setsource(page, 'two')
+        t = Thread(target=page.reload)
+        t.start()
+        t.join(5)
+        assert page['title'] is old
+        assert page.generation == 1
+    assert title(page) == 'two'
+    assert page.generation == 2
+
+
+# ============================================================================
+#
+# ============================================================================
@@ -0,0 +1,177 @@
+# Module:
+# Submodules:
+# Created:
+# Copyright (C) <date> <fullname>
+#
+# This module is part of the <project name> project and is released under
+# the MIT License: http://opensource.org/licenses/MIT
+"""
+"""
+
+# ============================================================================
+# Imports
+# ============================================================================
+
+
+# Stdlib imports
+from contextlib import contextmanager
+import gc
+from weakref import ref
+
+# Third-party imports
+import pytest
+from yarl import URL
+
+# Local imports
+from selweb.core import Browser
+from selweb.driver import BrowserDriver
+from selweb.web import CompositeWebObject, WebObject, WebPage
+
+
+# ============================================================================
+# Fixtures
+# ============================================================================
+
+
+PAGE_SOURCE = '<html><body><div><p>one</p><p>two</p></div></body></html>'
+
+
+@pytest.fixture
+def mkpage():
+    """Return a factory of reloaded pages with a div and p child"""
+
+    @BrowserDriver.register
+    class Driver:
+        pass
+
+    class TestBrowser(Browser):
+        document = 'doc'
+        source = PAGE_SOURCE
+
+    def factory(**kwargs):
+        page = WebPage('page', URL('https://google.ca'),
+                       TestBrowser(Driver()), **kwargs)
+        page.reload()
+        div = CompositeWebObject('div', '/body/div', page)
+        div.reload()
+        page.add(div)
+        p = WebObject('p', '/p[1]', div)
+        p.reload()
+        div.add(p)
+        return page
+
+    return factory
+
+
+class ContextPage(WebPage):
+    """Page adding its div child in its own reload context"""
+    __slots__ = ()
+
+    def __init__(self, browser, **kwargs):
+        super().__init__('page', URL('https://google.ca'), browser,
+                         reloadcontext=self.build, **kwargs)
+
+    @contextmanager
+    def build(self):
+        yield
+        div = CompositeWebObject('div', '/body/div', self)
+        div.reload()
+        self.add(div)
+
+
+@pytest.fixture
+def nogc():
+    """Disable the cyclic garbage collector"""
+    gc.disable()
+    yield
+    gc.enable()
+
+
+# ============================================================================
+# Tests
+# ============================================================================
+
+
+def test_weakref_supported(mkpage):
+    """Page objects support weak references"""
+    page = mkpage()
+    assert ref(page['div']['p'])() is page['div']['p']
+
+
+def test_lean_inherited(mkpage):
+    """Children of a lean object are lean"""
+    page = mkpage(lean=True)
+    assert page.lean
+    assert page['div'].lean
+    assert page['div']['p'].lean
+    assert not mkpage()['div'].lean
+
+
+def test_lean_weak_parent(mkpage, nogc):
+    """A lean tree is freed as soon as its root is released"""
+    page = mkpage(lean=True)
+    div = page['div']
+    assert div.parent is page
+    assert div['p'].parent is div
+
+    del page
+    assert div.parent is None
+
+
+def test_lean_method_context_freed(mkpage, nogc):
+    """A lean page whose reload context is its own method has no cycle"""
+    page = ContextPage(mkpage().browser, lean=True)
+    page.reload()
+    assert page['div'].parent is page
+    pageref = ref(page)
+
+    del page
+    assert pageref() is None
+
+
+def test_strong_parent(mkpage, nogc):
+    """Objects keep their parent alive by default"""
+    page = mkpage()
+    div = page['div']
+    del page
+    assert div.parent.name == 'page'
+
+
+def test_lean_sources_not_kept(mkpage):
+    """Lean objects serialize their source on each access"""
+    page = mkpage(lean=True)
+    p = page['div']['p']
+    assert p.source == '<p>one</p>'
+    assert p._source is None
+    assert page._source is None
+    assert page.source.startswith('<html><body><div>')
+    assert page.memory_usage()['sources'] == 0
+
+
+def test_drop_source(mkpage):
+    """drop_source releases the sources of the whole tree"""
+    page = mkpage()
+    p = page['div']['p']
+    assert p.source == '<p>one</p>'
+    assert page.memory_usage()['sources'] == 2
+
+    page.drop_source()
+    assert page._source is None
+    assert p._source is None
+    assert page.memory_usage()['sources'] == 0
+    assert p.source == '<p>one</p>'
+
+
+def test_memory_usage(mkpage):
+    """memory_usage counts the created objects and parsed tree"""
+    usage = mkpage().memory_usage()
+    assert usage['objects'] == 3
+    assert usage['objectbytes'] > 0
+    assert usage['sources'] == 1
+    assert usage['sourcebytes'] >= len(PAGE_SOURCE)
+    assert usage['treenodes'] == 5
+
+
+# ============================================================================
+#
+# ============================================================================
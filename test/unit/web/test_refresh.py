@@ -0,0 +1,320 @@
+# Module:
+# Submodules:
+# Created:
+# Copyright (C) <date> <fullname>
+#
+# This module is part of the <project name> project and is released under
+# the MIT License: http://opensource.org/licenses/MIT
+"""
+"""
+
+# ============================================================================
+# Imports
+# ============================================================================
+
+
+# Stdlib imports
+from contextlib import contextmanager
+from functools import partial
+
+# Third-party imports
+import pytest
+from yarl import URL
+
+# Local imports
+from selweb.core import Browser
+from selweb.driver import BrowserDriver
+from selweb.web import (CompositeWebObject, RefreshReport, WebObject,
+                        WebObjectList, WebPage)
+
+
+# ============================================================================
+# Fixtures
+# ============================================================================
+
+
+PAGE_SOURCE = """<html><body>
+<div id="a"><p>one</p></div>
+<div id="b">two</div>
+<ul><li>1</li><li>2</li></ul>
+</body></html>"""
+
+
+class Page(WebPage):
+    """Page with a composite, a plain and a list child"""
+    __slots__ = ()
+
+    def __init__(self, browser):
+        super().__init__('page', URL('https://google.ca'), browser)
+
+    def build(self):
+        a = CompositeWebObject('a', "/body/div[@id='a']", self)
+        a.reload()
+        self.add(a)
+        p = WebObject('p', '/p', a)
+        p.reload()
+        a.add(p)
+        self.register('b', lambda parent: WebObject('b', "/body/div[@id='b']",
+                                                    parent))
+        items = WebObjectList('items', '/body/ul', self, '/li')
+        items.reload()
+        self.add(items)
+        # Create every child and cache every source
+        for obj in [a, p, self['b'], items] + items[:]:
+            obj.source
+
+
+@pytest.fixture
+def page():
+    """Return a page with every child built"""
+
+    @BrowserDriver.register
+    class Driver:
+        pass
+
+    class TestBrowser(Browser):
+        document = 'doc'
+        source = PAGE_SOURCE
+
+    p = Page(TestBrowser(Driver()))
+    p.reload()
+    p.build()
+    return p
+
+
+def setsource(page, source):
+    type(page.browser).source = source
+
+
+# ============================================================================
+# Tests
+# ============================================================================
+
+
+def test_refresh_unchanged_source(page):
+    """Nothing is done if the source did not change"""
+    parser = page.parser
+    assert page.refresh() == RefreshReport([], [], [])
+    assert page.parser is parser
+
+
+def test_refresh_reuses_unchanged(page):
+    """Only objects whose subtree changed are reloaded"""
+    olda, oldp, b = page['a'], page['a']['p'], page['b']
+    olditem0 = page['items'][0]
+    oldparser = page.parser
+    setsource(page, PAGE_SOURCE.replace('two', 'deux'))
+
+    report = page.refresh()
+    assert report == RefreshReport([], [('b', )], [])
+
+    # Unchanged objects are kept with their cached source, bound to the new
+    # tree
+    a, p, item0 = page['a'], page['a']['p'], page['items'][0]
+    assert a._source == '<div id="a"><p>one</p></div>\n'
+    assert p._source == '<p>one</p>'
+    assert p.parent is a and item0.parent is page['items']
+    assert p.node.getroottree().getroot() is page.parser
+    assert item0.node.getroottree().getroot() is page.parser
+
+    # Changed objects are reloaded
+    assert page['b']._source is None
+    assert page['b'].source == '<div id="b">deux</div>\n'
+
+    # The previous generation's objects are left as they were
+    assert olda['p'] is oldp
+    assert oldp.node.getroottree().getroot() is oldparser
+    assert olditem0.node.getroottree().getroot() is oldparser
+    assert b.source == '<div id="b">two</div>\n'
+
+
+def test_refresh_nested_change(page):
+    """Changed ancestors are reported along with the changed object"""
+    setsource(page, PAGE_SOURCE.replace('one', 'un'))
+    report = page.refresh()
+    assert report.changed == [('a', 'p'), ('a', )]
+    assert page['a']['p'].source == '<p>un</p>'
+
+
+def test_refresh_removed(page):
+    """Objects whose node disappeared are removed"""
+    setsource(page, PAGE_SOURCE.replace('<div id="b">two</div>', ''))
+    report = page.refresh()
+    assert report == RefreshReport([], [], [('b', )])
+    assert 'b' not in list(page._lazyobj)
+
+    # The registration is kept
+    assert 'b' in list(page)
+
+
+def test_refresh_list(page):
+    """Items added to and removed from a list are reported"""
+    setsource(page, PAGE_SOURCE.replace('<li>2</li>',
+                                        '<li>2</li><li>3</li><li>4</li>'))
+    report = page.refresh()
+    assert report == RefreshReport([('items', 2), ('items', 3)],
+                                   [('items', )], [])
+    assert page['items'][3].source == '<li>4</li>'
+
+    setsource(page, PAGE_SOURCE.replace('<li>2</li>', ''))
+    report = page.refresh()
+    assert report == RefreshReport([], [('items', )],
+                                   [('items', 1), ('items', 2), ('items', 3)])
+    assert len(page['items']) == 1
+
+
+def test_composite_refresh(page):
+    """A composite refreshes against the page's current parse"""
+    a = page['a']
+    p = a['p']
+    assert a.refresh() == RefreshReport([], [], [])
+    assert a['p'].parent is a
+    assert a['p']._source == p._source == '<p>one</p>'
+
+
+@pytest.fixture
+def browser():
+    """Return a browser whose source is set with setsource"""
+
+    @BrowserDriver.register
+    class Driver:
+        pass
+
+    class TestBrowser(Browser):
+        document = 'doc'
+        source = PAGE_SOURCE
+
+    return TestBrowser(Driver())
+
+
+class Section(CompositeWebObject):
+    """Composite building a child per span in its reload context"""
+    __slots__ = ()
+
+    def __init__(self, parent):
+        super().__init__('section', '/body/div', parent,
+                         reloadcontext=self.build)
+
+    @contextmanager
+    def build(self):
+        yield
+        self.page.called.append('section')
+        for i in range(len(self.node.xpath('./span'))):
+            span = WebObject('s{}'.format(i), '/span[{}]'.format(i + 1), self)
+            span.reload()
+            self.add(span)
+
+
+class ContextPage(WebPage):
+    """Page building a child per paragraph and a section in its context"""
+    __slots__ = ('called', )
+
+    def __init__(self, browser):
+        super().__init__('page', URL('https://google.ca'), browser,
+                         reloadcontext=self.build)
+        self.called = []
+
+    @contextmanager
+    def build(self):
+        self.called.append('wait')
+        yield
+        self.called.append('build')
+        for i in range(len(self.parser.xpath('/html/body/p'))):
+            p = WebObject('p{}'.format(i), '/body/p[{}]'.format(i + 1),
+                          self)
+            p.reload()
+            self.add(p)
+        section = Section(self)
+        section.reload()
+        self.add(section)
+
+
+def contextsource(paras, spans):
+    return '<html><body>{}<div>{}</div></body></html>'.format(
+        ''.join('<p>{}</p>'.format(p) for p in paras),
+        ''.join('<span>{}</span>'.format(s) for s in spans))
+
+
+def test_refresh_rebuilds_changed(browser):
+    """Changed context built objects are rebuilt, keeping unchanged ones"""
+    setsource_ = partial(setattr, type(browser), 'source')
+    setsource_(contextsource(['a', 'b'], ['x']))
+    page = ContextPage(browser)
+    page.reload()
+    assert page['p0'].source == '<p>a</p>'
+    assert page['section']['s0'].source == '<span>x</span>'
+    del page.called[:]
+
+    # Only the page's own build runs, the section is carried over
+    setsource_(contextsource(['a', 'b', 'c'], ['x']))
+    assert page.refresh() == RefreshReport([('p2', )], [], [])
+    assert page.called == ['wait', 'build', 'section']
+    assert list(page) == ['p0', 'p1', 'p2', 'section']
+    assert page['p0']._source == '<p>a</p>'
+    assert page['section']['s0']._source == '<span>x</span>'
+
+    # The changed section is rebuilt, keeping its unchanged child
+    setsource_(contextsource(['a', 'c'], ['x', 'y']))
+    assert page.refresh() == RefreshReport(
+        [('section', 's1')], [('p1', ), ('section', )], [('p2', )])
+    assert list(page['section']) == ['s0', 's1']
+    assert page['section']['s0']._source == '<span>x</span>'
+    assert page['p1'].source == '<p>c</p>'
+
+    # A fresh reload builds the same tree
+    fresh = ContextPage(browser)
+    fresh.reload()
+    assert sorted(fresh) == sorted(page)
+
+
+class SectionPage(WebPage):
+    """Page registering a Section as a lazy child"""
+    __slots__ = ('called', )
+
+    def __init__(self, browser):
+        super().__init__('page', URL('https://google.ca'), browser)
+        self.called = []
+        self.register('section', Section)
+
+
+def test_refresh_rebuilds_copied_child(browser):
+    """A changed child is rebuilt in its copy, not in the old generation"""
+    type(browser).source = contextsource(['a'], ['x'])
+    page = SectionPage(browser)
+    page.reload()
+    old = page['section']
+
+    type(browser).source = contextsource(['a'], ['x', 'y'])
+    assert page.refresh() == RefreshReport(
+        [('section', 's1')], [('section', )], [])
+    assert list(page['section']) == ['s0', 's1']
+    assert list(old) == ['s0']
+
+
+def test_refresh_unchanged_skips_context_build(browser):
+    """The code after the context's yield is skipped if nothing changed"""
+    type(browser).source = contextsource(['a'], ['x'])
+    page = ContextPage(browser)
+    page.reload()
+    del page.called[:]
+    assert page.refresh() == RefreshReport([], [], [])
+    assert page.called == ['wait']
+
+
+def test_refresh_rejects_suppressing_context(page):
+    """A reload context that suppresses the skip is rejected"""
+    @contextmanager
+    def rcontext():
+        try:
+            yield
+        except Exception:
+            pass
+
+    page._reload_context = rcontext
+    with pytest.raises(RuntimeError):
+        page.refresh()
+
+
+# ============================================================================
+#
+# ============================================================================
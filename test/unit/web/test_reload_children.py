@@ -0,0 +1,173 @@
+# Module:
+# Submodules:
+# Created:
+# Copyright (C) <date> <fullname>
+#
+# This module is part of the <project name> project and is released under
+# the MIT License: http://opensource.org/licenses/MIT
+"""
+"""
+
+# ============================================================================
+# Imports
+# ============================================================================
+
+
+# Stdlib imports
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import partial
+from time import sleep
+
+# Third-party imports
+import pytest
+from yarl import URL
+
+# Local imports
+from selweb.core import Browser
+from selweb.driver import BrowserDriver
+from selweb.web import ChildReloadError, WebObject, WebPage
+
+
+# ============================================================================
+# Fixtures
+# ============================================================================
+
+
+NAMES = ['p{}'.format(i) for i in range(8)]
+
+
+class SlowObject(WebObject):
+    """Object whose reload takes longer for earlier children"""
+    __slots__ = ()
+
+    def reload(self):
+        sleep(0.002 * (len(NAMES) - int(self.name[1:])))
+        super().reload()
+        return self.name
+
+
+class Page(WebPage):
+    """Page reloading its children in parallel in its reload context"""
+    __slots__ = ('executor', )
+
+    def __init__(self, browser):
+        super().__init__('page', URL('https://google.ca'), browser,
+                         reloadcontext=self.reload_context)
+        self.executor = None
+
+    @contextmanager
+    def reload_context(self):
+        yield
+        for i, name in enumerate(NAMES):
+            self.add(SlowObject(name, '/body/p[{}]'.format(i + 1), self))
+        self.reload_children(executor=self.executor)
+
+
+def mksource(text):
+    return '<html><body>{}</body></html>'.format(
+        ''.join('<p>{} {}</p>'.format(text, i) for i in range(len(NAMES))))
+
+
+@pytest.fixture
+def page():
+    """Return a reloaded page of 8 paragraphs"""
+
+    @BrowserDriver.register
+    class Driver:
+        pass
+
+    class TestBrowser(Browser):
+        document = 'doc'
+        source = mksource('one')
+
+    p = Page(TestBrowser(Driver()))
+    p.reload()
+    return p
+
+
+@pytest.fixture
+def executor():
+    with ThreadPoolExecutor(4) as e:
+        yield e
+
+
+def texts(page):
+    return [c.node.text for c in page.children()]
+
+
+# ============================================================================
+# Tests
+# ============================================================================
+
+
+def test_badexecutor(page):
+    """Raise error if executor is not an Executor"""
+    expected = ('executor arg expected Executor object, got int object '
+                'instead', )
+    with pytest.raises(TypeError) as err:
+        page.reload_children(executor=42)
+    assert err.value.args == expected
+
+
+@pytest.mark.parametrize('parallel', [False, True])
+def test_results_in_child_order(page, executor, parallel):
+    """Results are returned in child order"""
+    ret = page.reload_children(executor=executor if parallel else None)
+    assert list(ret.items()) == [(n, n) for n in NAMES]
+    assert list(page) == NAMES
+
+
+def test_parallel_reload_context(page, executor):
+    """Workers see the generation being built by reload"""
+    page.executor = executor
+    type(page.browser).source = mksource('two')
+    assert page.reload() is True
+    assert texts(page) == ['two {}'.format(i) for i in range(len(NAMES))]
+    assert list(page) == NAMES
+
+
+@pytest.mark.parametrize('parallel', [False, True])
+def test_errors(page, executor, parallel):
+    """Every failed child is reported once all reloads are done"""
+    for name in ['p2', 'p5']:
+        page.add(WebObject(name, '/body/missing', page))
+    with pytest.raises(ChildReloadError) as err:
+        page.reload_children(executor=executor if parallel else None)
+    errors = err.value.errors
+    assert list(errors) == ['p2', 'p5']
+    assert all(isinstance(e, AssertionError) for e in errors.values())
+    assert err.value.__cause__ is errors['p2']
+    assert err.value.args == ("Failed to reload children: 'p2', 'p5'", )
+    assert page['p7'].node is not None
+
+
+def test_lazy_children_not_created(page, executor):
+    """Registered children are only reloaded once created"""
+    created = []
+
+    def factory(parent):
+        created.append(True)
+        return WebObject('lazy', '/body/p[1]', parent)
+
+    page.register('lazy', factory)
+    ret = page.reload_children(executor=executor)
+    assert 'lazy' not in ret
+    assert not created
+    page['lazy']
+    assert list(page.reload_children(executor=executor))[-1] == 'lazy'
+
+
+def test_lazy_children_in_child_order(page, executor):
+    """Created registered children are reloaded in registration order"""
+    for name in ['first', 'second']:
+        page.register(name, partial(WebObject, name, '/body/p[1]'))
+    page['second']
+    page['first']
+    ret = page.reload_children(executor=executor)
+    assert list(ret) == list(page) == NAMES + ['first', 'second']
+
+
+# ============================================================================
+#
+# ============================================================================
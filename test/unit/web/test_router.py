@@ -0,0 +1,152 @@
+# Module:
+# Submodules:
+# Created:
+# Copyright (C) <date> <fullname>
+#
+# This module is part of the <project name> project and is released under
+# the MIT License: http://opensource.org/licenses/MIT
+"""
+"""
+
+# ============================================================================
+# Imports
+# ============================================================================
+
+
+# Stdlib imports
+
+# Third-party imports
+import pytest
+from yarl import URL
+
+# Local imports
+from selweb.web import PageRouter, RouteMatch, WebPage
+
+
+# ============================================================================
+# Fixtures
+# ============================================================================
+
+
+def mkpage(name):
+    return type(name, (WebPage, ), {'__slots__': ()})
+
+
+Front = mkpage('Front')
+Search = mkpage('Search')
+Images = mkpage('Images')
+Item = mkpage('Item')
+ItemEdit = mkpage('ItemEdit')
+Static = mkpage('Static')
+Sub = mkpage('Sub')
+Fallback = mkpage('Fallback')
+
+
+@pytest.fixture
+def router():
+    """Return a router for a mixed site"""
+    r = PageRouter()
+    r.register(Front, host='www.google.ca')
+    r.register(Images, host='www.google.ca', path='/search',
+               query={'q': None, 'tbm': 'isch'})
+    r.register(Search, host='www.google.ca', path='/search',
+               query={'q': None})
+    r.register(Item, host='shop.example.com', path='/item/{id}')
+    r.register(ItemEdit, host='shop.example.com', path='/item/{id}/edit')
+    r.register(Static, host='shop.example.com', path='/item/static/{rest*}')
+    r.register(Sub, host='*.example.com', path='/{page}')
+    r.register(Fallback, path='/{rest*}')
+    return r
+
+
+# ============================================================================
+# Tests
+# ============================================================================
+
+
+def test_register_decorator():
+    """register() without a class returns a decorator"""
+    r = PageRouter()
+
+    @r.register(host='example.com', path='/a')
+    class A(WebPage):
+        __slots__ = ()
+
+    assert r.match('https://example.com/a') == (A, {})
+
+
+@pytest.mark.parametrize('pagecls', [42, int, object])
+def test_register_badclass(pagecls):
+    """Raise error if pagecls is not a WebPage subclass"""
+    with pytest.raises(TypeError):
+        PageRouter().register(pagecls)
+
+
+@pytest.mark.parametrize('kwargs,exc', [
+    (dict(path='item'), ValueError),
+    (dict(path=42), TypeError),
+    (dict(host=42), TypeError),
+    (dict(host='www.*.com'), ValueError),
+    (dict(path='/{rest*}/edit'), ValueError),
+    (dict(query={'q': 42}), TypeError),
+])
+def test_register_badargs(kwargs, exc):
+    """Raise error for invalid patterns"""
+    with pytest.raises(exc):
+        PageRouter().register(Front, **kwargs)
+
+
+def test_match_badurl(router):
+    """Raise error if url is not a str or URL"""
+    expected = 'url arg expected URL object, got int object instead'
+    with pytest.raises(TypeError) as err:
+        router.match(42)
+    assert err.value.args == (expected, )
+
+
+@pytest.mark.parametrize('url,expected', [
+    ('https://www.google.ca', (Front, {})),
+    ('https://WWW.Google.ca/', (Front, {})),
+    ('https://www.google.ca/search?q=cats', (Search, {})),
+    ('https://www.google.ca/search?q=cats&tbm=isch', (Images, {})),
+    ('https://www.google.ca/search?q=cats&tbm=vid', (Search, {})),
+    ('https://www.google.ca/search', (Fallback, {'rest': 'search'})),
+    ('https://shop.example.com/item/42', (Item, {'id': '42'})),
+    ('https://shop.example.com/item/42/', (Item, {'id': '42'})),
+    ('https://shop.example.com/item/42/edit', (ItemEdit, {'id': '42'})),
+    ('https://shop.example.com/item/static/css/a.css',
+     (Static, {'rest': 'css/a.css'})),
+    ('https://shop.example.com/item/static', (Static, {'rest': ''})),
+    ('https://shop.example.com/cart', (Sub, {'page': 'cart'})),
+    ('https://a.b.example.com/cart', (Sub, {'page': 'cart'})),
+    ('https://example.com/cart', (Fallback, {'rest': 'cart'})),
+    ('https://other.org/', (Fallback, {'rest': ''})),
+    ('/relative/path', (Fallback, {'rest': 'relative/path'})),
+])
+def test_match(router, url, expected):
+    """Urls are dispatched to the most specific page class"""
+    found = router.match(URL(url))
+    assert isinstance(found, RouteMatch)
+    assert found == expected
+    assert router.match(url) == expected
+
+
+def test_match_none():
+    """None is returned if nothing matches"""
+    r = PageRouter()
+    r.register(Front, host='www.google.ca')
+    assert r.match('https://www.google.ca/search') is None
+    assert r.match('https://google.ca') is None
+
+
+def test_match_order():
+    """Routes sharing a template are tried in registration order"""
+    r = PageRouter()
+    r.register(Search, path='/search')
+    r.register(Images, path='/search')
+    assert r.match('https://a.com/search').pagecls is Search
+
+
+# ============================================================================
+#
+# ============================================================================
@@ -17,12 +17,12 @@
 from contextlib import contextmanager
 
 # Third-party imports
+from lxml import html
 import pytest
 
 # Local imports
 from selweb.core import CompositePageObject
 from selweb.util import noop_context
-import selweb.web as web
 from selweb.web import WebObject
 
 
@@ -183,7 +183,7 @@ def test_reload_runs_context(monkeypatch, webgroup):
     def fake_tostring(n):
         return b'42'
 
-    monkeypatch.setattr(web.html, 'tostring', fake_tostring)
+    monkeypatch.setattr(html, 'tostring', fake_tostring)
 
     called = []
 
@@ -215,6 +215,36 @@ def test_reload_runs_context(monkeypatch, webgroup):
     assert called == ['enter rcontext', 'called xpath', 'exit rcontext']
 
 
+def test_reload_source_lazy(monkeypatch, webgroup):
+    """Source is serialized from the node on first access only"""
+    called = []
+
+    def fake_tostring(n):
+        called.append(('tostring', n))
+        return b'42'
+
+    monkeypatch.setattr(html, 'tostring', fake_tostring)
+
+    @webgroup.register
+    class TestParent:
+        xpath = '/html'
+        parent = None
+
+        class parser:
+            @staticmethod
+            def xpath(p):
+                return ['node']
+
+    w = WebObject('name', '/hello', TestParent())
+    w.reload()
+    assert w.node == 'node'
+    assert called == []
+
+    assert w.source == '42'
+    assert w.source == '42'
+    assert called == [('tostring', 'node')]
+
+
 # ============================================================================
 # Test absxpath
 # ============================================================================
@@ -264,6 +294,43 @@ def test_absxpath_multi_ancestors(webgroup):
     assert w.absxpath == '/html/one/two/hello'
 
 
+def test_absxpath_cached(webgroup):
+    """absxpath is only calculated once"""
+    called = []
+
+    @webgroup.register
+    class TestParent:
+        parent = None
+
+        @property
+        def xpath(self):
+            called.append('called xpath')
+            return '/html'
+
+    w = WebObject('name', '/hello', TestParent())
+
+    assert w.absxpath == '/html/hello'
+    assert w.absxpath == '/html/hello'
+    assert called == ['called xpath']
+
+
+def test_absxpath_cleared_on_parent_set(webgroup):
+    """Setting the parent clears the cached absxpath"""
+
+    @webgroup.register
+    class TestParent:
+        parent = None
+
+        def __init__(self, xpath):
+            self.xpath = xpath
+
+    w = WebObject('name', '/hello', TestParent('/html'))
+    assert w.absxpath == '/html/hello'
+
+    w.parent = TestParent('/body')
+    assert w.absxpath == '/body/hello'
+
+
 # ============================================================================
 # Test visible
 # ============================================================================
@@ -0,0 +1,191 @@
+# Module:
+# Submodules:
+# Created:
+# Copyright (C) <date> <fullname>
+#
+# This module is part of the <project name> project and is released under
+# the MIT License: http://opensource.org/licenses/MIT
+"""
+"""
+
+# ============================================================================
+# Imports
+# ============================================================================
+
+
+# Stdlib imports
+
+# Third-party imports
+import pytest
+from yarl import URL
+
+# Local imports
+from selweb.core import Browser
+from selweb.driver import BrowserDriver
+import selweb.web as web
+from selweb.web import (WebObject, WebObjectList, WebObjectListItem,
+                        WebPage)
+
+
+# ============================================================================
+# Fixtures
+# ============================================================================
+
+
+PAGE_SOURCE = """
+<html><body><ul id="res">
+<li><a href="/0">zero</a></li>
+<li><a href="/1">one</a></li>
+<li><a href="/2">two</a></li>
+</ul></body></html>
+"""
+
+
+@pytest.fixture
+def page():
+    """Return a WebPage loaded from PAGE_SOURCE"""
+
+    @BrowserDriver.register
+    class Driver:
+        pass
+
+    class TestBrowser(Browser):
+        document = 'doc'
+        source = PAGE_SOURCE
+
+    p = WebPage('page', URL('https://google.ca'), TestBrowser(Driver()))
+    p.reload()
+    return p
+
+
+class Item(WebObjectListItem):
+
+    def __init__(self, parent, index):
+        super().__init__(parent, index)
+        self.register('link', lambda p: WebObject('link', '/a', p))
+
+
+@pytest.fixture
+def objlist(page):
+    """Return a reloaded WebObjectList of the li elements"""
+    ret = WebObjectList('results', "//ul[@id='res']", page, '/li',
+                        itemfactory=Item)
+    page.add(ret)
+    ret.reload()
+    return ret
+
+
+# ============================================================================
+# Test __init__
+# ============================================================================
+
+
+@pytest.mark.parametrize('val,err', [(42, TypeError), ('li', ValueError)])
+def test_init_arg_itemxpath_bad(page, val, err):
+    """Raise error if itemxpath is not an xpath starting with /"""
+    with pytest.raises(err):
+        WebObjectList('results', '/body', page, val)
+
+
+def test_item_init_arg_parent_badtype(page):
+    """Items must belong to a WebObjectList"""
+    with pytest.raises(TypeError):
+        WebObjectListItem(page, 0)
+
+
+# ============================================================================
+# Test access
+# ============================================================================
+
+
+def test_len_iter(objlist):
+    """Length and names are the matched indexes"""
+    assert len(objlist) == 3
+    assert list(objlist) == [0, 1, 2]
+
+
+@pytest.mark.parametrize('index,expected', [
+    (0, True), (2, True), (3, False), (-1, False), ('0', False),
+])
+def test_contains(objlist, index, expected):
+    """Only valid item indexes are members"""
+    assert (index in objlist) is expected
+
+
+def test_index_access(objlist):
+    """Items are bound to their matched node"""
+    item = objlist[1]
+    assert isinstance(item, Item)
+    assert item.index == 1
+    assert item['link'].node.text == 'one'
+    assert objlist[1] is item
+    assert objlist[-1]['link'].node.text == 'two'
+
+    with pytest.raises(IndexError):
+        objlist[3]
+    with pytest.raises(TypeError):
+        objlist['1']
+
+
+def test_slice_access(objlist):
+    """Slices return a list of items"""
+    items = objlist[::2]
+    assert [i.index for i in items] == [0, 2]
+    assert [i['link'].node.text for i in objlist.children()] == [
+        'zero', 'one', 'two'
+    ]
+
+
+def test_item_absxpath(objlist):
+    """Item absxpath selects the same node for browser use"""
+    item = objlist[2]
+    assert item.absxpath == "(/html//ul[@id='res']/li)[3]"
+    assert item['link'].absxpath == "(/html//ul[@id='res']/li)[3]/a"
+    assert objlist.page.parser.xpath(item.absxpath) == [item.node]
+
+
+def test_item_xpath_evaluated_once(monkeypatch, page):
+    """The item xpath is evaluated once regardless of the number of items"""
+    called = []
+    orig = web.evaluate_xpath
+
+    def fake_evaluate(node, expr):
+        called.append(expr)
+        return orig(node, expr)
+
+    monkeypatch.setattr(web, 'evaluate_xpath', fake_evaluate)
+
+    objlist = WebObjectList('results', "//ul[@id='res']", page, '/li')
+    page.add(objlist)
+    objlist.reload()
+    assert [i.node.text_content() for i in objlist.children()] == [
+        'zero', 'one', 'two'
+    ]
+    assert called == ['/html', ".//ul[@id='res']", './li']
+
+
+def test_reload_drops_items(objlist):
+    """Created items are dropped on reload"""
+    item = objlist[0]
+    objlist.reload()
+    assert objlist[0] is not item
+
+
+def test_delitem(objlist):
+    """Items cannot be removed"""
+    with pytest.raises(TypeError):
+        del objlist[0]
+
+
+def test_bad_itemfactory(page):
+    """Items must be WebObjectListItem objects"""
+    objlist = WebObjectList('results', "//ul[@id='res']", page, '/li',
+                            itemfactory=lambda p, i: 42)
+    objlist.reload()
+    with pytest.raises(TypeError):
+        objlist[0]
+
+
+# ============================================================================
+#
+# ============================================================================
@@ -18,6 +18,7 @@ from collections import OrderedDict
 from contextlib import contextmanager
 
 # Third-party imports
+from lxml import html
 import pytest
 from yarl import URL
 
@@ -25,7 +26,6 @@ from yarl import URL
 from selweb.core import Browser, CompositePageObject, Page, PageObject
 from selweb.driver import BrowserDriver
 from selweb.util import noop_context
-import selweb.web as web
 from selweb.web import WebPage
 
 
@@ -223,7 +223,7 @@ def test_reload_under_context(monkeypatch, browser_driver):
         called.append(('fromstring', n))
         return 42
 
-    monkeypatch.setattr(web.html, 'fromstring', fake_fromstring)
+    monkeypatch.setattr(html, 'fromstring', fake_fromstring)
 
     @contextmanager
     def rcontext():
@@ -236,10 +236,12 @@ def test_reload_under_context(monkeypatch, browser_driver):
         pass
 
     class TestBrowser(Browser):
+        document = 'doc'
+
         @property
         def source(self):
             called.append('browser.source')
-            return 9001
+            return '9001'
 
     class TestWebPage(WebPage):
 
@@ -256,8 +258,264 @@ def test_reload_under_context(monkeypatch, browser_driver):
 
     # Note: this is not to check that specific actions are taken, only that
     # reload actions happen within a reload context
-    assert called == ['enter rcontext', 'browser.source', ('fromstring', 9001),
-                      'called clear', 'exit rcontext']
+    assert called == ['enter rcontext', 'browser.source',
+                      ('fromstring', '9001'), 'called clear', 'exit rcontext']
+
+
+def test_reload_unchanged_source(monkeypatch, browser_driver):
+    """Parser and children are kept if the source did not change"""
+    called = []
+    sources = ['<html><p>1</p></html>', '<html><p>1</p></html>',
+               '<html><p>2</p></html>']
+
+    orig_fromstring = html.fromstring
+
+    def fake_fromstring(s):
+        called.append('fromstring')
+        return orig_fromstring(s)
+
+    monkeypatch.setattr(html, 'fromstring', fake_fromstring)
+
+    @browser_driver.register
+    class Driver:
+        pass
+
+    class TestBrowser(Browser):
+        document = 'doc'
+
+        @property
+        def source(self):
+            return sources.pop(0)
+
+    @CompositePageObject.register
+    class Fake:
+        name = 'fake'
+
+    w = WebPage('name', URL('https://google.ca'), TestBrowser(Driver()))
+    assert w.reload() is True
+    parser = w.parser
+    w.add(Fake())
+
+    assert w.reload() is False
+    assert w.parser is parser
+    assert list(w) == ['fake']
+    assert called == ['fromstring']
+
+    assert w.reload() is True
+    assert w.parser is not parser
+    assert len(w) == 0
+    assert called == ['fromstring', 'fromstring']
+
+
+def test_reload_unchanged_skips_build(browser_driver):
+    """An unchanged source skips the code after the reload context's yield"""
+    called = []
+
+    @contextmanager
+    def rcontext():
+        called.append('wait')
+        try:
+            yield
+            called.append('build')
+        finally:
+            called.append('cleanup')
+
+    @browser_driver.register
+    class Driver:
+        pass
+
+    class TestBrowser(Browser):
+        document = 'doc'
+        source = '<html></html>'
+
+    w = WebPage('name', URL('https://google.ca'), TestBrowser(Driver()),
+                reloadcontext=rcontext)
+    assert w.reload() is True
+    assert called == ['wait', 'build', 'cleanup']
+    del called[:]
+
+    assert w.reload() is False
+    assert called == ['wait', 'cleanup']
+
+
+def test_reload_failed_context_not_skipped(browser_driver):
+    """A reload whose context raised is not skipped next time"""
+    fail = [True]
+
+    @contextmanager
+    def rcontext():
+        yield
+        if fail.pop():
+            raise RuntimeError
+
+    @browser_driver.register
+    class Driver:
+        pass
+
+    class TestBrowser(Browser):
+        document = 'doc'
+        source = '<html></html>'
+
+    w = WebPage('name', URL('https://google.ca'), TestBrowser(Driver()),
+                reloadcontext=rcontext)
+    with pytest.raises(RuntimeError):
+        w.reload()
+    fail.append(False)
+    assert w.reload() is True
+
+
+# ============================================================================
+# Test nested pages
+# ============================================================================
+
+
+@pytest.fixture
+def nested(monkeypatch, browser_driver):
+    """Return (outer page, nested page, calls) sharing one browser
+
+    The browser's document token is changed by switch() or by setting
+    browser.docs[0].
+
+    """
+    called = []
+    docs = [0]
+    orig_fromstring = html.fromstring
+
+    def fake_fromstring(s):
+        called.append('fromstring')
+        return orig_fromstring(s)
+
+    monkeypatch.setattr(html, 'fromstring', fake_fromstring)
+
+    @browser_driver.register
+    class Driver:
+        pass
+
+    class FakeSwitch:
+        def default_content(self):
+            docs[0] += 1
+
+    class FakeSeleniumDriver:
+        switch_to = FakeSwitch()
+
+        def execute_script(self, script, *args):
+            called.append('document')
+            return docs[0]
+
+    class TestBrowser(Browser):
+        selenium_driver = FakeSeleniumDriver()
+
+        @property
+        def source(self):
+            called.append('browser.source')
+            return '<html><body><p>hello</p></body></html>'
+
+    url = URL('https://google.ca')
+    browser = TestBrowser(Driver())
+    browser.docs = docs
+    outer = WebPage('outer', url, browser)
+    inner = WebPage('inner', url, browser, parent=outer)
+    return outer, inner, called
+
+
+def test_nested_shares_parse(nested):
+    """A nested page reuses its parent page's source and parser"""
+    outer, inner, called = nested
+    outer.reload()
+    assert called == ['browser.source', 'fromstring']
+
+    # The outer page only reads its document token once asked for it
+    assert inner.reload() is True
+    assert called[2:] == ['document', 'browser.source', 'fromstring']
+    del called[:]
+    outer.reload()
+    inner = WebPage('inner', outer.url, outer.browser, parent=outer)
+    assert inner.reload() is True
+    assert called == ['document', 'browser.source', 'document']
+    assert inner.parser is outer.parser
+    assert inner.source is outer.source
+    assert inner.node is outer.node
+
+    # Reloading again without a new outer reload is a no-op
+    assert inner.reload() is False
+    assert called[3:] == ['document']
+
+
+def test_nested_unparsed_parent(nested):
+    """A nested page fetches the source if its parent was never parsed"""
+    outer, inner, called = nested
+    assert inner.reload() is True
+    assert called == ['document', 'browser.source', 'fromstring']
+    assert outer.parser is None
+
+
+def test_nested_other_document(nested):
+    """A nested page fetches the source after the document changed"""
+    outer, inner, called = nested
+    outer._readdoc = True
+    outer.reload()
+    outer.browser.switch()
+    inner.reload()
+    assert called == ['document', 'browser.source', 'fromstring',
+                      'document', 'browser.source', 'fromstring']
+    assert inner.parser is not outer.parser
+
+
+def test_nested_navigated(nested):
+    """A nested page fetches the source after the document was replaced"""
+    outer, inner, called = nested
+    outer._readdoc = True
+    outer.reload()
+
+    # eg a click or back() replaced the document without go()
+    outer.browser.docs[0] += 1
+    inner.reload()
+    assert called == ['document', 'browser.source', 'fromstring',
+                      'document', 'browser.source', 'fromstring']
+    assert inner.parser is not outer.parser
+
+
+def test_nested_in_reload_context(nested):
+    """A nested page built in its parent's reload context shares its parse"""
+    outer, _, called = nested
+    inner = []
+
+    @contextmanager
+    def rcontext():
+        yield
+        page = WebPage('inner', outer.url, outer.browser, parent=page_)
+        page.reload()
+        inner.append(page)
+
+    page_ = WebPage('outer', outer.url, outer.browser, reloadcontext=rcontext)
+    assert page_.reload() is True
+    assert called == ['browser.source', 'fromstring', 'document']
+    assert inner[0].parser is page_.parser
+
+
+# ============================================================================
+# Test node
+# ============================================================================
+
+
+def test_node(browser_driver):
+    """node is the /html element of the parsed source"""
+
+    @browser_driver.register
+    class Driver:
+        pass
+
+    class TestBrowser(Browser):
+        document = 'doc'
+        source = '<html><body><p>hello</p></body></html>'
+
+    w = WebPage('name', URL('https://google.ca'), TestBrowser(Driver()))
+    assert w.node is None
+
+    w.reload()
+    assert w.node.tag == 'html'
+    assert w.node is w.node
+    assert w.source == TestBrowser.source
 
 
 # ============================================================================